@@ -0,0 +1,7 @@
+"""Benchmarks of the processor and frontend hot paths on synthetic data.
+
+Run with `python -m benchmarks`; nothing is downloaded and no Neo4j server
+is needed. Baselines are kept per machine (`--machine`, or
+$BENCHMARK_MACHINE): record them with `--save-baseline` on the machine or
+CI runner type that compares against them.
+"""
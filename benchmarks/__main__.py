@@ -0,0 +1,5 @@
+"""Entry point for the benchmarks."""
+from benchmarks.runner import main
+
+if __name__ == "__main__":
+    main()
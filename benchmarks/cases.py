@@ -0,0 +1,223 @@
+"""Benchmark cases Module"""
+import contextlib
+import io
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+
+from benchmarks.fake_graph import RecordingGraph
+from benchmarks.synthetic import (
+    SyntheticRelease,
+    search_result,
+    write_biogrid,
+    write_intact,
+)
+from bio_data_merge.frontend.graph import build_graph
+from bio_data_merge.model.database.database import DatabaseType, ID_FIELDS
+from bio_data_merge.overlap import iter_name_batches, join_names
+from bio_data_merge.processor.parser import InputData, Parser
+from bio_data_merge.processor.search_keys import SEARCH_KEYS_FIELD
+from bio_data_merge.processor.settings import ParserSettings
+from bio_data_merge.processor.snapshot import Snapshot, SnapshotBuilder
+from bio_data_merge.processor.transform import FrameTransformer
+from bio_data_merge.processor.validation import RecordValidator
+from bio_data_merge.processor.writer import BatchWriter
+
+
+@dataclass
+class Context:
+    """Synthetic inputs shared by the cases, generated once on first use."""
+
+    release: SyntheticRelease
+    workdir: Path
+    _cache: Dict[str, Any] = field(default_factory=dict)
+
+    def cached(self, key: str, make: Callable[[], Any]) -> Any:
+        """Build an input once."""
+        if key not in self._cache:
+            self._cache[key] = make()
+        return self._cache[key]
+
+    def files(self) -> Dict[str, Path]:
+        """The inputs written to files so far, for a context in another process."""
+        return {k: v for k, v in self._cache.items() if isinstance(v, Path)}
+
+    def source_file(self, database: DatabaseType) -> Path:
+        """The synthetic release file of a database."""
+        write = write_biogrid if database == DatabaseType.BioGRID else write_intact
+        directory = self.workdir / database.name.lower()
+        return self.cached(
+            f"file:{database.name}", lambda: write(self.release, directory)
+        )
+
+    def frame(self, database: DatabaseType) -> pd.DataFrame:
+        """The synthetic release of a database, as the parser reads it."""
+        return self.cached(
+            f"frame:{database.name}",
+            lambda: Parser.read_input_data(
+                InputData([str(self.source_file(database))], database)
+            ),
+        )
+
+
+# a case prepares its inputs (untimed) and returns the timed run, which returns
+# the number of rows it processed
+Case = Callable[[Context], Callable[[], int]]
+
+
+def read_input_data(database: DatabaseType, engine: str = "c") -> Case:
+    """`Parser.read_input_data` on a synthetic release."""
+
+    def setup(context: Context) -> Callable[[], int]:
+        source = InputData([str(context.source_file(database))], database)
+        return lambda: len(Parser.read_input_data(source, engine=engine))
+
+    return setup
+
+
+def insert_entries(database: DatabaseType, edges: str = "raw") -> Case:
+    """`Parser.insert_entries` into a recording graph: transform, deduplicate, batch."""
+
+    def setup(context: Context) -> Callable[[], int]:
+        parser = Parser(ParserSettings(resolve_identities=False))
+        frame = context.frame(database)
+        id_field = ID_FIELDS[database]
+        writer = BatchWriter(RecordingGraph(), id_field, edges=edges)
+
+        def run() -> int:
+            output = io.StringIO()  # progress bar and stats
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                parser.insert_entries(frame, database, writer, id_field, "benchmark")
+            return len(frame)
+
+        return run
+
+    return setup
+
+
+def validate(database: DatabaseType) -> Case:
+    """Full validation of a transformed release against the interaction models."""
+
+    def setup(context: Context) -> Callable[[], int]:
+        id_field = ID_FIELDS[database]
+        batch = context.cached(
+            f"batch:{database.name}",
+            lambda: FrameTransformer(id_field).transform(context.frame(database)),
+        )
+
+        def run() -> int:
+            RecordValidator(database, id_field, "full").validate(batch)
+            return len(batch)
+
+        return run
+
+    return setup
+
+
+def graph_builder(context: Context) -> Callable[[], int]:
+    """`build_graph` over a search result, without a node limit."""
+    result = context.cached("search", lambda: search_result(context.release))
+    links = sum(len(record["interactor_b"]) for record in result)
+
+    def run() -> int:
+        build_graph(
+            result, max_nodes=len(result) * (1 + len(result[0]["interactor_b"]))
+        )
+        return links
+
+    return run
+
+
+def snapshot_search(context: Context) -> Callable[[], int]:
+    """Search-key lookups with 1-hop neighbourhoods in a memory-mapped snapshot."""
+    database = DatabaseType.BioGRID
+
+    def build() -> Snapshot:
+        batch = FrameTransformer(ID_FIELDS[database]).transform(context.frame(database))
+        builder = SnapshotBuilder(context.workdir / "snapshot" / "biogrid", database)
+        builder.add_nodes(batch.nodes)
+        builder.add_relationships(
+            [(r["a"], r["b"], r["properties"]) for r in batch.relationships]
+        )
+        return Snapshot(builder.finish())
+
+    snapshot = context.cached("snapshot", build)
+    keys = [
+        snapshot.node(i)[SEARCH_KEYS_FIELD][0]
+        for i in range(0, len(snapshot), max(len(snapshot) // 2000, 1))
+    ]
+
+    def run() -> int:
+        for key in keys:
+            snapshot.neighbourhoods(key)
+        return len(keys)
+
+    return run
+
+
+# source column holding the property the overlap reads, as returned by Neo4j
+OVERLAP_COLUMNS = {
+    DatabaseType.BioGRID: "Official Symbol Interactor A",
+    DatabaseType.IntAct: "Alias(es) interactor A",
+}
+
+
+def overlap(context: Context) -> Callable[[], int]:
+    """Streamed name extraction and the hashed join of IntAct and BioGRID names."""
+    interactors = {
+        database: [(value,) for value in context.frame(database)[column].unique()]
+        for database, column in OVERLAP_COLUMNS.items()
+    }
+    graphs = {
+        database: RecordingGraph(respond=lambda statement, parameters, rows=rows: rows)
+        for database, rows in interactors.items()
+    }
+
+    def run() -> int:
+        names = {}
+        for database, graph in graphs.items():
+            names[database.name] = set()
+            for batch in iter_name_batches(graph, database, batch_size=10_000):
+                names[database.name].update(batch)
+        join_names(names)
+        return sum(len(rows) for rows in interactors.values())
+
+    return run
+
+
+CASES: Dict[str, Case] = {
+    "read_input_data[BioGRID]": read_input_data(DatabaseType.BioGRID),
+    "read_input_data[IntAct]": read_input_data(DatabaseType.IntAct),
+    "read_input_data[BioGRID,pyarrow]": read_input_data(
+        DatabaseType.BioGRID, "pyarrow"
+    ),
+    "read_input_data[IntAct,pyarrow]": read_input_data(DatabaseType.IntAct, "pyarrow"),
+    "insert_entries[BioGRID]": insert_entries(DatabaseType.BioGRID),
+    "insert_entries[IntAct]": insert_entries(DatabaseType.IntAct),
+    "insert_entries[BioGRID,aggregated]": insert_entries(
+        DatabaseType.BioGRID, "aggregated"
+    ),
+    "insert_entries[IntAct,aggregated]": insert_entries(
+        DatabaseType.IntAct, "aggregated"
+    ),
+    "validate[BioGRID]": validate(DatabaseType.BioGRID),
+    "validate[IntAct]": validate(DatabaseType.IntAct),
+    "build_graph": graph_builder,
+    "snapshot_search": snapshot_search,
+    "overlap": overlap,
+}
+
+# cases allocating mostly outside the Python heap (pyarrow's memory pool),
+# which tracemalloc does not see; their memory is measured as process RSS
+NATIVE_ALLOCATIONS = {name for name in CASES if "pyarrow" in name}
+
+
+def select(patterns: List[str]) -> Dict[str, Case]:
+    """The cases whose name contains one of the patterns (all of them when none)."""
+    return {
+        name: case
+        for name, case in CASES.items()
+        if not patterns or any(pattern in name for pattern in patterns)
+    }
@@ -0,0 +1,77 @@
+"""In-process graph stand-in Module"""
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+Responder = Callable[[str, Dict[str, Any]], Iterable[Any]]
+
+
+class RecordingTransaction:
+    """Transaction of a `RecordingGraph`; statements count once committed."""
+
+    def __init__(self, graph: "RecordingGraph"):
+        """Initialize the transaction."""
+        self.graph = graph
+        self.statements: List[tuple] = []
+
+    def run(self, statement: str, **parameters: Any) -> Iterable[Any]:
+        """Queue a statement until the transaction is committed."""
+        self.statements.append((statement, parameters))
+        return []
+
+
+class RecordingGraph:
+    """Stand-in for `py2neo.Graph` recording what would have been sent to Neo4j.
+
+    Statements are counted by their first line and `$rows` parameters by
+    size; nothing is kept, so memory use stays that of the code under test.
+    `latency` seconds are spent on every round trip, and `respond`, if
+    given, produces the records of statements run outside a transaction.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        latency: float = 0.0,
+        respond: Optional[Responder] = None,
+    ):
+        """Initialize the graph."""
+        self.name = name
+        self.latency = latency
+        self.respond = respond
+        self.statements: Counter = Counter()
+        self.rows = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self._lock = threading.Lock()
+
+    def _record(self, statement: str, parameters: Dict[str, Any]) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.statements[statement.strip().splitlines()[0].strip()] += 1
+            self.rows += len(parameters.get("rows") or ())
+
+    def begin(self) -> RecordingTransaction:
+        """Start a transaction."""
+        return RecordingTransaction(self)
+
+    def commit(self, tx: RecordingTransaction) -> None:
+        """Record the statements of a transaction."""
+        for statement, parameters in tx.statements:
+            self._record(statement, parameters)
+        with self._lock:
+            self.commits += 1
+
+    def rollback(self, tx: RecordingTransaction) -> None:
+        """Drop the statements of a transaction."""
+        with self._lock:
+            self.rollbacks += 1
+
+    def run(self, statement: str, **parameters: Any) -> Iterable[Any]:
+        """Record an auto-commit statement and return its records, if any."""
+        self._record(statement, parameters)
+        if self.respond is None:
+            return iter(())
+        return iter(self.respond(statement, parameters))
@@ -0,0 +1,310 @@
+"""Benchmark runner Module"""
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.cases import CASES, NATIVE_ALLOCATIONS, Case, Context, select
+from benchmarks.synthetic import SyntheticRelease
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+DEFAULT_TOLERANCE = 0.25
+MACHINE_ENV = "BENCHMARK_MACHINE"
+
+
+@dataclass
+class Measurement:
+    """Outcome of one benchmark case."""
+
+    name: str
+    rows: int
+    seconds: float  # best of the timed runs
+    peak_mb: float  # peak memory growth of a separate run
+    memory: str = "traced"  # how peak_mb was measured: "traced" or "rss"
+
+    @property
+    def rows_per_second(self) -> float:
+        """Throughput of the best run."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _status_kb(field: str) -> Optional[int]:
+    """A memory field of /proc/self/status, in kB (None where there is no /proc)."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _peak_rss_kb() -> int:
+    """Peak resident set size of this process, in kB."""
+    peak = _status_kb("VmHWM")
+    if peak is not None:
+        return peak
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss // 1024 if sys.platform == "darwin" else maxrss  # bytes there
+
+
+def _reset_peak_rss() -> None:
+    """Reset the peak RSS to the current RSS, where the kernel allows it (Linux)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+def _rss_run(
+    name: str,
+    release: SyntheticRelease,
+    workdir: Path,
+    files: Dict[str, Path],
+    results: "multiprocessing.Queue[float]",
+) -> None:
+    """Run a case once in this (fresh) process and report its peak RSS growth in MB."""
+    run = CASES[name](Context(release, workdir, dict(files)))
+    gc.collect()
+    _reset_peak_rss()
+    before = _peak_rss_kb()
+    run()
+    results.put((_peak_rss_kb() - before) / 1024)
+
+
+def peak_rss_growth(name: str, context: Context) -> float:
+    """Peak RSS growth (MB) of one run of a case, in a subprocess of its own.
+
+    Unlike tracemalloc, RSS counts native allocations (pyarrow's memory
+    pool); a fresh process keeps the benchmark's own memory and earlier
+    cases out of it. Release files already written are reused.
+    """
+    spawn = multiprocessing.get_context("spawn")
+    results = spawn.Queue()
+    child = spawn.Process(
+        target=_rss_run,
+        args=(name, context.release, context.workdir, context.files(), results),
+    )
+    child.start()
+    try:
+        return results.get(timeout=600)
+    finally:
+        child.join()
+
+
+def measure(name: str, case: Case, context: Context, repeat: int) -> Measurement:
+    """Time a case (best of `repeat` runs), then measure its peak memory in one more run.
+
+    Memory is measured apart from the timing runs, as tracing slows
+    allocations down. Cases in `NATIVE_ALLOCATIONS` are measured as the
+    RSS growth of a subprocess, the others with tracemalloc.
+    """
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        run = case(context)
+        gc.collect()
+        started = time.perf_counter()
+        rows = run()
+        best = min(best, time.perf_counter() - started)
+
+    if name in NATIVE_ALLOCATIONS:
+        return Measurement(name, rows, best, peak_rss_growth(name, context), "rss")
+    run = case(context)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Measurement(name, rows, best, peak / 2**20)
+
+
+def scale_key(release: SyntheticRelease) -> str:
+    """Baselines are only comparable at the same scale."""
+    return f"{release.interactions}x{release.interactors}"
+
+
+def default_machine() -> str:
+    """The machine baselines are stored for: $BENCHMARK_MACHINE, else the host name.
+
+    Throughput depends on the hardware, so baselines are only comparable
+    on the machine (or CI runner type) they were recorded on; CI should set
+    BENCHMARK_MACHINE to its runner type, as runner host names change.
+    """
+    return os.environ.get(MACHINE_ENV) or platform.node() or "unknown"
+
+
+def load_baselines(path: Path) -> Dict[str, Dict[str, Dict[str, Dict[str, float]]]]:
+    """Stored baselines, by machine, scale and case."""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baselines(
+    path: Path,
+    machine: str,
+    release: SyntheticRelease,
+    measurements: List[Measurement],
+) -> None:
+    """Store the measurements as the baselines of their machine and scale."""
+    baselines = load_baselines(path)
+    scale = baselines.setdefault(machine, {}).setdefault(scale_key(release), {})
+    for m in measurements:
+        scale[m.name] = {
+            "rows_per_second": round(m.rows_per_second, 1),
+            "peak_mb": round(m.peak_mb, 2),
+        }
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+def regressions(
+    measurement: Measurement,
+    baseline: Optional[Dict[str, float]],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """How a measurement is worse than its baseline by more than the tolerance."""
+    if baseline is None:
+        return []
+    found = []
+    if measurement.rows_per_second < baseline["rows_per_second"] * (1 - tolerance):
+        found.append(
+            f"{measurement.rows_per_second:,.0f} rows/s "
+            f"< baseline {baseline['rows_per_second']:,.0f}"
+        )
+    if measurement.peak_mb > baseline["peak_mb"] * (1 + tolerance):
+        found.append(
+            f"{measurement.peak_mb:.1f} MB > baseline {baseline['peak_mb']:.1f}"
+        )
+    return found
+
+
+def main() -> None:
+    """Run the benchmarks and compare them with the stored baselines."""
+    args = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description=(
+            "Benchmark the parser, the search graph builder and the overlap on "
+            "synthetic BioGRID/IntAct releases, against stored baselines."
+        ),
+    )
+    args.add_argument("--interactions", type=int, default=50_000)
+    args.add_argument("--interactors", type=int, default=10_000)
+    args.add_argument(
+        "--duplicate-rate",
+        type=float,
+        default=0.2,
+        help="share of rows repeating the interactor pair of an earlier row",
+    )
+    args.add_argument("--seed", type=int, default=0)
+    args.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    args.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="only run the cases whose name contains PATTERN (repeatable)",
+    )
+    args.add_argument(
+        "--workdir",
+        type=Path,
+        help="where the synthetic releases are written (default: a temporary directory)",
+    )
+    args.add_argument("--baselines", type=Path, default=BASELINES_PATH)
+    args.add_argument(
+        "--machine",
+        default=default_machine(),
+        help=(
+            f"machine the baselines are compared with and saved for "
+            f"(default: ${MACHINE_ENV}, else the host name)"
+        ),
+    )
+    args.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="store the results as the baselines of this machine and scale",
+    )
+    args.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="relative slowdown or memory growth reported as a regression",
+    )
+    args.add_argument("--json", action="store_true", help="print the results as JSON")
+    options = args.parse_args()
+
+    release = SyntheticRelease(
+        interactions=options.interactions,
+        interactors=options.interactors,
+        duplicate_rate=options.duplicate_rate,
+        seed=options.seed,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        context = Context(release, options.workdir or Path(tmp))
+        measurements = [
+            measure(name, case, context, max(options.repeat, 1))
+            for name, case in select(options.only).items()
+        ]
+
+    machines = load_baselines(options.baselines)
+    baselines = machines.get(options.machine, {}).get(scale_key(release), {})
+    failed = {
+        m.name: regressions(m, baselines.get(m.name), options.tolerance)
+        for m in measurements
+    }
+    if options.json:
+        print(
+            json.dumps(
+                {
+                    "machine": options.machine,
+                    "scale": scale_key(release),
+                    "python": platform.python_version(),
+                    "results": [
+                        {
+                            **asdict(m),
+                            "rows_per_second": m.rows_per_second,
+                            "regressions": failed[m.name],
+                        }
+                        for m in measurements
+                    ],
+                },
+                indent=2,
+            )
+        )
+    else:
+        print(
+            f"machine {options.machine}, scale {scale_key(release)}, "
+            f"best of {options.repeat}"
+        )
+        if not baselines:
+            known = ", ".join(sorted(machines)) or "none"
+            print(f"no baselines for this machine and scale (machines: {known})")
+        for m in measurements:
+            status = "; ".join(failed[m.name]) or (
+                "ok" if m.name in baselines else "no baseline"
+            )
+            print(
+                f"{m.name:<34} {m.rows:>9} rows {m.seconds:>8.3f}s "
+                f"{m.rows_per_second:>12,.0f} rows/s {m.peak_mb:>8.1f} MB "
+                f"{m.memory:<6} {status}"
+            )
+
+    if options.save_baseline:
+        save_baselines(options.baselines, options.machine, release, measurements)
+        print(f"baselines saved to {options.baselines}")
+    elif any(failed.values()):
+        raise SystemExit(1)
@@ -0,0 +1,304 @@
+"""Synthetic BioGRID and IntAct release generator Module"""
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+BIOGRID_COLUMNS = [
+    "#BioGRID Interaction ID",
+    "Entrez Gene Interactor A",
+    "Entrez Gene Interactor B",
+    "BioGRID ID Interactor A",
+    "BioGRID ID Interactor B",
+    "Systematic Name Interactor A",
+    "Systematic Name Interactor B",
+    "Official Symbol Interactor A",
+    "Official Symbol Interactor B",
+    "Synonyms Interactor A",
+    "Synonyms Interactor B",
+    "Experimental System",
+    "Experimental System Type",
+    "Author",
+    "Publication Source",
+    "Organism ID Interactor A",
+    "Organism ID Interactor B",
+    "Throughput",
+    "Score",
+    "Modification",
+    "Qualifications",
+    "Tags",
+    "Source Database",
+    "SWISS-PROT Accessions Interactor A",
+    "TREMBL Accessions Interactor A",
+    "REFSEQ Accessions Interactor A",
+    "SWISS-PROT Accessions Interactor B",
+    "TREMBL Accessions Interactor B",
+    "REFSEQ Accessions Interactor B",
+    "Ontology Term IDs",
+    "Ontology Term Names",
+    "Ontology Term Categories",
+    "Ontology Term Qualifier IDs",
+    "Ontology Term Qualifier Names",
+    "Ontology Term Types",
+    "Organism Name Interactor A",
+    "Organism Name Interactor B",
+]
+
+INTACT_COLUMNS = [
+    "#ID(s) interactor A",
+    "ID(s) interactor B",
+    "Alt. ID(s) interactor A",
+    "Alt. ID(s) interactor B",
+    "Alias(es) interactor A",
+    "Alias(es) interactor B",
+    "Interaction detection method(s)",
+    "Publication 1st author(s)",
+    "Publication Identifier(s)",
+    "Taxid interactor A",
+    "Taxid interactor B",
+    "Interaction type(s)",
+    "Source database(s)",
+    "Interaction identifier(s)",
+    "Confidence value(s)",
+    "Expansion method(s)",
+    "Biological role(s) interactor A",
+    "Biological role(s) interactor B",
+    "Experimental role(s) interactor A",
+    "Experimental role(s) interactor B",
+    "Type(s) interactor A",
+    "Type(s) interactor B",
+    "Xref(s) interactor A",
+    "Xref(s) interactor B",
+    "Interaction Xref(s)",
+    "Annotation(s) interactor A",
+    "Annotation(s) interactor B",
+    "Interaction annotation(s)",
+    "Host organism(s)",
+    "Interaction parameter(s)",
+    "Creation date",
+    "Update date",
+    "Checksum(s) interactor A",
+    "Checksum(s) interactor B",
+    "Interaction Checksum(s)",
+    "Negative",
+    "Feature(s) interactor A",
+    "Feature(s) interactor B",
+    "Stoichiometry(s) interactor A",
+    "Stoichiometry(s) interactor B",
+    "Identification method participant A",
+    "Identification method participant B",
+]
+
+ORGANISMS = [("9606", "Homo sapiens", "human"), ("10090", "Mus musculus", "mouse")]
+SYSTEMS = [
+    ("Two-hybrid", "physical"),
+    ("Affinity Capture-MS", "physical"),
+    ("Synthetic Lethality", "genetic"),
+]
+
+
+@dataclass
+class SyntheticRelease:
+    """Shape of a synthetic release.
+
+    Interactors are drawn with a Zipf-like skew, so a few hubs take part
+    in many interactions as in the real releases, and `duplicate_rate` of
+    the rows repeat the interactor pair of an earlier row (another piece
+    of evidence for the same interaction). `shared_rate` of the gene
+    symbols are common to BioGRID and IntAct.
+    """
+
+    interactions: int = 50_000
+    interactors: int = 10_000
+    duplicate_rate: float = 0.2
+    shared_rate: float = 0.6
+    seed: int = 0
+
+    def pairs(self, rng: np.random.Generator) -> np.ndarray:
+        """Interactor indices (A, B) of every row."""
+        weights = 1 / np.arange(1, self.interactors + 1) ** 0.8
+        weights /= weights.sum()
+        pairs = rng.choice(self.interactors, size=(self.interactions, 2), p=weights)
+        duplicates = rng.random(self.interactions) < self.duplicate_rate
+        duplicates[0] = False
+        positions = np.arange(self.interactions)
+        # a duplicate repeats a random earlier row
+        earlier = (rng.random(self.interactions) * positions).astype(int)
+        source = np.where(duplicates, earlier, positions)
+        return pairs[source]
+
+    def symbols(self, prefix: str) -> np.ndarray:
+        """Gene symbol of every interactor; shared ones match the other source's."""
+        ids = np.arange(self.interactors)
+        shared = ids < int(self.interactors * self.shared_rate)
+        return np.where(shared, _text("GENE", ids), _text(prefix, ids))
+
+
+def _text(prefix: str, numbers: np.ndarray) -> np.ndarray:
+    """Strings made of a prefix and a number, e.g. `GENE12`."""
+    return np.char.add(prefix, numbers.astype(str))
+
+
+def _write_zip(frame: pd.DataFrame, path: Path, member: str) -> Path:
+    """Write a frame as a zipped tab-separated file, like the releases ship."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open(member, "w") as file:
+            frame.to_csv(file, sep="\t", index=False)
+    return path
+
+
+def _sides(values: Dict[str, np.ndarray], pairs: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-interactor columns, as interactor A and B values of every row."""
+    columns = {}
+    for name, per_interactor in values.items():
+        for side, column in (("A", 0), ("B", 1)):
+            columns[name.format(side=side)] = per_interactor[pairs[:, column]]
+    return columns
+
+
+def biogrid_frame(release: SyntheticRelease) -> pd.DataFrame:
+    """A BioGRID tab3 release."""
+    rng = np.random.default_rng(release.seed)
+    pairs = release.pairs(rng)
+    ids = np.arange(release.interactors)
+    symbols = release.symbols("BG")
+    organism = rng.integers(0, len(ORGANISMS), release.interactors)
+    system = rng.integers(0, len(SYSTEMS), release.interactions)
+    per_interactor = {
+        "Entrez Gene Interactor {side}": (1000 + ids).astype(str),
+        "BioGRID ID Interactor {side}": (100_000 + ids).astype(str),
+        "Systematic Name Interactor {side}": np.where(
+            ids % 3 == 0, "-", _text("ORF", ids)
+        ),
+        "Official Symbol Interactor {side}": symbols,
+        "Synonyms Interactor {side}": np.char.add(
+            np.char.add(symbols.astype(str), "L|"), symbols.astype(str)
+        ),
+        "Organism ID Interactor {side}": np.array([o[0] for o in ORGANISMS])[organism],
+        "SWISS-PROT Accessions Interactor {side}": _text("P", 10_000 + ids),
+        "TREMBL Accessions Interactor {side}": np.full(release.interactors, "-"),
+        "REFSEQ Accessions Interactor {side}": _text("NP_", ids * 7),
+        "Organism Name Interactor {side}": np.array([o[1] for o in ORGANISMS])[
+            organism
+        ],
+    }
+    columns = _sides(per_interactor, pairs)
+    columns.update(
+        {
+            "#BioGRID Interaction ID": np.arange(1, release.interactions + 1),
+            "Experimental System": np.array([s[0] for s in SYSTEMS])[system],
+            "Experimental System Type": np.array([s[1] for s in SYSTEMS])[system],
+            "Author": "Doe J (2020)",
+            "Publication Source": _text(
+                "PUBMED:", rng.integers(1, 10**7, release.interactions)
+            ),
+            "Throughput": np.where(system == 1, "High Throughput", "Low Throughput"),
+            "Score": "-",
+            "Modification": "-",
+            "Qualifications": "-",
+            "Tags": "-",
+            "Source Database": "BIOGRID",
+        }
+    )
+    for column in BIOGRID_COLUMNS:
+        columns.setdefault(column, "-")
+    return pd.DataFrame(columns)[BIOGRID_COLUMNS]
+
+
+def intact_frame(release: SyntheticRelease) -> pd.DataFrame:
+    """An IntAct MITAB 2.7 release."""
+    rng = np.random.default_rng(release.seed + 1)
+    pairs = release.pairs(rng)
+    ids = np.arange(release.interactors)
+    symbols = release.symbols("IA")
+    accessions = _text("P", 10_000 + ids)
+    organism = rng.integers(0, len(ORGANISMS), release.interactors)
+    taxids = np.array(
+        [f"taxid:{o[0]}({o[2]})|taxid:{o[0]}({o[1]})" for o in ORGANISMS]
+    )[organism]
+    aliases = [
+        f"psi-mi:{s.lower()}_{ORGANISMS[o][2]}(display_long)|uniprotkb:{s}(gene name)"
+        f"|psi-mi:{s}(display_short)|uniprotkb:{s}L(gene name synonym)"
+        for s, o in zip(symbols, organism)
+    ]
+    per_interactor = {
+        "ID(s) interactor {side}": np.char.add("uniprotkb:", accessions),
+        "Alt. ID(s) interactor {side}": _text("intact:EBI-", ids * 13),
+        "Alias(es) interactor {side}": np.array(aliases),
+        "Taxid interactor {side}": taxids,
+        "Biological role(s) interactor {side}": np.full(
+            release.interactors, 'psi-mi:"MI:0499"(unspecified role)'
+        ),
+        "Type(s) interactor {side}": np.full(
+            release.interactors, 'psi-mi:"MI:0326"(protein)'
+        ),
+        "Checksum(s) interactor {side}": _text("rogid:", ids * 31),
+    }
+    columns = _sides(per_interactor, pairs)
+    columns["#ID(s) interactor A"] = columns.pop("ID(s) interactor A")
+    rows = np.arange(1, release.interactions + 1)
+    columns.update(
+        {
+            "Interaction detection method(s)": 'psi-mi:"MI:0018"(two hybrid)',
+            "Publication 1st author(s)": "Doe et al. (2020)",
+            "Publication Identifier(s)": _text(
+                "pubmed:", rng.integers(1, 10**7, release.interactions)
+            ),
+            "Interaction type(s)": 'psi-mi:"MI:0915"(physical association)',
+            "Source database(s)": 'psi-mi:"MI:0469"(IntAct)',
+            "Interaction identifier(s)": _text("intact:EBI-", rows),
+            "Confidence value(s)": "intact-miscore:0.56",
+            "Creation date": "2020/01/01",
+            "Update date": "2020/01/01",
+            "Interaction Checksum(s)": _text("intact-crc:", rows),
+            "Negative": "false",
+        }
+    )
+    for column in INTACT_COLUMNS:
+        columns.setdefault(column, "-")
+    return pd.DataFrame(columns)[INTACT_COLUMNS]
+
+
+def write_biogrid(release: SyntheticRelease, directory: Path) -> Path:
+    """Write a synthetic `BIOGRID-ALL-*.tab3.zip` into a directory."""
+    return _write_zip(
+        biogrid_frame(release),
+        Path(directory) / "BIOGRID-ALL-synthetic.tab3.zip",
+        "BIOGRID-ALL-synthetic.tab3.txt",
+    )
+
+
+def write_intact(release: SyntheticRelease, directory: Path) -> Path:
+    """Write a synthetic `intact.zip` into a directory."""
+    return _write_zip(
+        intact_frame(release), Path(directory) / "intact.zip", "intact.txt"
+    )
+
+
+def search_result(release: SyntheticRelease, degree: int = 20) -> List[Dict]:
+    """Records shaped like a search result: interactors with their neighbours."""
+    rng = np.random.default_rng(release.seed + 2)
+    symbols = release.symbols("BG")
+
+    def node(i: int) -> Dict[str, str]:
+        return {
+            "BioGRID_ID": str(100_000 + i),
+            "Official_Symbol": symbols[i],
+            "Display_Title": symbols[i],
+            "Species": "Homo sapiens",
+        }
+
+    hubs = rng.choice(release.interactors, size=max(release.interactions // degree, 1))
+    return [
+        {
+            "interactor_a": node(int(hub)),
+            "interactor_b": [
+                node(int(i)) for i in rng.choice(release.interactors, size=degree)
+            ],
+        }
+        for hub in hubs
+    ]
@@ -0,0 +1,195 @@
+"""Neo4j connection management Module"""
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+from py2neo import Graph, GraphService
+from py2neo.client import Connection
+from py2neo.client.bolt import Bolt3, BoltTransactionRef
+from py2neo.cypher import Cursor
+from py2neo.cypher.proc import ProcedureLibrary
+from py2neo.database import Schema
+from py2neo.errors import ConnectionBroken, ConnectionUnavailable
+
+DEFAULT_URI = "bolt://localhost:7687"
+DEFAULT_USER = "neo4j"
+DEFAULT_PASSWORD = "database"
+DEFAULT_MAX_CONNECTIONS = 40  # py2neo's default pool size
+DEFAULT_MAX_CONNECTION_AGE = 3600  # seconds
+
+
+@dataclass
+class Neo4jSettings:
+    """Where and how to connect to Neo4j."""
+
+    uri: str = DEFAULT_URI
+    user: str = DEFAULT_USER
+    password: str = DEFAULT_PASSWORD
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    max_connection_age: float = DEFAULT_MAX_CONNECTION_AGE
+
+    @classmethod
+    def from_env(cls) -> "Neo4jSettings":
+        """Read the settings from the environment (and `.env`).
+
+        NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, NEO4J_MAX_CONNECTIONS and
+        NEO4J_MAX_CONNECTION_AGE; the defaults match a local Neo4j Desktop.
+        """
+        load_dotenv()
+        return cls(
+            uri=os.environ.get("NEO4J_URI", DEFAULT_URI),
+            user=os.environ.get("NEO4J_USER", DEFAULT_USER),
+            password=os.environ.get("NEO4J_PASSWORD", DEFAULT_PASSWORD),
+            max_connections=int(
+                os.environ.get("NEO4J_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)
+            ),
+            max_connection_age=float(
+                os.environ.get("NEO4J_MAX_CONNECTION_AGE", DEFAULT_MAX_CONNECTION_AGE)
+            ),
+        )
+
+
+class SharedGraph(Graph):
+    """A `Graph` running on an existing `GraphService` rather than one of its own."""
+
+    def __init__(self, service: GraphService, name: Optional[str] = None):
+        """Initialize the graph; mirrors `Graph.__init__` minus the service creation."""
+        self.service = service
+        self.__name__ = name
+        self.schema = Schema(self)
+        self._procedures = ProcedureLibrary(self)
+
+
+class ConnectionManager:
+    """One pool of Bolt connections shared by the graphs of every database.
+
+    py2neo gives each `Graph` its own `GraphService`, and with it its own
+    connection pool, so a `Graph` per call site (or per request) means a
+    new pool and a new connection handshake each time. Here one long-lived
+    service is created on first use and every graph handed out, whatever
+    its database name, runs its transactions on that service's pool.
+    """
+
+    def __init__(self, settings: Optional[Neo4jSettings] = None):
+        """Initialize the manager; nothing is connected until a graph is used."""
+        self.settings = settings or Neo4jSettings.from_env()
+        self._service: Optional[GraphService] = None
+        self._graphs: Dict[Optional[str], Graph] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def service(self) -> GraphService:
+        """The shared graph service, created on first use."""
+        with self._lock:
+            if self._service is None:
+                self._service = GraphService(
+                    self.settings.uri,
+                    auth=(self.settings.user, self.settings.password),
+                    max_size=self.settings.max_connections,
+                    max_age=self.settings.max_connection_age,
+                )
+            return self._service
+
+    def graph(self, name: Optional[str] = None) -> Graph:
+        """The graph of a database (the server's default one when None)."""
+        service = self.service
+        with self._lock:
+            graph = self._graphs.get(name)
+            if graph is None:
+                graph = self._graphs[name] = SharedGraph(service, name)
+            return graph
+
+    def reserve(self, size: int) -> None:
+        """Let the pool grow to at least `size` connections, e.g. one per concurrent writer."""
+        with self._lock:
+            if size <= self.settings.max_connections:
+                return
+            self.settings.max_connections = size
+            if self._service is not None:
+                # applies to the pools opened so far and to later ones
+                connector = self._service.connector
+                connector._max_size = size
+                for pool in connector._pools.values():
+                    pool.max_size = size
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pool usage: connections open and in use per server, and the pool limit."""
+        pools = []
+        if self._service is not None:
+            # the connector does not expose its pools publicly
+            for profile, pool in list(self._service.connector._pools.items()):
+                pools.append(
+                    {
+                        "address": str(profile.address),
+                        "size": pool.size,
+                        "in_use": pool.in_use,
+                        "max_size": pool.max_size,
+                    }
+                )
+        return {
+            "uri": self.settings.uri,
+            "graphs": sorted(str(name) for name in self._graphs),
+            "max_connections": self.settings.max_connections,
+            "pools": pools,
+        }
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._lock:
+            if self._service is not None:
+                self._service.connector.close()
+            self._service = None
+            self._graphs = {}
+
+
+_connections: Optional[ConnectionManager] = None
+_connections_lock = threading.Lock()
+
+
+def connections() -> ConnectionManager:
+    """The process-wide connection manager, configured from the environment."""
+    global _connections
+    with _connections_lock:
+        if _connections is None:
+            _connections = ConnectionManager()
+        return _connections
+
+
+def get_graph(name: Optional[str] = None) -> Graph:
+    """Shortcut for `connections().graph(name)`."""
+    return connections().graph(name)
+
+
+def run_with_timeout(
+    graph: Graph, cypher: str, timeout: Optional[float], **parameters: Any
+) -> Cursor:
+    """Run a read query in an auto-commit transaction Neo4j ends after `timeout` seconds.
+
+    Abandoning a query client-side leaves it running on the server and on
+    the thread waiting for it; with a transaction timeout the server fails
+    it instead, which frees both. py2neo does not pass transaction timeouts
+    (its `timeout` arguments are commented out), so the RUN message is sent
+    here with Bolt's `tx_timeout`, as `Connector.auto_run` would send it
+    otherwise. Without a timeout, or on servers older than Bolt 3, this is
+    `graph.run`.
+    """
+    if not timeout:
+        return graph.run(cypher, parameters)
+    connector = graph.service.connector
+    cx = connector._acquire(graph.name, readonly=True)
+    if not isinstance(cx, Bolt3):
+        cx.release()
+        return graph.run(cypher, parameters)
+    try:
+        cx._assert_open()
+        cx._assert_no_transaction()
+        cx._transaction = BoltTransactionRef(cx, graph.name, readonly=True)
+        extra = dict(cx._transaction.extra, tx_timeout=int(timeout * 1000))
+        result = cx._run(graph.name, cypher, parameters, extra, final=True)
+    except (ConnectionUnavailable, ConnectionBroken):
+        connector.prune(cx.profile)
+        raise
+    connector.pull(result, -1)
+    return Cursor(result, Connection.default_hydrant(cx.profile, graph))
@@ -0,0 +1,40 @@
+"""Loaded data version Module"""
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional
+
+DEFAULT_DATA_VERSION_PATH = ".bio_data_merge/data_version"
+
+
+def _version_path(path: Path, database: Optional[str]) -> Path:
+    """File holding the version of one database's data (or of the whole graph)."""
+    return (
+        path if database is None else path.with_name(f"{path.name}.{database.lower()}")
+    )
+
+
+def read_data_version(path: Path, database: Optional[str] = None) -> str:
+    """Version of the data in the graph; changes whenever the processor finishes a load.
+
+    With a database, the version of that database's data: it only changes
+    when the database itself is loaded (the graph's version is used for
+    databases loaded before versions were kept per database).
+    """
+    for candidate in dict.fromkeys([_version_path(path, database), path]):
+        try:
+            return candidate.read_text().strip()
+        except FileNotFoundError:
+            continue
+    return ""
+
+
+def bump_data_version(path: Path, databases: Iterable[str] = ()) -> str:
+    """Record that the graph (and the given databases in it) changed and return the new version."""
+    version = uuid.uuid4().hex
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for database in [*databases, None]:
+        target = _version_path(path, database)
+        tmp = target.with_name(f"{target.name}.tmp")
+        tmp.write_text(version)
+        tmp.replace(target)
+    return version
@@ -1,8 +1,22 @@
 import os
+from pathlib import Path
 
 from flask import Flask
+from bio_data_merge.data_version import DEFAULT_DATA_VERSION_PATH
+from bio_data_merge.frontend.fan_out import DEFAULT_TIMEOUT, DEFAULT_WORKERS, FanOut
+from bio_data_merge.frontend.graph import DEFAULT_MAX_NODES
+from bio_data_merge.processor.snapshot import DEFAULT_SNAPSHOT_DIR
+from bio_data_merge.frontend.snapshots import SnapshotStore
+from bio_data_merge.frontend.result_cache import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_ENTRIES,
+    DEFAULT_TTL,
+    ResultCache,
+)
 from bio_data_merge.frontend.blueprints.index import index_bp
+from bio_data_merge.frontend.blueprints.metrics import metrics_bp
 from bio_data_merge.frontend.blueprints.interactor_search import (
+    interactor_search_api_bp,
     interactor_search_bp,
     interactor_search_results_bp,
     interactor_search_results_graph_bp,
@@ -14,6 +28,25 @@ def create_app(test_config=None):
     app = Flask(__name__, instance_relative_config=True)
     app.config.from_mapping(
         SECRET_KEY="dev",
+        RESULT_CACHE_MAX_ENTRIES=int(
+            os.environ.get("RESULT_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+        ),
+        RESULT_CACHE_MAX_BYTES=int(
+            os.environ.get("RESULT_CACHE_MAX_MB", DEFAULT_MAX_BYTES // 2**20)
+        )
+        * 2**20,
+        RESULT_CACHE_TTL=float(os.environ.get("RESULT_CACHE_TTL", DEFAULT_TTL)),
+        GRAPH_MAX_NODES=int(os.environ.get("GRAPH_MAX_NODES", DEFAULT_MAX_NODES)),
+        SEARCH_WORKERS=int(os.environ.get("SEARCH_WORKERS", DEFAULT_WORKERS)),
+        SEARCH_SOURCE_TIMEOUT=float(
+            os.environ.get("SEARCH_SOURCE_TIMEOUT", DEFAULT_TIMEOUT)
+        ),
+        # directory of the processor's snapshots, searched instead of Neo4j
+        SNAPSHOT_DIR=os.environ.get("SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR),
+        # version of the loaded data, bumped by the processor after every load
+        DATA_VERSION_PATH=os.environ.get(
+            "DATA_VERSION_PATH", DEFAULT_DATA_VERSION_PATH
+        ),
         # DATABASE=os.path.join(app.instance_path, 'flaskr.sqlite'),
     )
 
@@ -30,9 +63,28 @@ def create_app(test_config=None):
     except OSError:
         pass
 
+    # search results, shared by the search, results and graph routes
+    app.extensions["result_cache"] = ResultCache(
+        max_entries=app.config["RESULT_CACHE_MAX_ENTRIES"],
+        max_bytes=app.config["RESULT_CACHE_MAX_BYTES"],
+        ttl=app.config["RESULT_CACHE_TTL"],
+    )
+    # memory-mapped graph snapshots, used while their data is current
+    app.extensions["snapshots"] = SnapshotStore(
+        Path(app.config["SNAPSHOT_DIR"]) if app.config["SNAPSHOT_DIR"] else None,
+        Path(app.config["DATA_VERSION_PATH"]),
+    )
+    # queries the ticked databases concurrently
+    app.extensions["search_fan_out"] = FanOut(
+        max_workers=app.config["SEARCH_WORKERS"],
+        timeout=app.config["SEARCH_SOURCE_TIMEOUT"],
+    )
+
     app.register_blueprint(index_bp)
     app.register_blueprint(interactor_search_bp)
     app.register_blueprint(interactor_search_results_bp)
     app.register_blueprint(interactor_search_results_graph_bp)
+    app.register_blueprint(interactor_search_api_bp)
+    app.register_blueprint(metrics_bp)
 
     return app
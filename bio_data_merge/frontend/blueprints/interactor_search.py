@@ -1,71 +1,178 @@
 from json import dumps
-import re
-import sys
-from typing import Dict, List
-from flask import render_template, redirect, request
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from flask import (
+    abort,
+    current_app,
+    render_template,
+    redirect,
+    request,
+    stream_with_context,
+)
 
 from flask import Blueprint, render_template, Response
-from bio_data_merge.model.database.database import DatabaseType
-from py2neo import Graph, Node
-
-
-def run_cypher_query(dbs: List[str], interactor_name: str) -> List[dict]:
-    """Run a query using the neo4j backend"""
-    biogrid_fields = [
-        # "Systematic_Name",
-        "Official_Symbol",
-        # "Synonyms",
-        # "Entrez_Gene",
-    ]
-    intact_fields = ["Alt_IDs", "IDs", "Aliases"]
-
-    def _create_params(db: str) -> str:
-        """Create the params string for the query"""
-        match db:
-            case DatabaseType.BioGRID.name:
-                return " OR ".join(
-                    [
-                        f"interactor.{f} =~ '{interactor_name}'"
-                        for f in biogrid_fields
-                    ] + [
-                        f"other.{f} =~ '{interactor_name}'"
-                        for f in biogrid_fields
-                    ]
-                )
-            case DatabaseType.IntAct.name:
-                return " OR ".join(
-                    [
-                        f"interactor.{f} =~ '(?i).+(' + '{interactor_name}' +')\(display_short\)'"
-                        for f in intact_fields
-                    ] +  [
-                        f"other.{f} =~  '(?i).+(' + '{interactor_name}' +')\(display_short\)'"
-                        for f in intact_fields
-                    ]
-                )
-
-    def _create_query() -> str:
-        """Create the query string for the query"""
-        qs = []
-        for db in dbs:
-            params = _create_params(db)
-            query = f"""USE main.{db}
-MATCH (interactor:Interactor)-[:INTERACTS_WITH]->(other:Interactor)
-WHERE {params}
-RETURN (interactor) as interactor_a, collect(other) as interactor_b
+from bio_data_merge.connection import get_graph, run_with_timeout
+from bio_data_merge.data_version import read_data_version
+from bio_data_merge.frontend.fan_out import FanOut, FanOutResult
+from bio_data_merge.frontend.graph import build_graph
+from bio_data_merge.frontend.result_cache import ResultCache
+from bio_data_merge.frontend.snapshots import SnapshotStore
+from bio_data_merge.metrics import registry
+from bio_data_merge.model.database.database import DatabaseType, ID_FIELDS
+from bio_data_merge.processor.schema import offline_indexes
+from bio_data_merge.processor.search_keys import normalise_key
+from bio_data_merge.processor.snapshot import Snapshot
+from py2neo.cypher import Record
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+DEFAULT_NEIGHBOURS = 50
+MAX_NEIGHBOURS = 1000
+
+_online_dbs: Set[str] = set()  # databases whose indexes were seen ONLINE
+
+
+def result_cache() -> ResultCache:
+    """The app's search result cache."""
+    return current_app.extensions["result_cache"]
+
+
+def current_snapshots(dbs: List[str]) -> Dict[str, Optional[Snapshot]]:
+    """The current snapshot of each database, None for those searched in Neo4j."""
+    store: SnapshotStore = current_app.extensions["snapshots"]
+    return {db: store.get(db) for db in dbs}
+
+
+def check_indexes_online(dbs: List[str]) -> bool:
+    """Check that the searched databases' indexes are ONLINE, warning when they are not.
+
+    Searches still run against a database whose indexes are populating, but
+    fall back to label scans until they are done.
+    """
+    for db in dbs:
+        if db in _online_dbs:
+            continue
+        graph = get_graph(db.lower())
+        offline = offline_indexes(graph)
+        if offline:
+            names = ", ".join(f"{i['name']} ({i['state']})" for i in offline)
+            current_app.logger.warning("%s: indexes not online: %s", db, names)
+        else:
+            _online_dbs.add(db)
+    return all(db in _online_dbs for db in dbs)
+
+
+# pairs where the interactor matches, then pairs where only the other does
+SEARCH_SUBQUERY = """
+CALL {
+    MATCH (:SearchKey {key: $key})-[:KEY_OF]->(interactor:Interactor)
+          -[:INTERACTS_WITH]->(other:Interactor)
+    RETURN interactor, other
+    UNION ALL
+    MATCH (:SearchKey {key: $key})-[:KEY_OF]->(other:Interactor)
+          <-[:INTERACTS_WITH]-(interactor:Interactor)
+    WHERE NOT EXISTS { (:SearchKey {key: $key})-[:KEY_OF]->(interactor) }
+    RETURN interactor, other
+}
+"""
+
+
+def search_query(db: str, paginated: bool = False, capped: bool = False) -> str:
+    """Create the query string searching one database
+
+    Rows are ordered by the interactor's ID so pages are stable; with
+    `capped`, at most `$neighbours` neighbours are returned per interactor
+    and `degree` still counts all of them.
+    """
+    id_field = ID_FIELDS[DatabaseType[db]]
+    others = "others[..$neighbours]" if capped else "others"
+    page = "SKIP $offset LIMIT $limit" if paginated else ""
+    return f"""{SEARCH_SUBQUERY}
+WITH interactor, collect(other) AS others
+ORDER BY interactor.{id_field}
+{page}
+RETURN interactor as interactor_a, {others} as interactor_b, size(others) as degree
 """
-            qs.append(query)
 
-        # join them with UNION separating them
-        final_query = "UNION\n".join(qs)
-        return final_query
 
-    graph = Graph("bolt://localhost:7687", auth=("neo4j", "database"), name="main")
+def iter_search(
+    db: str,
+    key: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    neighbours: Optional[int] = None,
+    snapshot: Optional[Snapshot] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[Record]:
+    """Stream the search results of one database, from its snapshot or as Neo4j returns them.
+
+    With a `timeout` (seconds), Neo4j ends the query once it has run that long.
+    """
+    if snapshot is not None:
+        yield from snapshot.search(key, offset, limit, neighbours)
+        return
+    graph = get_graph(db.lower())
+    query = search_query(db, paginated=limit is not None, capped=neighbours is not None)
+    yield from run_with_timeout(
+        graph,
+        query,
+        timeout,
+        key=key,
+        offset=offset,
+        limit=limit,
+        neighbours=neighbours,
+    )
+
+
+def search_databases(
+    dbs: List[str], interactor_name: str, neighbours: Optional[int] = None
+) -> FanOutResult:
+    """Search every database concurrently, each within the per-source timeout
+
+    The name is normalised the way search keys are at ingest (see
+    `bio_data_merge.processor.search_keys`) and looked up through the
+    `:SearchKey` index; it is only ever passed as a query parameter.
+    Databases with a current snapshot are searched in it instead of Neo4j.
+    Records are tagged with their database in `db`. Each database's query
+    is timed as `search_cypher` (or `search_snapshot`), the whole search as
+    `search`. Neo4j queries get the per-source timeout as their transaction
+    timeout, so a query given up on is stopped on the server too.
+    """
+    key = normalise_key(interactor_name)
+    dbs = sorted({db for db in dbs if db in DatabaseType.__members__})
+    if not key or not dbs:
+        return FanOutResult()
 
-    query = _create_query()
-    c = graph.run(query)  # Cypher statements
-    result = c.data()
+    metrics = registry()
+    snapshots = current_snapshots(dbs)
+    fan_out: FanOut = current_app.extensions["search_fan_out"]
 
-    return result
+    def query(db: str) -> List[dict]:
+        snapshot = snapshots[db]
+        timing = "search_cypher" if snapshot is None else "search_snapshot"
+        with metrics.time(timing, database=db):
+            records = iter_search(
+                db,
+                key,
+                neighbours=neighbours,
+                snapshot=snapshot,
+                timeout=fan_out.timeout,
+            )
+            return [dict(r) for r in records]
+
+    with metrics.time("search"):
+        check_indexes_online([db for db in dbs if snapshots[db] is None])
+        outcome = fan_out.run(dbs, query)
+    for db in outcome.failed:
+        metrics.count("search_source_failures", database=db)
+    return outcome
+
+
+def run_cypher_query(
+    dbs: List[str], interactor_name: str, neighbours: Optional[int] = None
+) -> List[dict]:
+    """Run a query using the neo4j backend, leaving out databases that failed"""
+    return search_databases(dbs, interactor_name, neighbours).records
 
 
 interactor_search_bp = Blueprint("interactor-search", __name__)
@@ -74,13 +181,33 @@ interactor_search_bp = Blueprint("interactor-search", __name__)
 @interactor_search_bp.route("/interactor/search", methods=["GET", "POST"])
 def page():
     if request.method == "POST":
-        global queryResult, interactor_name
         dbsToCheck = request.form.getlist("dbsToCheck[]")
         interactor_name = request.form.get("interactorName")
-        if dbsToCheck is not None and interactor_name is not None:
-            # run cypher query and set data in session dict
-            queryResult = run_cypher_query(dbsToCheck, interactor_name)
-        return redirect("/interactor/search/results")
+        if not dbsToCheck or interactor_name is None:
+            return redirect("/")
+        cache = result_cache()
+        key = cache.make_key(
+            dbsToCheck,
+            normalise_key(interactor_name),
+            read_data_version(Path(current_app.config["DATA_VERSION_PATH"])),
+        )
+        entry = cache.lookup(key)
+        registry().count(
+            "search_cache_lookups", result="miss" if entry is None else "hit"
+        )
+        if entry is None or entry.extras.get("failed"):  # retry partial results
+            # run cypher query and keep the result for the results pages;
+            # neighbours past the graph's node limit would never be shown
+            outcome = search_databases(
+                dbsToCheck,
+                interactor_name,
+                neighbours=current_app.config["GRAPH_MAX_NODES"],
+            )
+            for db, reason in outcome.failed.items():
+                current_app.logger.warning("search in %s failed: %s", db, reason)
+            entry = cache.put(key, interactor_name, outcome.records)
+            entry.extras["failed"] = outcome.failed
+        return redirect(f"/interactor/search/results?id={entry.cache_id}")
     else:
         return
 
@@ -90,15 +217,107 @@ interactor_search_results_bp = Blueprint("interactor-search-results", __name__)
 
 @interactor_search_results_bp.route("/interactor/search/results")
 def page():
-    
+    entry = result_cache().get(request.args.get("id", ""))
+    if entry is None:  # expired or evicted: search again
+        return redirect("/")
     return render_template(
         "interactor/search/results.html",
-        queryResult=queryResult,
-        resultLength=len(queryResult),
-        query_name=interactor_name
+        queryResult=entry.result,
+        resultLength=len(entry.result),
+        query_name=entry.interactor_name,
+        cache_id=entry.cache_id,
+        failed=entry.extras.get("failed", {}),
     )
 
 
+interactor_search_api_bp = Blueprint("interactor-search-api", __name__)
+
+
+def _parse_cursor(cursor: str, dbs: List[str]) -> Tuple[int, int]:
+    """Position (database index, offset) encoded in a `<db>:<offset>` cursor."""
+    if not cursor:
+        return 0, 0
+    db, _, offset = cursor.partition(":")
+    if db not in dbs or not offset.isdigit():
+        abort(400, "invalid cursor")
+    return dbs.index(db), int(offset)
+
+
+def iter_results_page(
+    dbs: List[str],
+    key: str,
+    start: int,
+    offset: int,
+    limit: int,
+    neighbours: int,
+    snapshots: Optional[Dict[str, Optional[Snapshot]]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream one page of search results, then a final `{"next": cursor}` item.
+
+    The page starts at `offset` in `dbs[start]`. Databases are paged through
+    one after the other; `next` is None once every database is exhausted.
+    """
+    snapshots = snapshots or {}
+    remaining = limit
+    for db in dbs[start:]:
+        snapshot = snapshots.get(db)
+        for record in iter_search(db, key, offset, remaining, neighbours, snapshot):
+            yield {
+                "db": db,
+                "interactor": dict(record["interactor_a"]),
+                "neighbours": [dict(node) for node in record["interactor_b"]],
+                "degree": record["degree"],
+            }
+            offset += 1
+            remaining -= 1
+        if remaining == 0:
+            yield {"next": f"{db}:{offset}"}
+            return
+        offset = 0
+    yield {"next": None}
+
+
+@interactor_search_api_bp.route("/interactor/search/api")
+def page():
+    """Paginated search results as NDJSON (one result per line) or JSON.
+
+    Query parameters: `db` (repeatable), `name`, `cursor` (from the previous
+    page's `next`), `limit`, `neighbours` (per interactor) and `format`.
+    Rows are streamed to the client as Neo4j returns them.
+    """
+    dbs = sorted(
+        {db for db in request.args.getlist("db") if db in DatabaseType.__members__}
+    )
+    key = normalise_key(request.args.get("name", ""))
+    if not dbs or not key:
+        abort(400, "a db and a name are required")
+    limit = min(request.args.get("limit", DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE)
+    neighbours = min(
+        request.args.get("neighbours", DEFAULT_NEIGHBOURS, type=int), MAX_NEIGHBOURS
+    )
+    if limit < 1 or neighbours < 0:
+        abort(400, "limit must be positive and neighbours non-negative")
+    snapshots = current_snapshots(dbs)
+    check_indexes_online([db for db in dbs if snapshots[db] is None])
+    start, offset = _parse_cursor(request.args.get("cursor", ""), dbs)
+    items = iter_results_page(dbs, key, start, offset, limit, neighbours, snapshots)
+
+    if request.args.get("format") == "ndjson":
+        lines = (dumps(item) + "\n" for item in items)
+        return Response(stream_with_context(lines), mimetype="application/x-ndjson")
+
+    def _json() -> Iterator[str]:
+        """Stream `{"results": [...], "next": ...}` without building it in memory."""
+        yield '{"results": ['
+        for i, item in enumerate(items):
+            if "next" in item:
+                yield f'], "next": {dumps(item["next"])}}}'
+            else:
+                yield ("," if i else "") + dumps(item)
+
+    return Response(stream_with_context(_json()), mimetype="application/json")
+
+
 interactor_search_results_graph_bp = Blueprint(
     "interactor-search-results-graph", __name__
 )
@@ -106,69 +325,19 @@ interactor_search_results_graph_bp = Blueprint(
 
 @interactor_search_results_graph_bp.route("/interactor/search/results/graph")
 def page():
-    nodes = []
-    rels = []
-    i = 0
-    record: Dict[str, Node] 
-    attr_to_check: str
-    db: DatabaseType
-    for record in queryResult:
-        node = record["interactor_a"]
-        if node.get("Aliases"):
-            attr_to_check = "Aliases"
-            db = DatabaseType.IntAct
-        elif node.get("Official_Symbol"):
-            attr_to_check = "Official_Symbol"
-            db = DatabaseType.BioGRID
-        _title = str(node.get(attr_to_check))
-        node_dict =  {
-            "title": _title, 
-            "label": "interactor_a",
-            "db": db.name,
-            **node
-        }
-        if db == DatabaseType.IntAct:
-            species_names = re.findall(r'^.+\|taxid:[0-9]+\(([A-Za-z0-9\-\s\)\("]+)\)$', node.get("Taxid"))
-            res = re.findall(r'(?i)([A-Za-z0-9\-\_\s\)\(" ]+)\(display_short\)', _title)
-            if not res:
-                res = re.findall(r'(?i)([A-Za-z0-9\-\_\s\)\(" ]+)\(display_long\)', _title)
-            node_dict["title"] = " | ".join(res)
-            if species_names:
-                species = species_names[-1] # IntAct ususally uses the last one with the biological name
-                species = species.strip('\"')
-                node_dict["species"] = species
-
-        nodes.append(node_dict)
-        target = i
-        i += 1
-        name: Node
-        for name in record["interactor_b"]:
-            _title = str(name.get(attr_to_check))
-            actor = {
-                "title": _title, 
-                "label": "interactor_b",
-                "db": db.name,
-                **name
-            }
-            if db == DatabaseType.IntAct:
-                species_names = re.findall(r'^.+\|taxid:[0-9]+\(([A-Za-z0-9\-\s\)\("]+)\)$', name.get("Taxid"))
-                res = re.findall(r'(?i)([A-Za-z0-9\-\_\s\)\(" ]+)\(display_short\)', _title)
-                if not res:
-                    res = re.findall(r'(?i)([A-Za-z0-9\-\_\s\)\(" ]+)\(display_long\)', _title)
-                actor["title"] = " | ".join(res)
-                if species_names:
-                    species = species_names[-1] # IntAct ususally uses the last one with the biological name
-                    species = species.strip('\"')
-                    actor["species"] = species
-
-            try:
-                source = nodes.index(actor)
-            except ValueError:
-                nodes.append(actor)
-                source = i
-                i += 1
-            rels.append({"source": source, "target": target})
-
-    res = dumps({"nodes": nodes, "links": rels})
+    entry = result_cache().get(request.args.get("id", ""))
+    if entry is None:
+        return Response(
+            dumps({"error": "unknown or expired search"}),
+            status=404,
+            mimetype="application/json",
+        )
+    if "graph" in entry.extras:  # already built for this search
+        return Response(entry.extras["graph"], mimetype="application/json")
+    with registry().time("search_graph_build"):
+        res = dumps(
+            build_graph(entry.result, max_nodes=current_app.config["GRAPH_MAX_NODES"])
+        )
+    result_cache().set_extra(entry, "graph", res, len(res))
 
     return Response(res, mimetype="application/json")
@@ -0,0 +1,30 @@
+"""Metrics endpoint Module"""
+from flask import Blueprint, Response, current_app
+
+from bio_data_merge.connection import connections
+from bio_data_merge.metrics import PROMETHEUS_CONTENT_TYPE, peak_rss_bytes, registry
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+def update_gauges() -> None:
+    """Set the gauges read at scrape time: connection pools, result cache and memory."""
+    metrics = registry()
+    for pool in connections().metrics()["pools"]:
+        for name in ("size", "in_use", "max_size"):
+            metrics.set_gauge(f"neo4j_pool_{name}", pool[name], address=pool["address"])
+    cache = current_app.extensions["result_cache"]
+    metrics.set_gauge("result_cache_entries", len(cache))
+    metrics.set_gauge("result_cache_bytes", cache.size)
+    metrics.set_gauge("result_cache_hits", cache.hits)
+    metrics.set_gauge("result_cache_misses", cache.misses)
+    metrics.set_gauge("peak_rss_bytes", peak_rss_bytes())
+
+
+@metrics_bp.route("/metrics")
+def page():
+    """Search and ingest metrics of this process, in the Prometheus text format."""
+    update_gauges()
+    return Response(
+        registry().render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE
+    )
@@ -0,0 +1,94 @@
+"""Concurrent per-database search Module"""
+import time
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError,
+    as_completed,
+)
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List
+
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 10.0  # seconds, per source
+
+Record = Dict[str, Any]
+
+
+@dataclass
+class FanOutResult:
+    """Records of every source that answered in time, and why the others did not."""
+
+    records: List[Record] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)  # source -> reason
+    elapsed: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        """True when every source answered."""
+        return not self.failed
+
+
+class FanOut:
+    """Query several databases at once on a shared thread pool.
+
+    Each source gets `timeout` seconds, all starting together, so a search
+    takes as long as its slowest source rather than the sum of all of them.
+    Records are tagged with their source (`db`) and merged in the order the
+    sources finish; a source that fails or times out is reported in
+    `FanOutResult.failed` while the others' records are still returned.
+    A timed-out query keeps its worker until it returns, so queries should
+    be bounded by `timeout` themselves (Neo4j searches run with it as their
+    transaction timeout).
+    """
+
+    def __init__(
+        self, max_workers: int = DEFAULT_WORKERS, timeout: float = DEFAULT_TIMEOUT
+    ):
+        """Initialize the fan-out and its thread pool."""
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="search"
+        )
+
+    def run(
+        self, sources: List[str], query: Callable[[str], Iterable[Record]]
+    ) -> FanOutResult:
+        """Run `query(source)` for every source concurrently and merge the records."""
+        started = time.monotonic()
+        result = FanOutResult()
+        futures = {
+            self._executor.submit(lambda s: list(query(s)), source): source
+            for source in sources
+        }
+        pending = set(futures)
+        try:
+            for future in as_completed(futures, timeout=self.timeout):
+                pending.discard(future)
+                self._collect(result, futures[future], future)
+        except TimeoutError:
+            for future in pending:
+                if future.done():  # finished while the timeout was being raised
+                    self._collect(result, futures[future], future)
+                else:
+                    future.cancel()  # running queries end at their own timeout
+                    reason = f"timed out after {self.timeout:g}s"
+                    result.failed[futures[future]] = reason
+        result.elapsed = time.monotonic() - started
+        return result
+
+    @staticmethod
+    def _collect(result: FanOutResult, source: str, future: Future) -> None:
+        """Add the records of a finished source, or the reason it failed."""
+        try:
+            records = future.result()
+        except Exception as exc:
+            result.failed[source] = f"{type(exc).__name__}: {exc}"
+            return
+        for record in records:
+            record["db"] = source
+        result.records += records
+
+    def shutdown(self) -> None:
+        """Stop the thread pool without waiting for running queries."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,108 @@
+"""Search result graph Module"""
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from bio_data_merge.model.database.database import ID_FIELDS
+from bio_data_merge.processor.identity import CANONICAL_ID_FIELD
+from bio_data_merge.processor.display_fields import (
+    DISPLAY_TITLE_FIELD,
+    SPECIES_FIELD,
+    node_display_fields,
+)
+
+DEFAULT_MAX_NODES = 2000
+
+NodeKey = Tuple[str, str]  # (database name, source ID)
+
+
+def node_key(node: Mapping[str, Any]) -> Optional[NodeKey]:
+    """Identity of an interactor: its database and the ID it was merged on."""
+    for db, id_field in ID_FIELDS.items():
+        value = node.get(id_field)
+        if value is not None:
+            return db.name, str(value)
+    return None
+
+
+class GraphBuilder:
+    """Build the d3 node/link payload of a search result in a single pass.
+
+    Nodes are deduplicated on their (database, ID) identity with a dict, so
+    building is linear in the size of the result. Past `max_nodes` distinct
+    nodes no more are added, links to dropped nodes are left out, and the
+    payload says so in its `truncated` metadata. Interactors of different
+    databases with the same `Canonical_ID` are joined by a `SAME_AS` link.
+    """
+
+    def __init__(self, max_nodes: int = DEFAULT_MAX_NODES):
+        """Initialize the builder."""
+        self.max_nodes = max_nodes
+        self.nodes: List[Dict[str, Any]] = []
+        self.links: List[Dict[str, Any]] = []
+        self._index: Dict[NodeKey, int] = {}
+        self._canonical: Dict[str, int] = {}  # canonical ID -> first node with it
+        self._dropped: Set[NodeKey] = set()
+        self._dropped_links = 0
+
+    def _add(self, node: Mapping[str, Any], label: str) -> Optional[int]:
+        """Return the position of a node in the payload, adding it if new; None if dropped."""
+        key = node_key(node)
+        if key is None:
+            key = ("", str(id(node)))
+        position = self._index.get(key)
+        if position is not None:
+            return position
+        if len(self.nodes) >= self.max_nodes:
+            self._dropped.add(key)
+            return None
+
+        if DISPLAY_TITLE_FIELD in node:
+            title, species = node[DISPLAY_TITLE_FIELD], node.get(SPECIES_FIELD, "")
+        else:  # loaded before display fields were precomputed
+            fields = node_display_fields(node)
+            title, species = fields[DISPLAY_TITLE_FIELD], fields[SPECIES_FIELD]
+        entry = {"title": title, "label": label, "db": key[0], **node}
+        if species:
+            entry["species"] = species
+
+        position = self._index[key] = len(self.nodes)
+        self.nodes.append(entry)
+
+        canonical = node.get(CANONICAL_ID_FIELD)
+        if canonical:
+            same = self._canonical.setdefault(canonical, position)
+            if same != position and self.nodes[same]["db"] != key[0]:
+                self.links.append(
+                    {"source": position, "target": same, "type": "SAME_AS"}
+                )
+        return position
+
+    def add_record(self, record: Mapping[str, Any]) -> None:
+        """Add an interactor and the neighbours it was returned with."""
+        target = self._add(record["interactor_a"], "interactor_a")
+        for other in record["interactor_b"]:
+            source = self._add(other, "interactor_b")
+            if source is None or target is None:
+                self._dropped_links += 1
+                continue
+            self.links.append({"source": source, "target": target})
+
+    def payload(self) -> Dict[str, Any]:
+        """The graph, with truncation metadata."""
+        return {
+            "nodes": self.nodes,
+            "links": self.links,
+            "truncated": bool(self._dropped),
+            "max_nodes": self.max_nodes,
+            "total_nodes": len(self.nodes) + len(self._dropped),
+            "total_links": len(self.links) + self._dropped_links,
+        }
+
+
+def build_graph(
+    result: List[Mapping[str, Any]], max_nodes: int = DEFAULT_MAX_NODES
+) -> Dict[str, Any]:
+    """Build the graph payload of a search result."""
+    builder = GraphBuilder(max_nodes)
+    for record in result:
+        builder.add_record(record)
+    return builder.payload()
@@ -0,0 +1,163 @@
+"""Search result cache Module"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# (sorted dbs, normalised name, data version)
+CacheKey = Tuple[Tuple[str, ...], str, str]
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 2**20
+DEFAULT_TTL = 600  # seconds
+
+
+def estimate_size(result: List[Dict[str, Any]]) -> int:
+    """Rough size in bytes of a search result (records of interactor nodes)."""
+    size = 0
+    for record in result:
+        for node in [record["interactor_a"], *record["interactor_b"]]:
+            size += 200 + sum(len(str(k)) + len(str(v)) for k, v in node.items())
+    return size
+
+
+@dataclass
+class CachedResult:
+    """A search result and what it was searched for."""
+
+    cache_id: str
+    key: CacheKey
+    interactor_name: str  # as typed by the user
+    result: List[Dict[str, Any]]
+    size: int  # of the result and its extras
+    created: float = field(default_factory=time.monotonic)
+    # views derived from the result, e.g. the graph, see `ResultCache.set_extra`
+    extras: Dict[str, Any] = field(default_factory=dict)
+    extra_sizes: Dict[str, int] = field(default_factory=dict)
+
+
+class ResultCache:
+    """Thread-safe LRU cache of search results, bounded in entries, bytes and age.
+
+    Entries are keyed by the searched databases, the normalised name and the
+    data version, and can be looked up again by their `cache_id`. All entries
+    are dropped as soon as a different data version is seen. Only searches
+    (`lookup`) count as hits or misses.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_TTL,
+    ):
+        """Initialize the cache."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedResult]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(dbs: List[str], name: str, version: str) -> CacheKey:
+        """Cache key of a search."""
+        return tuple(sorted(set(dbs))), name, version
+
+    @staticmethod
+    def cache_id(key: CacheKey) -> str:
+        """Stable ID of a cache key, safe to put in a URL."""
+        return hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, cache_id: str) -> Optional[CachedResult]:
+        """Return a live entry, marking it as recently used."""
+        with self._lock:
+            entry = self._entries.get(cache_id)
+            if entry is None or self._expired(entry):
+                if entry is not None:
+                    self._remove(cache_id)
+                return None
+            self._entries.move_to_end(cache_id)
+            return entry
+
+    def lookup(self, key: CacheKey) -> Optional[CachedResult]:
+        """Return the live entry for a search, if there is one."""
+        self._check_version(key[2])
+        entry = self.get(self.cache_id(key))
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def put(
+        self, key: CacheKey, interactor_name: str, result: List[Dict[str, Any]]
+    ) -> CachedResult:
+        """Store a search result, evicting old entries past the bounds."""
+        self._check_version(key[2])
+        entry = CachedResult(
+            self.cache_id(key), key, interactor_name, result, estimate_size(result)
+        )
+        with self._lock:
+            if entry.cache_id in self._entries:
+                self._remove(entry.cache_id)
+            self._entries[entry.cache_id] = entry
+            self.size += entry.size
+            self._evict(keep=entry.cache_id)
+        return entry
+
+    def set_extra(self, entry: CachedResult, name: str, value: Any, size: int) -> None:
+        """Attach a view of `size` bytes to an entry, evicting others past the bounds."""
+        with self._lock:
+            added = size - entry.extra_sizes.get(name, 0)
+            entry.extras[name] = value
+            entry.extra_sizes[name] = size
+            entry.size += added
+            if self._entries.get(entry.cache_id) is entry:  # still cached
+                self.size += added
+                self._evict(keep=entry.cache_id)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _check_version(self, version: str) -> None:
+        """Drop every entry when the data version changed since the last call."""
+        with self._lock:
+            changed = self._version is not None and version != self._version
+            self._version = version
+        if changed:
+            self.clear()
+
+    def _expired(self, entry: CachedResult) -> bool:
+        return time.monotonic() - entry.created > self.ttl
+
+    def _remove(self, cache_id: str) -> None:
+        self.size -= self._entries.pop(cache_id).size
+
+    def _evict(self, keep: str) -> None:
+        """Drop expired entries, then least recently used ones until within bounds.
+
+        The entry just stored is kept even if it alone exceeds `max_bytes`.
+        """
+        for cache_id in [c for c, e in self._entries.items() if self._expired(e)]:
+            self._remove(cache_id)
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self.size > self.max_bytes
+        ):
+            cache_id = next(iter(self._entries))
+            if cache_id == keep:
+                self._entries.move_to_end(keep)
+                continue
+            self._remove(cache_id)
@@ -0,0 +1,42 @@
+"""Graph snapshot store Module"""
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from bio_data_merge.data_version import read_data_version
+from bio_data_merge.processor.snapshot import META_FILENAME, Snapshot
+
+
+class SnapshotStore:
+    """The snapshots of the per-source databases in a directory, mapped on first use.
+
+    A snapshot is only handed out while it is current, i.e. while its
+    database's data version is the one it was exported at; searches of
+    databases without a current snapshot go to Neo4j. A snapshot exported
+    again is picked up on the next lookup.
+    """
+
+    def __init__(self, directory: Optional[Path], version_path: Path):
+        """Initialize the store; without a directory, every search goes to Neo4j."""
+        self.directory = Path(directory) if directory is not None else None
+        self.version_path = Path(version_path)
+        self._snapshots: Dict[str, Tuple[int, Snapshot]] = {}  # by meta mtime
+        self._lock = threading.Lock()
+
+    def get(self, db: str) -> Optional[Snapshot]:
+        """The current snapshot of a database, or None."""
+        if self.directory is None:
+            return None
+        path = self.directory / db.lower()
+        try:
+            mtime = (path / META_FILENAME).stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            cached = self._snapshots.get(db)
+            if cached is None or cached[0] != mtime:
+                cached = self._snapshots[db] = (mtime, Snapshot(path))
+        snapshot = cached[1]
+        if snapshot.version != read_data_version(self.version_path, db):
+            return None
+        return snapshot
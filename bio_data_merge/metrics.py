@@ -0,0 +1,211 @@
+"""Instrumentation Module"""
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# seconds; from a quick index seek to a full-source load step
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+PROMETHEUS_PREFIX = "bio_data_merge_"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    """Hashable, ordered label set."""
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    """A sample value, without losing precision on large counts."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    """`{key="value",...}`, or nothing without labels."""
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+@dataclass
+class Timing:
+    """Durations observed under one name and label set, bucketed like a Prometheus histogram."""
+
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    bucket_counts: List[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def __post_init__(self):
+        self.bucket_counts = self.bucket_counts or [0] * len(self.buckets)
+
+    def observe(self, seconds: float) -> None:
+        """Add a duration."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+
+class MetricsRegistry:
+    """Counters, gauges and timings of the process, by name and labels.
+
+    Recording takes a lock, so instrument per chunk, batch or query rather
+    than per row. Counters are exposed as `<name>_total` and timings as
+    `<name>_seconds` histograms.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._timings: Dict[str, Dict[Labels, Timing]] = {}
+
+    def count(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Increase a counter."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to its current value."""
+        with self._lock:
+            self._gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        """Record a duration."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._timings.setdefault(name, {})
+            timing = series.get(key)
+            if timing is None:
+                timing = series[key] = Timing()
+            timing.observe(seconds)
+
+    @contextmanager
+    def time(self, name: str, **labels: Any) -> Iterator[None]:
+        """Record how long the block takes, also when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def timed_iter(self, items: Iterable, name: str, **labels: Any) -> Iterator:
+        """Yield the items, recording how long each one took to arrive."""
+        iterator = iter(items)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.observe(name, time.perf_counter() - started, **labels)
+            yield item
+
+    def reset(self) -> None:
+        """Drop everything recorded so far."""
+        with self._lock:
+            self.started = time.time()
+            self._counters = {}
+            self._gauges = {}
+            self._timings = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Everything recorded, as JSON-serialisable data."""
+
+        def series(values: Dict[str, Dict[Labels, Any]], value) -> Dict[str, List]:
+            return {
+                name: [
+                    {"labels": dict(key), **value(v)} for key, v in by_labels.items()
+                ]
+                for name, by_labels in sorted(values.items())
+            }
+
+        with self._lock:
+            return {
+                "counters": series(self._counters, lambda v: {"value": v}),
+                "gauges": series(self._gauges, lambda v: {"value": v}),
+                "timings": series(
+                    self._timings,
+                    lambda t: {"count": t.count, "seconds": t.total, "max": t.max},
+                ),
+            }
+
+    def value(self, name: str, **labels: Any) -> float:
+        """Current value of a counter (0 when it was never increased)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0)
+
+    def seconds(self, name: str, **labels: Any) -> float:
+        """Total duration recorded under a timing."""
+        with self._lock:
+            timing = self._timings.get(name, {}).get(_labels(labels))
+            return timing.total if timing else 0.0
+
+    def render_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """Everything recorded, in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, by_labels in sorted(self._counters.items()):
+                metric = f"{prefix}{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in by_labels.items():
+                    lines.append(f"{metric}{_format_labels(key)} {_number(value)}")
+            for name, by_labels in sorted(self._gauges.items()):
+                metric = f"{prefix}{name}"
+                lines.append(f"# TYPE {metric} gauge")
+                for key, value in by_labels.items():
+                    lines.append(f"{metric}{_format_labels(key)} {_number(value)}")
+            for name, by_labels in sorted(self._timings.items()):
+                metric = f"{prefix}{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for key, timing in by_labels.items():
+                    cumulative = 0
+                    for bound, count in zip(timing.buckets, timing.bucket_counts):
+                        cumulative += count
+                        le = (("le", f"{bound:g}"),)
+                        lines.append(
+                            f"{metric}_bucket{_format_labels(key, le)} {cumulative}"
+                        )
+                    inf = (("le", "+Inf"),)
+                    lines.append(
+                        f"{metric}_bucket{_format_labels(key, inf)} {timing.count}"
+                    )
+                    lines.append(
+                        f"{metric}_sum{_format_labels(key)} {_number(timing.total)}"
+                    )
+                    lines.append(f"{metric}_count{_format_labels(key)} {timing.count}")
+        return "\n".join(lines) + "\n"
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of the process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # kB on Linux
+
+
+_registry = MetricsRegistry()
+
+
+def registry() -> MetricsRegistry:
+    """The process-wide metrics registry."""
+    return _registry
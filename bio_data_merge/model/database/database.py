@@ -8,3 +8,18 @@ class DatabaseType(IntEnum):
     BioGRID = 0
     IntAct = 1
     STRING = 2
+
+
+# interactor property each database's nodes are keyed (and merged) on
+ID_FIELDS = {
+    DatabaseType.BioGRID: "BioGRID_ID",
+    DatabaseType.IntAct: "IDs",
+    DatabaseType.STRING: "STRING_ID",
+}
+
+# interactor properties the frontend searches by name
+SEARCH_FIELDS = {
+    DatabaseType.BioGRID: ["Official_Symbol"],
+    DatabaseType.IntAct: ["Alt_IDs", "IDs", "Aliases"],
+    DatabaseType.STRING: ["Preferred_Name"],
+}
@@ -0,0 +1,168 @@
+"""Source file schemas Module"""
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from bio_data_merge.model.database.database import DatabaseType
+
+# how the releases mark a missing value; read as null, written back as is
+NULL_MARKER = "-"
+
+
+@dataclass(frozen=True)
+class SourceSchema:
+    """The columns of a tab-separated release that are loaded, and their types.
+
+    Every column is text; the ones whose few distinct values repeat over
+    most rows (systems, organisms, source databases, ...) are read as
+    categoricals. Columns not listed are not read, but as each loaded column
+    is stored as an interactor or interaction property, the schemas below
+    list every column of the current formats: only columns a future release
+    adds are left out until they are listed.
+    """
+
+    columns: Tuple[str, ...]
+    categories: FrozenSet[str] = frozenset()
+
+    def usecols(self, header: Sequence[str]) -> List[str]:
+        """The columns of a file's header that are loaded, in file order."""
+        wanted = set(self.columns)
+        return [column for column in header if column in wanted]
+
+    def dtypes(self, columns: Optional[Sequence[str]] = None) -> Dict[str, str]:
+        """The dtypes of (some of) the columns, for `pd.read_csv`."""
+        return {
+            column: "category" if column in self.categories else "object"
+            for column in (self.columns if columns is None else columns)
+        }
+
+
+BIOGRID_SCHEMA = SourceSchema(
+    columns=(
+        "#BioGRID Interaction ID",
+        "Entrez Gene Interactor A",
+        "Entrez Gene Interactor B",
+        "BioGRID ID Interactor A",
+        "BioGRID ID Interactor B",
+        "Systematic Name Interactor A",
+        "Systematic Name Interactor B",
+        "Official Symbol Interactor A",
+        "Official Symbol Interactor B",
+        "Synonyms Interactor A",
+        "Synonyms Interactor B",
+        "Experimental System",
+        "Experimental System Type",
+        "Author",
+        "Publication Source",
+        "Organism ID Interactor A",
+        "Organism ID Interactor B",
+        "Throughput",
+        "Score",
+        "Modification",
+        "Qualifications",
+        "Tags",
+        "Source Database",
+        "SWISS-PROT Accessions Interactor A",
+        "TREMBL Accessions Interactor A",
+        "REFSEQ Accessions Interactor A",
+        "SWISS-PROT Accessions Interactor B",
+        "TREMBL Accessions Interactor B",
+        "REFSEQ Accessions Interactor B",
+        "Ontology Term IDs",
+        "Ontology Term Names",
+        "Ontology Term Categories",
+        "Ontology Term Qualifier IDs",
+        "Ontology Term Qualifier Names",
+        "Ontology Term Types",
+        "Organism Name Interactor A",
+        "Organism Name Interactor B",
+    ),
+    categories=frozenset(
+        {
+            "Experimental System",
+            "Experimental System Type",
+            "Organism ID Interactor A",
+            "Organism ID Interactor B",
+            "Throughput",
+            "Modification",
+            "Tags",
+            "Source Database",
+            "Organism Name Interactor A",
+            "Organism Name Interactor B",
+        }
+    ),
+)
+
+INTACT_SCHEMA = SourceSchema(
+    columns=(
+        "#ID(s) interactor A",
+        "ID(s) interactor B",
+        "Alt. ID(s) interactor A",
+        "Alt. ID(s) interactor B",
+        "Alias(es) interactor A",
+        "Alias(es) interactor B",
+        "Interaction detection method(s)",
+        "Publication 1st author(s)",
+        "Publication Identifier(s)",
+        "Taxid interactor A",
+        "Taxid interactor B",
+        "Interaction type(s)",
+        "Source database(s)",
+        "Interaction identifier(s)",
+        "Confidence value(s)",
+        "Expansion method(s)",
+        "Biological role(s) interactor A",
+        "Biological role(s) interactor B",
+        "Experimental role(s) interactor A",
+        "Experimental role(s) interactor B",
+        "Type(s) interactor A",
+        "Type(s) interactor B",
+        "Xref(s) interactor A",
+        "Xref(s) interactor B",
+        "Interaction Xref(s)",
+        "Annotation(s) interactor A",
+        "Annotation(s) interactor B",
+        "Interaction annotation(s)",
+        "Host organism(s)",
+        "Interaction parameter(s)",
+        "Creation date",
+        "Update date",
+        "Checksum(s) interactor A",
+        "Checksum(s) interactor B",
+        "Interaction Checksum(s)",
+        "Negative",
+        "Feature(s) interactor A",
+        "Feature(s) interactor B",
+        "Stoichiometry(s) interactor A",
+        "Stoichiometry(s) interactor B",
+        "Identification method participant A",
+        "Identification method participant B",
+    ),
+    categories=frozenset(
+        {
+            "Interaction detection method(s)",
+            "Taxid interactor A",
+            "Taxid interactor B",
+            "Interaction type(s)",
+            "Source database(s)",
+            "Expansion method(s)",
+            "Biological role(s) interactor A",
+            "Biological role(s) interactor B",
+            "Experimental role(s) interactor A",
+            "Experimental role(s) interactor B",
+            "Type(s) interactor A",
+            "Type(s) interactor B",
+            "Host organism(s)",
+            "Creation date",
+            "Update date",
+            "Negative",
+            "Identification method participant A",
+            "Identification method participant B",
+        }
+    ),
+)
+
+# STRING is read from its SQL dumps, see `processor.string_loader`
+SOURCE_SCHEMAS = {
+    DatabaseType.BioGRID: BIOGRID_SCHEMA,
+    DatabaseType.IntAct: INTACT_SCHEMA,
+}
@@ -0,0 +1,28 @@
+"""Optional dependencies Module"""
+from importlib.util import find_spec
+from types import ModuleType
+
+# extra installing the optional dependencies
+EXTRA = "cache"
+
+
+def has_pyarrow() -> bool:
+    """True when pyarrow is installed, without importing it."""
+    return find_spec("pyarrow") is not None
+
+
+def require_pyarrow(feature: str) -> ModuleType:
+    """Import pyarrow, with its CSV and Parquet modules, for a feature that needs it.
+
+    The ImportError raised without it names the feature and the extra to
+    install.
+    """
+    try:
+        import pyarrow
+        import pyarrow.csv
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError(
+            f"{feature} needs pyarrow; install it with `poetry install -E {EXTRA}`"
+        ) from exc
+    return pyarrow
@@ -0,0 +1,328 @@
+"""Cross-database interactor overlap Module"""
+import argparse
+import json
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+import pandas as pd
+from py2neo import Graph
+from tqdm import tqdm
+
+from bio_data_merge.connection import get_graph
+from bio_data_merge.data_version import DEFAULT_DATA_VERSION_PATH, read_data_version
+from bio_data_merge.model.database.database import DatabaseType
+from bio_data_merge.optional import has_pyarrow, require_pyarrow
+from bio_data_merge.processor.settings import ParserSettings
+
+DEFAULT_OVERLAP_DIR = ".bio_data_merge/overlap"
+DEFAULT_BATCH_SIZE = 50_000
+DEFAULT_DATABASES = [DatabaseType.IntAct, DatabaseType.BioGRID]
+FORMATS = ("parquet", "csv")
+STATE_FILENAME = "state.json"
+
+# interactor property holding each database's names, and the one holding synonyms
+NAME_FIELDS = {
+    DatabaseType.BioGRID: "Official_Symbol",
+    DatabaseType.IntAct: "Aliases",
+    DatabaseType.STRING: "Preferred_Name",
+}
+SYNONYM_FIELDS = {
+    DatabaseType.BioGRID: "Synonyms",
+    DatabaseType.IntAct: "Aliases",
+}
+
+# IntAct aliases are PSI-MI TAB lists,
+# e.g. `psi-mi:p53_human(display_long)|uniprotkb:TP53(gene name)|...`
+_DISPLAY_SHORT_RE = re.compile(r"(?:^|\|)[^|:]+:([^|]+?)\(display_short\)")
+_ALIAS_RE = re.compile(r"(?:^|\|)[^|:]+:([^|]+?)\([^|()]*\)")
+_MISSING = {"", "-", "nan", "None"}
+
+
+def extract_names(
+    interactors: pd.DataFrame,
+    database: DatabaseType,
+    synonyms: bool = False,
+    ignore_case: bool = False,
+) -> pd.Series:
+    """Names a batch of interactors go by, one per row (an interactor may have several).
+
+    IntAct interactors are named by the display_short entries of their
+    aliases, the others by their symbol; with `synonyms`, every IntAct alias
+    and every BioGRID synonym counts as a name too.
+    """
+    parts = []
+    name_field = NAME_FIELDS[database]
+    if database == DatabaseType.IntAct:
+        pattern = _ALIAS_RE if synonyms else _DISPLAY_SHORT_RE
+        aliases = interactors[name_field].dropna().astype(str)
+        parts.append(aliases.str.extractall(pattern)[0])
+    else:
+        parts.append(interactors[name_field].dropna().astype(str))
+        synonym_field = SYNONYM_FIELDS.get(database)
+        if synonyms and synonym_field in interactors:
+            values = interactors[synonym_field].dropna().astype(str)
+            parts.append(values.str.split("|").explode())
+
+    names = pd.concat(parts, ignore_index=True).str.strip().str.strip('"').str.strip()
+    names = names[~names.isin(_MISSING)]
+    return names.str.lower() if ignore_case else names
+
+
+def iter_name_batches(
+    graph: Graph,
+    database: DatabaseType,
+    synonyms: bool = False,
+    ignore_case: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[pd.Series]:
+    """Stream the names of a database's interactors, `batch_size` interactors at a time."""
+    fields = [NAME_FIELDS[database]]
+    synonym_field = SYNONYM_FIELDS.get(database)
+    if synonyms and synonym_field not in (None, *fields):
+        fields.append(synonym_field)
+    returns = ", ".join(f"n.{f} AS {f}" for f in fields)
+    cursor = graph.run(f"MATCH (n:Interactor) RETURN {returns}")
+    while True:
+        rows = [tuple(record) for record in islice(cursor, batch_size)]
+        if not rows:
+            return
+        frame = pd.DataFrame(rows, columns=fields, dtype=object)
+        yield extract_names(frame, database, synonyms, ignore_case)
+
+
+@dataclass
+class OverlapResult:
+    """Names shared by the databases, and how many distinct names each has."""
+
+    overlap: pd.DataFrame  # `name`, a membership column per database, `sources`
+    name_counts: Dict[str, int] = field(default_factory=dict)
+    recomputed: List[str] = field(default_factory=list)  # databases re-read from Neo4j
+
+
+def join_names(names: Dict[str, Set[str]], min_sources: int = 2) -> pd.DataFrame:
+    """Hashed join of the name sets: every name found in at least `min_sources` of them."""
+    counts = Counter(name for values in names.values() for name in values)
+    shared = sorted(name for name, count in counts.items() if count >= min_sources)
+    overlap = pd.DataFrame({"name": pd.Series(shared, dtype=object)})
+    for database, values in names.items():
+        overlap[database] = overlap["name"].isin(values)
+    overlap["sources"] = overlap["name"].map(counts).astype("int64")
+    return overlap
+
+
+def default_format() -> str:
+    """Parquet when pyarrow is installed (the `cache` extra), CSV otherwise."""
+    return "parquet" if has_pyarrow() else "csv"
+
+
+class OverlapStore:
+    """Name sets and overlap tables written to a directory, with what they were computed from.
+
+    `state.json` records, for every database, the data version and options
+    its names were extracted with, so that after a data refresh only the
+    databases that were reloaded are read from Neo4j again.
+    """
+
+    def __init__(self, directory: Path, fmt: Optional[str] = None):
+        """Initialize the store; see `default_format` when no format is given."""
+        fmt = fmt or default_format()
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown format {fmt!r}, expected one of {FORMATS}")
+        if fmt == "parquet":
+            require_pyarrow("the parquet overlap format")
+        self.directory = Path(directory)
+        self.fmt = fmt
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def state_path(self) -> Path:
+        """Path of the JSON file describing the stored name sets."""
+        return self.directory / STATE_FILENAME
+
+    def load_state(self) -> Dict[str, Dict[str, object]]:
+        """What each stored name set was computed from."""
+        if not self.state_path.exists():
+            return {}
+        return json.loads(self.state_path.read_text())
+
+    def save_state(self, state: Dict[str, Dict[str, object]]) -> None:
+        """Replace the state file."""
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2))
+        tmp.replace(self.state_path)
+
+    def path(self, name: str) -> Path:
+        """Path of a stored table."""
+        return self.directory / f"{name}.{self.fmt}"
+
+    def write(self, name: str, frame: pd.DataFrame) -> Path:
+        """Write a table, replacing it atomically."""
+        target = self.path(name)
+        tmp = target.with_name(f"{target.name}.tmp")
+        if self.fmt == "parquet":
+            frame.to_parquet(tmp, index=False)
+        else:
+            frame.to_csv(tmp, index=False)
+        tmp.replace(target)
+        return target
+
+    def read_names(self, database: str) -> Optional[Set[str]]:
+        """A stored name set, or None when there is none."""
+        path = self.path(f"names_{database.lower()}")
+        if not path.exists():
+            return None
+        if self.fmt == "parquet":
+            frame = pd.read_parquet(path)
+        else:  # names such as `NA` must stay strings
+            frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+        return set(frame["name"])
+
+    def write_names(self, database: str, names: Set[str]) -> Path:
+        """Store a name set."""
+        frame = pd.DataFrame({"name": pd.Series(sorted(names), dtype=object)})
+        return self.write(f"names_{database.lower()}", frame)
+
+
+def read_names(
+    database: DatabaseType,
+    synonyms: bool = False,
+    ignore_case: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: bool = False,
+) -> Set[str]:
+    """Distinct names of a database's interactors, streamed from Neo4j."""
+    names: Set[str] = set()
+    batches = iter_name_batches(
+        get_graph(database.name.lower()), database, synonyms, ignore_case, batch_size
+    )
+    for batch in tqdm(batches, desc=database.name, unit="batch", disable=not progress):
+        names.update(batch)
+    return names
+
+
+def compute_overlap(
+    databases: Sequence[DatabaseType] = DEFAULT_DATABASES,
+    out_dir: Optional[Path] = None,
+    fmt: Optional[str] = None,
+    synonyms: bool = False,
+    ignore_case: bool = False,
+    min_sources: int = 2,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    refresh: bool = False,
+    progress: bool = False,
+    version_path: Path = Path(DEFAULT_DATA_VERSION_PATH),
+) -> OverlapResult:
+    """Compute the names the databases' interactors have in common.
+
+    With an `out_dir`, every database's name set and the overlap are
+    written there, and name sets stored by an earlier run are reused for
+    the databases that were not reloaded since (unless `refresh`), as told
+    by the data versions the processor keeps in `version_path`.
+    """
+    store = OverlapStore(out_dir, fmt) if out_dir is not None else None
+    state = store.load_state() if store is not None else {}
+    names: Dict[str, Set[str]] = {}
+    recomputed = []
+    for database in databases:
+        stamp = {
+            "version": read_data_version(version_path, database.name),
+            "synonyms": synonyms,
+            "ignore_case": ignore_case,
+        }
+        stored = None
+        if store is not None and not refresh and state.get(database.name) == stamp:
+            stored = store.read_names(database.name)
+        if stored is None:
+            stored = read_names(database, synonyms, ignore_case, batch_size, progress)
+            recomputed.append(database.name)
+            if store is not None:
+                store.write_names(database.name, stored)
+                state[database.name] = stamp
+                store.save_state(state)
+        names[database.name] = stored
+
+    overlap = join_names(names, min_sources)
+    if store is not None:
+        store.write("overlap", overlap)
+    return OverlapResult(
+        overlap=overlap,
+        name_counts={database: len(values) for database, values in names.items()},
+        recomputed=recomputed,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Compute the overlap from the command line and print a summary."""
+    settings = ParserSettings.from_env()  # loads `.env` before the defaults are read
+    args = argparse.ArgumentParser(
+        prog="python -m bio_data_merge.overlap",
+        description="Find the interactor names the loaded databases have in common.",
+    )
+    args.add_argument(
+        "--db",
+        dest="databases",
+        action="append",
+        choices=[database.name for database in DatabaseType],
+        help="database to compare (repeatable; default: IntAct and BioGRID)",
+    )
+    args.add_argument(
+        "--out",
+        metavar="DIR",
+        type=Path,
+        default=Path(os.environ.get("OVERLAP_DIR", DEFAULT_OVERLAP_DIR)),
+        help="directory the name sets and the overlap are written to",
+    )
+    args.add_argument(
+        "--format",
+        choices=FORMATS,
+        default=default_format(),
+        help="format of the stored tables (default: parquet, or csv without pyarrow)",
+    )
+    args.add_argument(
+        "--ignore-case", action="store_true", help="compare names case-insensitively"
+    )
+    args.add_argument(
+        "--synonyms",
+        action="store_true",
+        help="also match on IntAct aliases and BioGRID synonyms",
+    )
+    args.add_argument(
+        "--min-sources",
+        type=int,
+        default=2,
+        help="keep names found in at least this many databases",
+    )
+    args.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args.add_argument(
+        "--refresh",
+        action="store_true",
+        help="read every database again, even when its stored names are current",
+    )
+    options = args.parse_args(argv)
+
+    databases = [DatabaseType[name] for name in options.databases or []]
+    result = compute_overlap(
+        databases=databases or DEFAULT_DATABASES,
+        out_dir=options.out,
+        fmt=options.format,
+        synonyms=options.synonyms,
+        ignore_case=options.ignore_case,
+        min_sources=options.min_sources,
+        batch_size=options.batch_size,
+        refresh=options.refresh,
+        progress=True,
+        version_path=settings.data_version_path,
+    )
+    for database, count in result.name_counts.items():
+        reused = "" if database in result.recomputed else " (stored)"
+        print(f"{database}: {count} names{reused}")
+    print(f"{len(result.overlap)} shared names, written to {options.out}")
+
+
+if __name__ == "__main__":
+    main()
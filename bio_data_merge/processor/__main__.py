@@ -1,5 +1,275 @@
 """Entry point for application."""
-from bio_data_merge.processor.parser import parser
+import argparse
+import sys
+from dataclasses import replace
+from pathlib import Path
+from typing import List, Optional
+
+from bio_data_merge.processor.settings import (
+    EDGE_MODES,
+    EDGE_PAIRS,
+    READ_ENGINES,
+    VALIDATION_MODES,
+    ParserSettings,
+)
+
+COMMANDS = ("ingest", "bootstrap", "overlap", "snapshot")
+
+
+def ingest(options: argparse.Namespace, argv: List[str]) -> None:
+    """Load the releases into Neo4j."""
+    from bio_data_merge.processor.cache import SourceCache
+    from bio_data_merge.processor.parser import Parser
+
+    parser = Parser(settings(options))
+    if options.source_cache is not None:
+        parser.cache = SourceCache(options.source_cache)
+    parser.start(
+        streaming=not options.no_streaming,
+        export_dir=options.export_import_csv,
+        incremental=options.incremental,
+    )
+
+
+def bootstrap(options: argparse.Namespace, argv: List[str]) -> None:
+    """Create the databases, constraints and indexes without loading anything."""
+    from bio_data_merge.processor.parser import Parser
+
+    parser = Parser(settings(options))
+    parser.init_databases()
+    parser.init_schema()
+
+
+def overlap(options: argparse.Namespace, argv: List[str]) -> None:
+    """Compute the cross-database overlap; see `bio_data_merge.overlap`."""
+    from bio_data_merge.overlap import main
+
+    main(argv)
+
+
+def snapshot(options: argparse.Namespace, argv: List[str]) -> None:
+    """Export the graph snapshots; see `bio_data_merge.processor.snapshot`."""
+    from bio_data_merge.processor.snapshot import main
+
+    main(argv)
+
+
+def settings(options: argparse.Namespace) -> ParserSettings:
+    """The environment's settings, overridden by the options given."""
+    overrides = {
+        name: getattr(options, name)
+        for name in (
+            "transform_workers",
+            "writer_workers",
+            "fulltext_indexes",
+            "report_path",
+            "validation",
+            "validation_sample_rate",
+            "snapshot_dir",
+            "read_engine",
+            "edges",
+            "edge_pairs",
+            "load_string",
+            "resolve_identities",
+        )
+        if getattr(options, name, None) is not None
+    }
+    result = replace(ParserSettings.from_env(), **overrides)
+    result.writer_workers = max(result.writer_workers, 1)
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """The command line of the processor.
+
+    Defaults come from the environment (see `ParserSettings.from_env`) and
+    are only read once a command runs, so `--help` imports nothing heavy.
+    """
+    args = argparse.ArgumentParser(
+        prog="python -m bio_data_merge.processor",
+        description=(
+            "Load the BioGRID, IntAct and STRING releases into Neo4j. "
+            "Without a command, runs `ingest`."
+        ),
+    )
+    commands = args.add_subparsers(dest="command", metavar="COMMAND")
+
+    ingest_args = commands.add_parser("ingest", help="load the releases into Neo4j")
+    ingest_args.set_defaults(handler=ingest)
+    ingest_args.add_argument(
+        "--export-import-csv",
+        metavar="DIR",
+        type=Path,
+        help=(
+            "write neo4j-admin import CSV files into DIR instead of "
+            "loading the data over Bolt"
+        ),
+    )
+    ingest_args.add_argument(
+        "--no-streaming",
+        action="store_true",
+        help="read every database fully before loading it",
+    )
+    ingest_args.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "only load rows that changed since the last load and resume "
+            "interrupted loads (state is kept in MANIFEST_PATH)"
+        ),
+    )
+    ingest_args.add_argument(
+        "--transform-workers",
+        type=int,
+        help=(
+            "processes transforming chunks in parallel (0 transforms in-thread; "
+            "default: TRANSFORM_WORKERS, or 0)"
+        ),
+    )
+    ingest_args.add_argument(
+        "--writer-workers",
+        type=int,
+        help=(
+            "concurrent writers per database when transforming in parallel "
+            "(default: WRITER_WORKERS, or 1)"
+        ),
+    )
+    ingest_args.add_argument(
+        "--source-cache",
+        metavar="DIR",
+        type=Path,
+        help=(
+            "read BioGRID/IntAct through a Parquet cache of the decoded files in "
+            "DIR (default: SOURCE_CACHE_DIR, if set)"
+        ),
+    )
+    ingest_args.add_argument(
+        "--report",
+        dest="report_path",
+        metavar="PATH",
+        type=Path,
+        help="where the JSON run report is written (default: RUN_REPORT_PATH)",
+    )
+    ingest_args.add_argument(
+        "--string",
+        dest="load_string",
+        action="store_true",
+        default=None,
+        help=(
+            "also load the STRING dumps in STRING_PATH, without the evidence "
+            "schema (default: LOAD_STRING, or off)"
+        ),
+    )
+    identities = ingest_args.add_mutually_exclusive_group()
+    identities.add_argument(
+        "--identities",
+        dest="resolve_identities",
+        action="store_true",
+        default=None,
+        help=(
+            "resolve canonical IDs across the databases, kept in "
+            "IDENTITY_INDEX_PATH (default: RESOLVE_IDENTITIES, or off)"
+        ),
+    )
+    identities.add_argument(
+        "--no-identities",
+        dest="resolve_identities",
+        action="store_false",
+        default=None,
+        help="do not resolve canonical IDs, even with RESOLVE_IDENTITIES set",
+    )
+    ingest_args.add_argument(
+        "--validate",
+        dest="validation",
+        choices=VALIDATION_MODES,
+        help=(
+            "check the records written against the interaction models: "
+            "none, a sample or all of them (default: VALIDATE_RECORDS, or off)"
+        ),
+    )
+    ingest_args.add_argument(
+        "--validate-sample-rate",
+        dest="validation_sample_rate",
+        type=float,
+        help="share of the records checked with --validate sample",
+    )
+    ingest_args.add_argument(
+        "--read-engine",
+        choices=READ_ENGINES,
+        help=(
+            "parser of the BioGRID/IntAct files; pyarrow needs the `cache` extra "
+            "(default: INGEST_READ_ENGINE, or c)"
+        ),
+    )
+    ingest_args.add_argument(
+        "--edges",
+        choices=EDGE_MODES,
+        help=(
+            "one relationship per source row (raw), one per interactor pair with "
+            "list-valued evidence (aggregated), or both, the rows as "
+            "INTERACTION_EVIDENCE (default: INGEST_EDGES, or raw)"
+        ),
+    )
+    ingest_args.add_argument(
+        "--edge-pairs",
+        choices=EDGE_PAIRS,
+        help=(
+            "whether A-B and B-A rows are aggregated together "
+            "(default: INGEST_EDGE_PAIRS, or unordered)"
+        ),
+    )
+    ingest_args.add_argument(
+        "--snapshot",
+        dest="snapshot_dir",
+        metavar="DIR",
+        type=Path,
+        help=(
+            "export the snapshots of the loaded databases into DIR after the "
+            "load (default: SNAPSHOT_DIR, if set)"
+        ),
+    )
+
+    bootstrap_args = commands.add_parser(
+        "bootstrap",
+        help="create the databases, constraints and indexes only",
+    )
+    bootstrap_args.set_defaults(handler=bootstrap)
+
+    for command in (ingest_args, bootstrap_args):
+        command.add_argument(
+            "--fulltext-indexes",
+            action="store_true",
+            default=None,
+            help="also create full-text indexes over the searched interactor fields",
+        )
+
+    overlap_args = commands.add_parser(
+        "overlap",
+        add_help=False,
+        help="compute the interactor names the databases share (see overlap --help)",
+    )
+    overlap_args.set_defaults(handler=overlap)  # its options are parsed by the overlap
+
+    snapshot_args = commands.add_parser(
+        "snapshot",
+        add_help=False,
+        help="export memory-mapped snapshots searched by the frontend",
+    )
+    snapshot_args.set_defaults(handler=snapshot)
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse the command line and run the command."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["ingest", *argv]  # options of the former, command-less CLI
+    args = build_parser()
+    options, rest = args.parse_known_args(argv)
+    if rest and options.handler not in (overlap, snapshot):
+        args.error(f"unrecognized arguments: {' '.join(rest)}")
+    options.handler(options, rest)
+
 
 if __name__ == "__main__":
-    parser.start()
+    main()
@@ -0,0 +1,68 @@
+"""Interaction evidence aggregation Module"""
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Tuple
+
+# how many source rows an aggregated relationship was built from
+EVIDENCE_COUNT_FIELD = "Evidence_Count"
+# relationship type of the per-row edges kept next to the aggregated ones
+EVIDENCE_TYPE = "INTERACTION_EVIDENCE"
+
+
+class EvidenceAggregator:
+    """Collapse relationships between the same two interactors into one per pair.
+
+    Each property of the aggregated relationship is the list of the values
+    of the rows it was built from, in row order, so the lists of the
+    different properties stay aligned (the n-th entries describe the n-th
+    piece of evidence); `Evidence_Count` is their number. Unless `ordered`,
+    A–B and B–A rows are the same pair, kept with the lower ID first.
+    """
+
+    def __init__(self, ordered: bool = False):
+        """Initialize the aggregator."""
+        self.ordered = ordered
+        # relationship (without properties yet) and evidence rows, by pair
+        self._pairs: Dict[Tuple[str, str], Tuple[Dict[str, Any], List[Dict]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def add(self, relationship: Dict[str, Any]) -> None:
+        """Add a relationship, with its interned IDs when it carries them."""
+        a, b = relationship["a"], relationship["b"]
+        swap = not self.ordered and b < a
+        pair = self._pairs.get((b, a) if swap else (a, b))
+        if pair is None:
+            head = {"a": b, "b": a} if swap else {"a": a, "b": b}
+            if "a_id" in relationship:
+                ids = (relationship["a_id"], relationship["b_id"])
+                head["a_id"], head["b_id"] = ids[::-1] if swap else ids
+            pair = self._pairs[(head["a"], head["b"])] = (head, [])
+        pair[1].append(relationship["properties"])
+
+    def update(self, relationships: Iterable[Dict[str, Any]]) -> None:
+        """Add every relationship."""
+        for relationship in relationships:
+            self.add(relationship)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Return the aggregated relationships, in first-seen order, and start over."""
+        pairs = []
+        for head, rows in self._pairs.values():
+            keys = list(rows[0])
+            values = itemgetter(*keys) if len(keys) > 1 else lambda row: (row[keys[0]],)
+            # transpose the rows into one list per property
+            properties: Dict[str, Any] = {EVIDENCE_COUNT_FIELD: len(rows)}
+            properties.update(zip(keys, map(list, zip(*map(values, rows)))))
+            pairs.append({**head, "properties": properties})
+        self._pairs = {}
+        return pairs
+
+
+def aggregate(
+    relationships: Iterable[Dict[str, Any]], ordered: bool = False
+) -> List[Dict[str, Any]]:
+    """One aggregated relationship per interactor pair (see `EvidenceAggregator`)."""
+    aggregator = EvidenceAggregator(ordered)
+    aggregator.update(relationships)
+    return aggregator.drain()
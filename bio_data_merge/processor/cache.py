@@ -0,0 +1,268 @@
+"""Decoded source file cache Module"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from bio_data_merge.optional import require_pyarrow
+from bio_data_merge.processor.manifest import file_sha256
+
+DEFAULT_CACHE_DIR = ".bio_data_merge/cache"
+DEFAULT_MAX_BYTES = 20 * 2**30
+INDEX_FILENAME = "index.json"
+
+
+class SourceCache:
+    """Parquet copies of decoded source files, keyed by path, size, mtime and content hash.
+
+    Every column is stored as text exactly as it appears in the source file.
+    Entries are evicted least-recently-used first once the cache grows past
+    `max_bytes`.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the cache."""
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> Path:
+        """Path of the JSON index describing the cached entries."""
+        return self.directory / INDEX_FILENAME
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if not self.index_path.exists():
+            return {}
+        return json.loads(self.index_path.read_text())
+
+    def _save_index(self, index: Dict[str, Dict[str, Any]]) -> None:
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, indent=2))
+        tmp.replace(self.index_path)
+
+    @staticmethod
+    def key(source: Path, sha256: Optional[str] = None) -> str:
+        """Cache key of a source file, from its path, size, mtime and content hash.
+
+        The hash catches a file replaced in place with the same size and mtime
+        (e.g. copied with preserved timestamps); pass it when already known.
+        """
+        stat = source.stat()
+        sha256 = sha256 or file_sha256(source)
+        ident = f"{source.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{sha256}"
+        return hashlib.sha256(ident.encode()).hexdigest()[:32]
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """All cached entries, by key."""
+        with self._lock:
+            return self._load_index()
+
+    def lookup(
+        self, source: Path, sha256: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return the entry for an unchanged source file, or None."""
+        key = self.key(source, sha256)
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(key)
+            if entry is None or not (self.directory / entry["file"]).exists():
+                return None
+            entry["last_used"] = time.time()
+            self._save_index(index)
+        return entry
+
+    def read(
+        self,
+        entry: Dict[str, Any],
+        columns: Optional[List[str]] = None,
+        chunksize: int = 10_000,
+    ) -> Iterator[pd.DataFrame]:
+        """Stream a cached file, memory-mapped, optionally only some columns."""
+        pa = require_pyarrow("the source cache")
+        parquet = pa.parquet.ParquetFile(
+            self.directory / entry["file"], memory_map=True
+        )
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+            # nulls come back as None; restore the NaN that read_csv produces
+            yield batch.to_pandas().fillna(np.nan)
+
+    def iter_chunks(
+        self,
+        source: Path,
+        columns: Optional[List[str]] = None,
+        chunksize: int = 10_000,
+    ) -> Iterator[pd.DataFrame]:
+        """Stream a source file from the cache, filling the cache on a miss."""
+        sha256 = file_sha256(source)
+        entry = self.lookup(source, sha256)
+        if entry is not None:
+            yield from self.read(entry, columns=columns, chunksize=chunksize)
+            return
+        for chunk in self._fill(source, sha256, chunksize):
+            yield chunk if columns is None else chunk[columns]
+
+    def warm(self, source: Path, chunksize: int = 100_000) -> Dict[str, Any]:
+        """Decode a source file into the cache (if needed) and return its entry."""
+        sha256 = file_sha256(source)
+        entry = self.lookup(source, sha256)
+        if entry is None:
+            for _ in self._fill(source, sha256, chunksize):
+                pass
+            entry = self.lookup(source, sha256)
+        return entry
+
+    def _fill(
+        self, source: Path, sha256: str, chunksize: int
+    ) -> Iterator[pd.DataFrame]:
+        """Read a tab-separated source file, writing it to Parquet as it is consumed.
+
+        The entry is only registered once the whole file has been read; an
+        abandoned read leaves nothing behind.
+        """
+        pa = require_pyarrow("the source cache")
+        key = self.key(source, sha256)
+        target = self.directory / f"{key}.parquet"
+        tmp = target.with_suffix(".parquet.tmp")
+        writer = None
+        rows = 0
+        try:
+            for chunk in pd.read_csv(
+                source,
+                sep="\t",
+                dtype=str,
+                keep_default_na=False,
+                iterator=True,
+                chunksize=chunksize,
+            ):
+                if writer is None:
+                    schema = pa.schema([(c, pa.string()) for c in chunk.columns])
+                    writer = pa.parquet.ParquetWriter(tmp, schema)
+                writer.write_table(
+                    pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                )
+                rows += len(chunk)
+                yield chunk
+            if writer is not None:
+                writer.close()
+                writer = None
+                tmp.replace(target)
+                self._register(source, sha256, key, target, rows, list(schema.names))
+        finally:
+            if writer is not None:
+                writer.close()
+            tmp.unlink(missing_ok=True)
+
+    def _register(
+        self,
+        source: Path,
+        sha256: str,
+        key: str,
+        target: Path,
+        rows: int,
+        columns: List[str],
+    ) -> None:
+        """Record a filled entry and evict old ones past the size limit."""
+        stat = source.stat()
+        entry = {
+            "source": str(source.resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
+            "file": target.name,
+            "bytes": target.stat().st_size,
+            "rows": rows,
+            "columns": columns,
+            "last_used": time.time(),
+        }
+        with self._lock:
+            index = self._load_index()
+            index[key] = entry
+            self._evict(index, keep=key)
+            self._save_index(index)
+
+    def _evict(
+        self, index: Dict[str, Dict[str, Any]], keep: Optional[str] = None
+    ) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        total = sum(entry["bytes"] for entry in index.values())
+        for key, entry in sorted(index.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            (self.directory / entry["file"]).unlink(missing_ok=True)
+            total -= entry["bytes"]
+            del index[key]
+
+    def evict(self, source: Optional[Path] = None) -> int:
+        """Remove one source's entries (or all of them); returns how many were removed."""
+        with self._lock:
+            index = self._load_index()
+            keys = [
+                key
+                for key, entry in index.items()
+                if source is None or entry["source"] == str(source.resolve())
+            ]
+            for key in keys:
+                (self.directory / index.pop(key)["file"]).unlink(missing_ok=True)
+            self._save_index(index)
+        return len(keys)
+
+
+def cache_from_env() -> SourceCache:
+    """Build the cache configured by SOURCE_CACHE_DIR and SOURCE_CACHE_MAX_GB."""
+    return SourceCache(
+        Path(os.environ.get("SOURCE_CACHE_DIR", DEFAULT_CACHE_DIR)),
+        max_bytes=int(
+            float(os.environ.get("SOURCE_CACHE_MAX_GB", DEFAULT_MAX_BYTES / 2**30))
+            * 2**30
+        ),
+    )
+
+
+def main() -> None:
+    """Warm, inspect or evict the source cache from the command line."""
+    args = argparse.ArgumentParser(
+        prog="python -m bio_data_merge.processor.cache",
+        description="Manage the Parquet cache of decoded BioGRID/IntAct files.",
+    )
+    commands = args.add_subparsers(dest="command", required=True)
+    warm = commands.add_parser("warm", help="decode source files into the cache")
+    warm.add_argument("files", nargs="+", type=Path)
+    commands.add_parser("inspect", help="list the cached entries")
+    evict = commands.add_parser("evict", help="remove entries from the cache")
+    evict.add_argument("files", nargs="*", type=Path, help="default: everything")
+    options = args.parse_args()
+
+    cache = cache_from_env()
+    match options.command:
+        case "warm":
+            for source in options.files:
+                entry = cache.warm(source)
+                print(f"{source}: {entry['rows']} rows, {entry['bytes']:,} bytes")
+        case "inspect":
+            entries = cache.entries()
+            for entry in entries.values():
+                print(
+                    f"{entry['source']}: {entry['rows']} rows, "
+                    f"{entry['bytes']:,} bytes, sha256 {entry['sha256'][:12]}, "
+                    f"last used {time.ctime(entry['last_used'])}"
+                )
+            total = sum(entry["bytes"] for entry in entries.values())
+            print(f"{len(entries)} entries, {total:,} of {cache.max_bytes:,} bytes")
+        case "evict":
+            removed = sum(cache.evict(source) for source in options.files or [None])
+            print(f"evicted {removed} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Interactor display fields Module"""
+import re
+from typing import Any, Mapping
+
+import pandas as pd
+
+DISPLAY_TITLE_FIELD = "Display_Title"
+SPECIES_FIELD = "Species"
+
+_DISPLAY_SHORT_RE = re.compile(r'(?i)([A-Za-z0-9\-\_\s\)\(" ]+)\(display_short\)')
+_DISPLAY_LONG_RE = re.compile(r'(?i)([A-Za-z0-9\-\_\s\)\(" ]+)\(display_long\)')
+# IntAct taxids, e.g. `taxid:9606(human)|taxid:9606(Homo sapiens)`;
+# the last one carries the biological name
+_SPECIES_RE = re.compile(r'^.+\|taxid:[0-9]+\(([A-Za-z0-9\-\s\)\("]+)\)$')
+
+
+def _joined(values: pd.Series, pattern: re.Pattern) -> pd.Series:
+    """All matches of a pattern in each value, joined with ` | ` (empty when none)."""
+    matches = values.str.extractall(pattern)[0]
+    joined = matches.groupby(level=0, sort=False).agg(" | ".join)
+    return joined.reindex(values.index, fill_value="")
+
+
+def display_titles(interactors: pd.DataFrame) -> pd.Series:
+    """The name an interactor is shown under.
+
+    IntAct aliases give their display_short names (display_long ones when
+    there are none); BioGRID and STRING interactors use their symbol.
+    """
+    if "Aliases" in interactors:
+        aliases = interactors["Aliases"].astype(str)
+        titles = _joined(aliases, _DISPLAY_SHORT_RE)
+        missing = titles == ""
+        if missing.any():
+            titles[missing] = _joined(aliases[missing], _DISPLAY_LONG_RE)
+        return titles
+    for field in ("Official_Symbol", "Preferred_Name"):
+        if field in interactors:
+            return interactors[field].astype(str)
+    return pd.Series("", index=interactors.index)
+
+
+def species_names(interactors: pd.DataFrame) -> pd.Series:
+    """The organism an interactor belongs to, empty when the source does not name it."""
+    if "Organism_Name" in interactors:
+        return interactors["Organism_Name"].astype(str)
+    if "Taxid" in interactors:
+        species = interactors["Taxid"].astype(str).str.extract(_SPECIES_RE)[0]
+        return species.str.strip('"').fillna("")
+    return pd.Series("", index=interactors.index)
+
+
+def with_display_fields(interactors: pd.DataFrame) -> pd.DataFrame:
+    """Add the `Display_Title` and `Species` columns to a frame of interactors."""
+    return interactors.assign(
+        **{
+            DISPLAY_TITLE_FIELD: display_titles(interactors),
+            SPECIES_FIELD: species_names(interactors),
+        }
+    )
+
+
+def node_display_fields(node: Mapping[str, Any]) -> Mapping[str, str]:
+    """Display fields of a single node, for graphs loaded before they were precomputed."""
+    frame = pd.DataFrame([{k: v for k, v in node.items() if isinstance(v, str)}])
+    return {
+        DISPLAY_TITLE_FIELD: display_titles(frame).iloc[0],
+        SPECIES_FIELD: species_names(frame).iloc[0],
+    }
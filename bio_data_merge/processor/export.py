@@ -0,0 +1,193 @@
+"""neo4j-admin import export Module"""
+import csv
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+from bio_data_merge.model.database.database import DatabaseType
+from bio_data_merge.processor.aggregate import EVIDENCE_TYPE, EvidenceAggregator
+from bio_data_merge.processor.transform import RecordBatch
+from bio_data_merge.processor.writer import WriterStats
+
+NODES_FILENAME = "interactors.csv"
+RELATIONSHIPS_FILENAME = "interacts_with.csv"
+EVIDENCE_FILENAME = "interaction_evidence.csv"
+# between the elements of list properties: the ASCII unit separator, passed to
+# neo4j-admin as --array-delimiter and removed from the elements themselves
+ARRAY_DELIMITER = "\x1f"
+ARRAY_DELIMITER_OPTION = "U+001F"
+
+
+def _column(key: str, value: Any) -> str:
+    """The neo4j-admin header of a property column, typed after one of its values."""
+    if isinstance(value, list):
+        return f"{key}:string[]"
+    if isinstance(value, int):
+        return f"{key}:int"
+    return key
+
+
+def _cell(value: Any) -> Any:
+    """A property value as written to a CSV cell; lists are joined on the delimiter."""
+    if isinstance(value, list):
+        return ARRAY_DELIMITER.join(
+            element.replace(ARRAY_DELIMITER, " ") for element in value
+        )
+    return value
+
+
+class ImportCsvWriter:
+    """Write record batches as node and relationship CSV files for `neo4j-admin database import`.
+
+    It is a drop-in replacement for the Bolt `BatchWriter`: one set of files is
+    written per database into ``<directory>/<database name>/``. The column set
+    of each file is fixed by the first record written to it. Nodes are keyed
+    by their interned integer IDs (the source ID stays a regular property),
+    which keeps the importer's ID map small. List properties are written
+    as `string[]` columns.
+
+    The importer cannot merge, so with `edges` other than `raw` the
+    relationships are aggregated over the whole database in memory and only
+    written on `close` (see `BatchWriter` for the edge modes).
+    """
+
+    interned_ids = True  # relationships are keyed on their endpoints' interned IDs
+
+    def __init__(
+        self,
+        directory: Path,
+        database: DatabaseType,
+        id_field_name: str,
+        edges: str = "raw",
+        ordered_pairs: bool = False,
+    ):
+        """Initialize the writer."""
+        self.directory = Path(directory) / database.name.lower()
+        self.database = database
+        self.id_field_name = id_field_name
+        self.edges = edges
+        self.stats = WriterStats()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._files: List[TextIO] = []
+        self._nodes: Optional[csv.DictWriter] = None
+        self._relationships: Dict[str, csv.DictWriter] = {}  # by type
+        self._aggregator = EvidenceAggregator(ordered_pairs)
+
+    @property
+    def nodes_path(self) -> Path:
+        """Path of the node CSV file."""
+        return self.directory / NODES_FILENAME
+
+    @property
+    def relationships_path(self) -> Path:
+        """Path of the relationship CSV file."""
+        return self.directory / RELATIONSHIPS_FILENAME
+
+    @property
+    def evidence_path(self) -> Path:
+        """Path of the per-row evidence relationship CSV file (`both` edges)."""
+        return self.directory / EVIDENCE_FILENAME
+
+    def _open(self, path: Path, header: Dict[str, str]) -> csv.DictWriter:
+        """Open a CSV file and write its neo4j-admin header row.
+
+        `header` maps record keys to the column names neo4j-admin expects.
+        """
+        file = open(path, "w", newline="", encoding="utf-8")
+        self._files.append(file)
+        writer = csv.DictWriter(file, fieldnames=list(header))
+        writer.writerow(header)
+        return writer
+
+    def add_node(self, properties: Dict[str, Any], node_id: int) -> None:
+        """Write an interactor node row under its interned integer ID."""
+        if self._nodes is None:
+            header = {":ID": ":ID"}
+            header.update(
+                {key: _column(key, value) for key, value in properties.items()}
+            )
+            header[":LABEL"] = ":LABEL"
+            self._nodes = self._open(self.nodes_path, header)
+        row = {key: _cell(value) for key, value in properties.items()}
+        self._nodes.writerow({":ID": node_id, **row, ":LABEL": "Interactor"})
+        self.stats.nodes += 1
+
+    def add_relationship(
+        self,
+        a_id: int,
+        b_id: int,
+        properties: Dict[str, Any],
+        relationship_type: str = "INTERACTS_WITH",
+    ) -> None:
+        """Write a relationship row between two interned IDs."""
+        writer = self._relationships.get(relationship_type)
+        if writer is None:
+            header = {":START_ID": ":START_ID", ":END_ID": ":END_ID", ":TYPE": ":TYPE"}
+            header.update(
+                {key: _column(key, value) for key, value in properties.items()}
+            )
+            path = (
+                self.evidence_path
+                if relationship_type == EVIDENCE_TYPE
+                else self.relationships_path
+            )
+            writer = self._relationships[relationship_type] = self._open(path, header)
+        row = {key: _cell(value) for key, value in properties.items()}
+        writer.writerow(
+            {
+                ":START_ID": a_id,
+                ":END_ID": b_id,
+                ":TYPE": relationship_type,
+                **row,
+            }
+        )
+        self.stats.relationships += 1
+
+    def write_batch(self, batch: RecordBatch) -> None:
+        """Write every node and relationship of a transformed batch."""
+        for node, node_id in zip(batch.nodes, batch.node_ids):
+            self.add_node(node, node_id)
+        # the importer can only link nodes written to the files; relationships
+        # to interactors no batch emitted have no interned IDs and are skipped
+        relationships = [r for r in batch.relationships if "a_id" in r]
+        if self.edges != "raw":
+            self._aggregator.update(relationships)
+        if self.edges != "aggregated":
+            relationship_type = (
+                "INTERACTS_WITH" if self.edges == "raw" else EVIDENCE_TYPE
+            )
+            for relationship in relationships:
+                self.add_relationship(
+                    relationship["a_id"],
+                    relationship["b_id"],
+                    relationship["properties"],
+                    relationship_type,
+                )
+        self.stats.batches += 1
+
+    def flush(self) -> None:
+        """Flush the CSV files to disk."""
+        for file in self._files:
+            file.flush()
+
+    def close(self) -> WriterStats:
+        """Write the aggregated relationships, close the CSV files and return the final stats."""
+        for pair in self._aggregator.drain():
+            self.add_relationship(pair["a_id"], pair["b_id"], pair["properties"])
+        for file in self._files:
+            file.close()
+        self._files = []
+        return self.stats
+
+    def import_command(self) -> str:
+        """The `neo4j-admin` command that loads the written files."""
+        relationships = [self.relationships_path]
+        if self.edges == "both":
+            relationships.append(self.evidence_path)
+        return (
+            "neo4j-admin database import full --multiline-fields=true "
+            "--id-type=integer "
+            f"--array-delimiter={ARRAY_DELIMITER_OPTION} "
+            f"--nodes={self.nodes_path} "
+            + "".join(f"--relationships={path} " for path in relationships)
+            + self.database.name.lower()
+        )
@@ -0,0 +1,162 @@
+"""Interned identifier index Module"""
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_TAIL_LIMIT = 1 << 16
+
+
+def as_objects(values: Iterable[str]) -> np.ndarray:
+    """Identifiers as an object array."""
+    if isinstance(values, np.ndarray) and values.dtype == object:
+        return values
+    return np.asarray(list(values), dtype=object)
+
+
+def hash_ids(values: Iterable[str]) -> np.ndarray:
+    """64-bit hashes of identifier strings."""
+    return pd.util.hash_array(as_objects(values))
+
+
+class IdIndex:
+    """Map identifier strings to dense integer IDs (0, 1, 2, ... in first-seen order).
+
+    Identifiers are found by their 64-bit hash, kept with the integer ID in
+    two sorted NumPy arrays searched with `searchsorted`. New identifiers
+    go into a small sorted tail that is merged into the main arrays once it
+    exceeds `tail_limit`, so inserting a chunk never re-sorts the whole index.
+    The identifiers themselves are kept too (by ID) and compared on every
+    hash hit; an identifier whose hash is taken by another one is kept in
+    a small side table instead, so a collision never merges two of them.
+    """
+
+    def __init__(self, tail_limit: int = DEFAULT_TAIL_LIMIT):
+        """Initialize an empty index."""
+        self.tail_limit = tail_limit
+        self._keys = np.empty(0, dtype=np.uint64)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._tail_keys = np.empty(0, dtype=np.uint64)
+        self._tail_ids = np.empty(0, dtype=np.int64)
+        self._values = np.empty(0, dtype=object)  # identifiers by ID, with spare room
+        self._count = 0
+        self._collisions: Dict[str, int] = {}  # identifiers whose hash is taken
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the index arrays (not counting the identifier strings)."""
+        return sum(
+            a.nbytes
+            for a in (
+                self._keys,
+                self._ids,
+                self._tail_keys,
+                self._tail_ids,
+                self._values,
+            )
+        )
+
+    @staticmethod
+    def _search(keys: np.ndarray, ids: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+        """IDs of the hashes in one sorted array pair, -1 where absent."""
+        result = np.full(len(hashes), -1, dtype=np.int64)
+        if len(keys) == 0:
+            return result
+        pos = np.searchsorted(keys, hashes)
+        pos[pos == len(keys)] = 0
+        found = keys[pos] == hashes
+        result[found] = ids[pos[found]]
+        return result
+
+    def _lookup_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        result = self._search(self._keys, self._ids, hashes)
+        missing = result < 0
+        if missing.any():
+            result[missing] = self._search(
+                self._tail_keys, self._tail_ids, hashes[missing]
+            )
+        return result
+
+    def _lookup(self, values: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+        """IDs of the identifiers, checked against the stored ones, -1 for unknown ones."""
+        result = self._lookup_hashes(hashes)
+        found = np.flatnonzero(result >= 0)
+        clashes = found[self._values[result[found]] != values[found]]
+        for i in clashes.tolist():  # another identifier has the hash
+            result[i] = self._collisions.get(values[i], -1)
+        return result
+
+    def lookup(self, values: Iterable[str]) -> np.ndarray:
+        """Integer IDs of the given identifiers, -1 for unknown ones."""
+        values = as_objects(values)
+        return self._lookup(values, hash_ids(values))
+
+    def contains(self, values: Iterable[str]) -> np.ndarray:
+        """Boolean mask of the identifiers that are in the index."""
+        return self.lookup(values) >= 0
+
+    def intern(self, values: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the IDs of the identifiers, adding unknown ones.
+
+        The second array marks, for each value, whether this call added it
+        (only its first occurrence is marked).
+        """
+        values = as_objects(values)
+        hashes = hash_ids(values)
+        ids = self._lookup(values, hashes)
+        is_new = np.zeros(len(hashes), dtype=bool)
+        missing = np.flatnonzero(ids < 0)
+        if len(missing) == 0:
+            return ids, is_new
+
+        # assign IDs to the missing identifiers in order of first occurrence
+        codes, uniques = pd.factorize(values[missing], use_na_sentinel=False)
+        new_ids = np.arange(self._count, self._count + len(uniques))
+        ids[missing] = new_ids[codes]
+        first = missing[np.unique(codes, return_index=True)[1]]
+        is_new[first] = True
+        self._store(np.asarray(uniques, dtype=object))
+
+        # a hash already taken, or shared by two new identifiers, goes to the side table
+        new_hashes = hashes[first]
+        taken = (self._lookup_hashes(new_hashes) >= 0) | pd.Series(
+            new_hashes
+        ).duplicated().to_numpy()
+        for value, id_ in zip(values[first[taken]], new_ids[taken].tolist()):
+            self._collisions[value] = id_
+        order = np.argsort(new_hashes[~taken])
+        self._add(new_hashes[~taken][order], new_ids[~taken][order])
+        return ids, is_new
+
+    def _store(self, values: np.ndarray) -> None:
+        """Append identifiers, by ID, growing their array geometrically."""
+        end = self._count + len(values)
+        if end > len(self._values):
+            grown = np.empty(max(end, 2 * len(self._values)), dtype=object)
+            grown[: self._count] = self._values[: self._count]
+            self._values = grown
+        self._values[self._count : end] = values
+        self._count = end
+
+    def _add(self, keys: np.ndarray, ids: np.ndarray) -> None:
+        """Merge sorted new keys into the tail, and the tail into the main arrays when full."""
+        self._tail_keys, self._tail_ids = self._merge(
+            self._tail_keys, self._tail_ids, keys, ids
+        )
+        if len(self._tail_keys) > self.tail_limit:
+            self._keys, self._ids = self._merge(
+                self._keys, self._ids, self._tail_keys, self._tail_ids
+            )
+            self._tail_keys = np.empty(0, dtype=np.uint64)
+            self._tail_ids = np.empty(0, dtype=np.int64)
+
+    @staticmethod
+    def _merge(
+        keys: np.ndarray, ids: np.ndarray, new_keys: np.ndarray, new_ids: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Merge two sorted key/ID array pairs."""
+        pos = np.searchsorted(keys, new_keys)
+        return np.insert(keys, pos, new_keys), np.insert(ids, pos, new_ids)
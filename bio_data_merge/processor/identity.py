@@ -0,0 +1,332 @@
+"""Cross-source identity resolution Module"""
+import argparse
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+from py2neo import Graph
+
+from bio_data_merge.connection import get_graph
+from bio_data_merge.model.database.database import DatabaseType, ID_FIELDS
+from bio_data_merge.processor.settings import ParserSettings
+from bio_data_merge.processor.transform import RecordBatch
+
+CANONICAL_ID_FIELD = "Canonical_ID"
+DEFAULT_BATCH_SIZE = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS node_keys (
+    database TEXT NOT NULL,
+    id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (database, id, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS canonical (
+    database TEXT NOT NULL,
+    id TEXT NOT NULL,
+    canonical TEXT NOT NULL,
+    applied INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (database, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS canonical_members ON canonical (canonical);
+CREATE INDEX IF NOT EXISTS node_keys_by_key ON node_keys (key);
+CREATE TABLE IF NOT EXISTS dirty_keys (key TEXT PRIMARY KEY) WITHOUT ROWID;
+"""
+
+# every key connected to a key through the interactors sharing them
+COMPONENT_QUERY = """
+WITH RECURSIVE component(key) AS (
+    SELECT ?
+    UNION
+    SELECT other.key
+    FROM component
+    JOIN node_keys AS node ON node.key = component.key
+    JOIN node_keys AS other ON other.database = node.database AND other.id = node.id
+)
+SELECT key FROM component
+"""
+
+# name the interactors with a key of the component; only changed ones are written
+CANONICAL_UPSERT = """
+INSERT INTO canonical (database, id, canonical)
+SELECT DISTINCT database, id, ? FROM node_keys
+WHERE key IN (SELECT key FROM temp.component)
+ON CONFLICT (database, id) DO UPDATE
+SET canonical = excluded.canonical, applied = 0
+WHERE canonical != excluded.canonical
+"""
+
+# identity keys, most specific first; a group of interactors is named by its best key
+KEY_KINDS = ("uniprot", "entrez", "symbol")
+
+# PSI-MI TAB identifier lists, e.g. `uniprotkb:P04637|intact:EBI-366083`;
+# isoforms and chains (`P04637-2`, `P04637-PRO_0000185703`) share the accession
+_UNIPROT_RE = r"(?:^|\|)uniprotkb:([A-Z0-9]{6,10})(?=$|\||-)"
+_ENTREZ_RE = r"(?:^|\|)entrez gene/locuslink:([0-9]+)(?=$|\|)"
+_GENE_NAME_RE = r"(?:^|\|)uniprotkb:([^|]+?)\(gene name\)"
+_TAXID_RE = r"^taxid:(-?[0-9]+)"
+_MISSING = {"", "-", "nan", "None"}
+_EMPTY = pd.Series(dtype=object)
+
+
+def _present(values: pd.Series) -> pd.Series:
+    """Stripped values, without the missing ones."""
+    values = values.dropna().astype(str).str.strip()
+    return values[~values.isin(_MISSING)]
+
+
+def _extract(values: pd.Series, pattern: str) -> pd.Series:
+    """Every match of a pattern in each value, indexed by the value's row."""
+    return _present(values).str.extractall(pattern)[0].droplevel("match")
+
+
+def _symbols(names: pd.Series, taxids: pd.Series) -> pd.Series:
+    """`symbol:<taxid>:<name>` keys; names are only unique within a species."""
+    names = _present(names).str.lower()
+    taxids = _present(taxids).reindex(names.index)
+    known = taxids.notna()
+    return "symbol:" + taxids[known] + ":" + names[known]
+
+
+def identity_keys(interactors: pd.DataFrame, database: DatabaseType) -> pd.DataFrame:
+    """Identity keys (`id`, `key`) of a frame of interactors.
+
+    * BioGRID: Swiss-Prot accessions, Entrez gene ID and official symbol,
+    * IntAct: UniProt accessions and Entrez IDs of the (alternative)
+      identifiers, and gene name aliases,
+    * STRING: preferred name.
+
+    Symbols are qualified with the interactor's taxid.
+    """
+
+    def column(name: str) -> pd.Series:
+        return interactors.get(name, _EMPTY)
+
+    parts: List[pd.Series] = []
+    match database:
+        case DatabaseType.BioGRID:
+            accessions = _present(column("SWISS_PROT_Accessions")).str.split("|")
+            parts.append("uniprot:" + _present(accessions.explode()))
+            parts.append("entrez:" + _present(column("Entrez_Gene")))
+            parts.append(_symbols(column("Official_Symbol"), column("Organism_ID")))
+        case DatabaseType.IntAct:
+            for field in ("IDs", "Alt_IDs"):
+                parts.append("uniprot:" + _extract(column(field), _UNIPROT_RE))
+                parts.append("entrez:" + _extract(column(field), _ENTREZ_RE))
+            names = _extract(column("Aliases"), _GENE_NAME_RE)
+            taxids = _present(column("Taxid")).str.extract(_TAXID_RE)[0]
+            parts.append(_symbols(names, taxids))
+        case DatabaseType.STRING:
+            parts.append(_symbols(column("Preferred_Name"), column("Taxid")))
+
+    id_field = ID_FIELDS[database]
+    keys = pd.concat(parts)
+    if id_field not in interactors:
+        keys = keys.iloc[:0]
+    ids = interactors.get(id_field, _EMPTY).astype(str).reindex(keys.index)
+    frame = pd.DataFrame({"id": ids, "key": keys})
+    return frame.drop_duplicates(ignore_index=True)
+
+
+def _best_key(key: str) -> Tuple[int, str]:
+    """Sort key preferring the most specific kind of identity key."""
+    return KEY_KINDS.index(key.split(":", 1)[0]), key
+
+
+class IdentityIndex:
+    """Persistent identity keys of every loaded interactor and the canonical IDs resolved from them.
+
+    Interactors sharing a key (directly or through other interactors) are
+    the same gene/protein; each such group is named by its most specific
+    key, e.g. `uniprot:P04637`. Keys added since the last resolution are
+    kept as dirty, and only their groups are resolved again. A single
+    connection is shared between the loader threads, guarded by a lock.
+    """
+
+    def __init__(self, path: Path):
+        """Open (and create if needed) the index database."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._db.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS component (key TEXT PRIMARY KEY)"
+        )
+
+    def add(self, database: DatabaseType, keys: pd.DataFrame) -> None:
+        """Record the identity keys (`id`, `key`) of interactors of a database."""
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO node_keys VALUES (?, ?, ?)",
+                (
+                    (database.name, id_, key)
+                    for id_, key in zip(keys["id"], keys["key"])
+                ),
+            )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO dirty_keys VALUES (?)",
+                ((key,) for key in keys["key"]),
+            )
+
+    def resolve(self) -> int:
+        """Group the interactors of the dirty keys by shared keys and store their canonical IDs.
+
+        Every group is read with a recursive query, so only the groups that
+        gained keys are visited. Returns how many interactors got a new
+        canonical ID; only those are written to the graphs by
+        `apply_canonical_ids`.
+        """
+        changed = 0
+        with self._lock:
+            dirty = [key for (key,) in self._db.execute("SELECT key FROM dirty_keys")]
+            done: Set[str] = set()
+            with self._db:
+                for key in dirty:
+                    if key in done:
+                        continue
+                    component = [
+                        row[0] for row in self._db.execute(COMPONENT_QUERY, (key,))
+                    ]
+                    done.update(component)
+                    self._db.execute("DELETE FROM temp.component")
+                    self._db.executemany(
+                        "INSERT INTO temp.component VALUES (?)",
+                        ((member,) for member in component),
+                    )
+                    before = self._db.total_changes
+                    self._db.execute(CANONICAL_UPSERT, (min(component, key=_best_key),))
+                    changed += self._db.total_changes - before
+                self._db.execute("DELETE FROM dirty_keys")
+        return changed
+
+    def canonical_id(self, database: DatabaseType, id_: str) -> Optional[str]:
+        """Canonical ID of an interactor, None if it has no identity keys."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT canonical FROM canonical WHERE database = ? AND id = ?",
+                (database.name, id_),
+            ).fetchone()
+        return row[0] if row else None
+
+    def members(self, canonical: str) -> List[Tuple[str, str]]:
+        """(database, ID) of every interactor with a canonical ID."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT database, id FROM canonical WHERE canonical = ? "
+                "ORDER BY database, id",
+                (canonical,),
+            ).fetchall()
+
+    def pending(
+        self, database: DatabaseType, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[List[Dict[str, str]]]:
+        """Canonical IDs not written to a database's graph yet, in batches."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, canonical FROM canonical WHERE database = ? AND applied = 0",
+                (database.name,),
+            ).fetchall()
+        for start in range(0, len(rows), batch_size):
+            yield [
+                {"id": id_, "canonical": canonical}
+                for id_, canonical in rows[start : start + batch_size]
+            ]
+
+    def mark_applied(self, database: DatabaseType, ids: List[str]) -> None:
+        """Record canonical IDs as written to the graph."""
+        with self._lock, self._db:
+            self._db.executemany(
+                "UPDATE canonical SET applied = 1 WHERE database = ? AND id = ?",
+                ((database.name, id_) for id_ in ids),
+            )
+
+    def reset_applied(self, database: DatabaseType) -> None:
+        """Mark every canonical ID of a database as still to be written, e.g. after an import."""
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE canonical SET applied = 0 WHERE database = ?", (database.name,)
+            )
+
+
+class IdentityRecorder:
+    """Writer wrapper recording the identity keys of the nodes written through it."""
+
+    def __init__(self, writer: Any, index: IdentityIndex, database: DatabaseType):
+        """Initialize the recorder."""
+        self.writer = writer
+        self.index = index
+        self.database = database
+
+    def write_batch(self, batch: RecordBatch) -> None:
+        """Record the identity keys of a batch's nodes, then write the batch."""
+        if batch.nodes:
+            keys = identity_keys(pd.DataFrame(batch.nodes), self.database)
+            self.index.add(self.database, keys)
+        self.writer.write_batch(batch)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.writer, name)
+
+
+def apply_canonical_ids(
+    graph: Graph,
+    database: DatabaseType,
+    index: IdentityIndex,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Set the `Canonical_ID` of a database's interactors whose canonical ID changed."""
+    id_field = ID_FIELDS[database]
+    written = 0
+    for rows in index.pending(database, batch_size):
+        graph.run(
+            f"""
+            UNWIND $rows AS row
+            MATCH (n:Interactor {{{id_field}: row.id}})
+            SET n.{CANONICAL_ID_FIELD} = row.canonical
+            """,
+            rows=rows,
+        )
+        index.mark_applied(database, [row["id"] for row in rows])
+        written += len(rows)
+    return written
+
+
+def main() -> None:
+    """Resolve canonical IDs and write them to the graphs, or look one up."""
+    args = argparse.ArgumentParser(
+        prog="python -m bio_data_merge.processor.identity",
+        description=(
+            "Write the canonical IDs of the identity index to the per-source "
+            "databases, e.g. after a neo4j-admin import."
+        ),
+    )
+    args.add_argument(
+        "--all",
+        action="store_true",
+        help="write every canonical ID, not only the ones that changed",
+    )
+    args.add_argument(
+        "--lookup",
+        metavar="CANONICAL_ID",
+        help="only list the interactors with this canonical ID",
+    )
+    options = args.parse_args()
+
+    index = IdentityIndex(ParserSettings.from_env().identity_index_path)
+    if options.lookup:
+        for database, id_ in index.members(options.lookup):
+            print(f"{database}\t{id_}")
+        return
+    print(f"{index.resolve()} interactors got a new canonical ID")
+    for database in DatabaseType:
+        if options.all:
+            index.reset_applied(database)
+        written = apply_canonical_ids(get_graph(database.name.lower()), database, index)
+        print(f"{database.name}: wrote {written} canonical IDs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Incremental ingestion manifest Module"""
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List, Set
+
+import numpy as np
+import pandas as pd
+
+from bio_data_merge.model.database.database import DatabaseType
+from bio_data_merge.processor.reader import as_text
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    database TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    started REAL NOT NULL,
+    finished REAL,
+    chunk_size INTEGER
+);
+CREATE TABLE IF NOT EXISTS files (
+    database TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (database, path)
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    run_id INTEGER NOT NULL,
+    chunk INTEGER NOT NULL,
+    PRIMARY KEY (run_id, chunk)
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    database TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL,
+    run_id INTEGER NOT NULL,
+    PRIMARY KEY (database, fingerprint)
+) WITHOUT ROWID;
+"""
+
+_QUERY_BATCH = 500  # stays below SQLite's bound-parameter limit
+
+# relationship property holding the fingerprint of the row it was written for
+FINGERPRINT_FIELD = "Fingerprint"
+
+
+def row_fingerprints(input_df: pd.DataFrame) -> np.ndarray:
+    """Content fingerprint (signed 64 bit) of every row of a chunk.
+
+    Rows are hashed as text (see `reader.as_text`) so the fingerprint does not
+    depend on the dtypes a chunk was read with.
+    """
+    hashes = pd.util.hash_pandas_object(as_text(input_df), index=False)
+    return hashes.to_numpy().view(np.int64)
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Persistent record of loaded source files, committed chunks and row fingerprints.
+
+    A single connection is shared between the loader threads, guarded by a lock.
+    """
+
+    def __init__(self, path: Path):
+        """Open (and create if needed) the manifest database."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(runs)")}
+        if "chunk_size" not in columns:  # manifest written by an older version
+            with self._db:
+                self._db.execute("ALTER TABLE runs ADD COLUMN chunk_size INTEGER")
+
+    def source_hash(self, database: DatabaseType, filenames: List[str]) -> str:
+        """Combined content hash of a database's source files.
+
+        File hashes are cached against their size and mtime so unchanged
+        multi-GB files are not re-hashed on every run.
+        """
+        digest = hashlib.sha256()
+        for filename in sorted(filenames):
+            path = Path(filename)
+            stat = path.stat()
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT sha256 FROM files WHERE database = ? AND path = ? "
+                    "AND size = ? AND mtime = ?",
+                    (database.name, str(path), stat.st_size, stat.st_mtime),
+                ).fetchone()
+            sha = row[0] if row else file_sha256(path)
+            if row is None:
+                with self._lock, self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                        (database.name, str(path), stat.st_size, stat.st_mtime, sha),
+                    )
+            digest.update(sha.encode())
+        return digest.hexdigest()
+
+    def begin(
+        self, database: DatabaseType, filenames: List[str], chunk_size: int
+    ) -> "IncrementalLoad":
+        """Start loading a database read in chunks of `chunk_size` rows.
+
+        If the latest run of the database was for the same sources, it is
+        resumed (or reported as up to date when it finished); otherwise a new
+        run is started and rows are diffed against the previous release.
+        Chunks are checkpointed by position, so a run is only resumed with
+        the chunk size it was started with.
+        """
+        source_hash = self.source_hash(database, filenames)
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT id, finished, source_hash, chunk_size FROM runs "
+                "WHERE database = ? ORDER BY id DESC LIMIT 1",
+                (database.name,),
+            ).fetchone()
+            if row is not None and row[2] == source_hash:
+                run_id, finished, _, run_chunk_size = row
+            else:
+                run_id = self._db.execute(
+                    "INSERT INTO runs (database, source_hash, started, chunk_size) "
+                    "VALUES (?, ?, ?, ?)",
+                    (database.name, source_hash, time.time(), chunk_size),
+                ).lastrowid
+                finished, run_chunk_size = None, chunk_size
+            committed = {
+                chunk
+                for (chunk,) in self._db.execute(
+                    "SELECT chunk FROM chunks WHERE run_id = ?", (run_id,)
+                )
+            }
+            if finished is None and run_chunk_size != chunk_size:
+                if committed:
+                    raise ValueError(
+                        f"{database.name}: the interrupted load was read in chunks "
+                        f"of {run_chunk_size} rows, not {chunk_size}; resume it "
+                        "with the same chunk size"
+                    )
+                self._db.execute(
+                    "UPDATE runs SET chunk_size = ? WHERE id = ?", (chunk_size, run_id)
+                )
+        return IncrementalLoad(self, database, run_id, committed, finished is not None)
+
+    def known(self, database: DatabaseType, fingerprints: np.ndarray) -> np.ndarray:
+        """Boolean mask of the fingerprints that are already in the graph."""
+        values = [int(fp) for fp in fingerprints]
+        found: Set[int] = set()
+        with self._lock:
+            for start in range(0, len(values), _QUERY_BATCH):
+                part = values[start : start + _QUERY_BATCH]
+                found.update(
+                    fp
+                    for (fp,) in self._db.execute(
+                        "SELECT fingerprint FROM fingerprints WHERE database = ? "
+                        f"AND fingerprint IN ({','.join('?' * len(part))})",
+                        (database.name, *part),
+                    )
+                )
+        return np.fromiter(
+            (fp in found for fp in values), dtype=bool, count=len(values)
+        )
+
+    def commit_chunk(
+        self,
+        database: DatabaseType,
+        run_id: int,
+        chunk: int,
+        fingerprints: np.ndarray,
+    ) -> None:
+        """Record a chunk as written, stamping all of its rows with the current run."""
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?)",
+                ((database.name, int(fp), run_id) for fp in fingerprints),
+            )
+            self._db.execute(
+                "INSERT OR IGNORE INTO chunks VALUES (?, ?)", (run_id, chunk)
+            )
+
+    def stale(self, database: DatabaseType, run_id: int) -> Iterator[List[int]]:
+        """Yield, in batches, fingerprints of rows that are not in the current run."""
+        with self._lock:
+            rows = [
+                fp
+                for (fp,) in self._db.execute(
+                    "SELECT fingerprint FROM fingerprints WHERE database = ? AND run_id != ?",
+                    (database.name, run_id),
+                )
+            ]
+        for start in range(0, len(rows), _QUERY_BATCH):
+            yield rows[start : start + _QUERY_BATCH]
+
+    def forget(self, database: DatabaseType, fingerprints: List[int]) -> None:
+        """Drop fingerprints of rows that were removed from the graph."""
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM fingerprints WHERE database = ? AND fingerprint = ?",
+                ((database.name, fp) for fp in fingerprints),
+            )
+
+    def finish(self, run_id: int) -> None:
+        """Mark a run as complete and drop its chunk checkpoints."""
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE runs SET finished = ? WHERE id = ?", (time.time(), run_id)
+            )
+            self._db.execute("DELETE FROM chunks WHERE run_id = ?", (run_id,))
+
+
+class IncrementalLoad:
+    """Delta bookkeeping for loading one database's sources."""
+
+    def __init__(
+        self,
+        manifest: Manifest,
+        database: DatabaseType,
+        run_id: int,
+        committed_chunks: Set[int],
+        up_to_date: bool,
+    ):
+        """Initialize the load."""
+        self.manifest = manifest
+        self.database = database
+        self.run_id = run_id
+        self.committed_chunks = committed_chunks
+        self.up_to_date = up_to_date  # these exact sources were already loaded
+
+    def new_rows(self, fingerprints: np.ndarray) -> np.ndarray:
+        """Boolean mask of the rows of a chunk that still need to be written."""
+        return ~self.manifest.known(self.database, fingerprints)
+
+    def commit_chunk(self, chunk: int, fingerprints: np.ndarray) -> None:
+        """Checkpoint a chunk once its rows are committed to the graph."""
+        self.manifest.commit_chunk(self.database, self.run_id, chunk, fingerprints)
+        self.committed_chunks.add(chunk)
+
+    def stale(self) -> Iterator[List[int]]:
+        """Fingerprints of rows from earlier releases that this release no longer has."""
+        return self.manifest.stale(self.database, self.run_id)
+
+    def forget(self, fingerprints: List[int]) -> None:
+        """Drop fingerprints whose relationships were deleted."""
+        self.manifest.forget(self.database, fingerprints)
+
+    def finish(self) -> None:
+        """Mark the load as complete."""
+        self.manifest.finish(self.run_id)
+        self.up_to_date = True
@@ -0,0 +1,188 @@
+"""Parallel ingestion Module"""
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from queue import Queue
+from typing import Callable, Deque, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from bio_data_merge.metrics import registry
+from bio_data_merge.processor.transform import FrameTransformer, RecordBatch
+from bio_data_merge.processor.writer import BatchWriter, WriterStats
+
+# transformers cached per worker process, so the column layout is computed once per file
+_worker_transformers: Dict[str, FrameTransformer] = {}
+
+
+def transform_chunk(id_field_name: str, input_df: pd.DataFrame) -> RecordBatch:
+    """Transform a chunk (shard) in a worker process."""
+    transformer = _worker_transformers.get(id_field_name)
+    if transformer is None:
+        transformer = _worker_transformers[id_field_name] = FrameTransformer(
+            id_field_name
+        )
+    return transformer.transform_chunk(input_df)
+
+
+def _partition(rows: List, parts: int) -> List[List]:
+    """Split rows into at most `parts` contiguous, non-empty slices."""
+    size = -(-len(rows) // parts) if rows else 0
+    return [rows[i : i + size] for i in range(0, len(rows), size)] if size else []
+
+
+class ParallelIngestor:
+    """Transform chunks in a process pool and write them with a pool of writers.
+
+    Chunks are the shards: they are transformed concurrently, but their results
+    are consumed in read order and deduplicated against a single
+    `FrameTransformer`, so the set of nodes written does not depend on which
+    worker finished first. The nodes of a chunk are committed before its
+    relationships are sent, while the relationships of one chunk may overlap
+    with the nodes of the next.
+    """
+
+    def __init__(
+        self,
+        id_field_name: str,
+        transform_executor: Executor,
+        writers: List[BatchWriter],
+        cancelled: threading.Event,
+        max_pending: Optional[int] = None,
+        metric_labels: Optional[Dict[str, str]] = None,
+    ):
+        """Initialize the ingestor."""
+        # deduplication interns the endpoints too when the writers key on them
+        self.transformer = FrameTransformer(
+            id_field_name, endpoint_ids=writers[0].interned_ids
+        )
+        self.transform_executor = transform_executor
+        self.writers = writers
+        self.cancelled = cancelled
+        # enough chunks in flight to keep the workers busy without unbounded read-ahead
+        self.max_pending = max_pending or 2 * len(writers) + 2
+        self.metric_labels = metric_labels or {}
+        self._idle_writers: Queue = Queue()
+        for writer in writers:
+            self._idle_writers.put(writer)
+        self._write_executor = ThreadPoolExecutor(
+            max_workers=len(writers), thread_name_prefix="writer"
+        )
+
+    def _write(self, batch: RecordBatch) -> None:
+        """Borrow an idle writer, write the batch with it and flush."""
+        writer = self._idle_writers.get()
+        try:
+            writer.write_batch(batch)
+            writer.flush()
+        finally:
+            self._idle_writers.put(writer)
+
+    def _fan_out(self, batches: List[RecordBatch]) -> List[Future]:
+        """Spread batches over the writer pool."""
+        return [self._write_executor.submit(self._write, batch) for batch in batches]
+
+    def _write_batch(
+        self, batch: RecordBatch, pending_writes: List[Future]
+    ) -> List[Future]:
+        """Write a deduplicated batch: nodes first, then its relationships."""
+        parts = len(self.writers)
+        node_batches = [
+            RecordBatch(nodes=nodes, node_ids=node_ids)
+            for nodes, node_ids in zip(
+                _partition(batch.nodes, parts), _partition(batch.node_ids, parts)
+            )
+        ]
+        for future in wait(self._fan_out(node_batches)).done:
+            future.result()
+        # the previous chunk's relationships must finish before we queue more
+        for future in pending_writes:
+            future.result()
+        return self._fan_out(
+            [
+                RecordBatch(relationships=relationships)
+                for relationships in _partition(batch.relationships, parts)
+            ]
+        )
+
+    def run(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        on_chunk: Optional[Callable[[int], None]] = None,
+        on_written: Optional[Callable[[], None]] = None,
+        memory_full: Optional[Callable[[], bool]] = None,
+    ) -> WriterStats:
+        """Ingest every chunk; returns the combined stats of the writers.
+
+        `on_chunk` is called with the row count of each chunk once it is
+        queued for writing, and `on_written` once its relationships are
+        written too (in read order), e.g. to release its memory. While
+        `memory_full` is true, chunks are written before the next is read.
+        """
+        pending: Deque = deque()
+        pending_writes: List[Future] = []
+        finished = on_written or (lambda: None)
+        writing = False  # the last drained chunk's relationships may still be written
+
+        def _drain_one() -> None:
+            nonlocal pending_writes, writing
+            rows, future = pending.popleft()
+            # time spent waiting on the workers, plus deduplication
+            with registry().time("ingest_transform", **self.metric_labels):
+                batch = self.transformer.deduplicate(future.result())
+            pending_writes = self._write_batch(batch, pending_writes)
+            if writing:  # `_write_batch` waited for the previous chunk's writes
+                finished()
+            writing = True
+            if on_chunk is not None:
+                on_chunk(rows)
+
+        def _settle() -> None:
+            """Wait for the last drained chunk's relationships."""
+            nonlocal pending_writes, writing
+            for future in pending_writes:
+                future.result()
+            pending_writes = []
+            if writing:
+                finished()
+            writing = False
+
+        try:
+            for chunk in chunks:
+                if self.cancelled.is_set():
+                    break
+                pending.append(
+                    (
+                        len(chunk),
+                        self.transform_executor.submit(
+                            transform_chunk, self.transformer.id_field_name, chunk
+                        ),
+                    )
+                )
+                if len(pending) >= self.max_pending:
+                    _drain_one()
+                # the reader only reads ahead once the chunks held here fit its budget
+                while memory_full is not None and memory_full():
+                    if pending:
+                        _drain_one()
+                    elif writing:
+                        _settle()
+                    else:
+                        break
+            while pending and not self.cancelled.is_set():
+                _drain_one()
+            _settle()
+        finally:
+            for _, future in pending:
+                future.cancel()
+            self._write_executor.shutdown(cancel_futures=True)
+
+        stats = WriterStats()
+        for writer in self.writers:
+            writer_stats = writer.close()
+            stats.nodes += writer_stats.nodes
+            stats.relationships += writer_stats.relationships
+            stats.batches += writer_stats.batches
+            stats.retries += writer_stats.retries
+            stats.started = min(stats.started, writer_stats.started)
+        return stats
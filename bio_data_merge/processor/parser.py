@@ -1,28 +1,60 @@
 """Parser Module"""
-import subprocess
 from pathlib import Path
 from enum import IntEnum
-import os
+import json
+import signal
+import threading
+import time
 import animation
-from sqlalchemy import create_engine
-from concurrent.futures import ThreadPoolExecutor, as_completed, Future
+from concurrent.futures import (
+    CancelledError,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 import pandas as pd
-from typing import Callable, List, Optional, Dict, Any
-from bio_data_merge.model.interactions.interaction import Interaction
-from bio_data_merge.model.interactions.interaction import InteractionProperties
-from bio_data_merge.model.interactions.interactor import Interactor, InteractorVariant
-from bio_data_merge.model.database.database import DatabaseType
-import re
+from typing import Callable, Dict, Iterable, List, Optional, Any, Union
+from bio_data_merge.data_version import bump_data_version
+from bio_data_merge.model.database.database import DatabaseType, ID_FIELDS
+from bio_data_merge.model.database.schema import SOURCE_SCHEMAS
 from tqdm import tqdm
-from py2neo import Graph, Node, Relationship
+from py2neo import Graph
+from bio_data_merge.connection import connections, get_graph
+from bio_data_merge.metrics import peak_rss_bytes, registry
+from bio_data_merge.processor.cache import SourceCache, cache_from_env
+from bio_data_merge.processor.export import ImportCsvWriter
+from bio_data_merge.processor.identity import (
+    IdentityIndex,
+    IdentityRecorder,
+    apply_canonical_ids,
+)
+from bio_data_merge.processor.manifest import (
+    FINGERPRINT_FIELD,
+    IncrementalLoad,
+    Manifest,
+    row_fingerprints,
+)
+from bio_data_merge.processor.parallel import ParallelIngestor
+from bio_data_merge.processor.schema import bootstrap_schema, init_databases
+from bio_data_merge.processor.reader import read_source
+from bio_data_merge.processor.pipeline import (
+    ChunkPipeline,
+    iter_csv_chunks,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MEMORY_LIMIT,
+)
+from bio_data_merge.processor.string_loader import (
+    StringTransformer,
+    iter_string_chunks,
+    parse_species,
+)
+from bio_data_merge.processor.transform import FrameTransformer
+from bio_data_merge.processor.settings import EDGE_MODES, EDGE_PAIRS, ParserSettings
+from bio_data_merge.processor.snapshot import export_snapshot
+from bio_data_merge.processor.validation import RecordValidator, ValidatingWriter
+from bio_data_merge.processor.writer import BatchWriter, DEFAULT_BATCH_SIZE
 from dataclasses import dataclass
-from dotenv import load_dotenv
-
-# load & retrieve env vars
-load_dotenv()
-BIOGRID_PATH = Path(os.environ.get("BIOGRID_PATH"))
-STRING_PATH = Path(os.environ.get("STRING_PATH"))
-INTACT_PATH = Path(os.environ.get("INTACT_PATH"))
 
 
 @dataclass
@@ -31,6 +63,7 @@ class HandlerTask:
 
     handler: Callable
     args: List[Any]
+    database: Optional[DatabaseType] = None
 
 
 @dataclass
@@ -49,246 +82,357 @@ class EntityType(IntEnum):
 
 
 class Parser:
-    def __init__(self):
-        """Initialize the parser."""
+    """Load the source releases into their Neo4j databases.
+
+    Creating a parser is cheap: nothing is connected, opened or read until
+    `start` (or one of the init methods) runs.
+    """
+
+    def __init__(self, settings: Optional[ParserSettings] = None):
+        """Initialize the parser (from the environment when no settings are given)."""
+        settings = settings or ParserSettings.from_env()
+        self.settings = settings
         self._tasks: List[HandlerTask] = []
         self._executor = ThreadPoolExecutor(max_workers=3)
         self._futures: List[Future] = []
-
-        # Init logic for composite DB setup
-        sys_graph = Graph(
-            "bolt://localhost:7687", auth=("neo4j", "database"), name="system"
+        self.export_dir: Optional[Path] = None  # set to write import CSVs instead
+        self.cache: Optional[SourceCache] = (
+            cache_from_env() if settings.source_cache else None
         )
-        db_names = [db.name.lower() for db in DatabaseType]
-        main_db_name = "main"
-
-        # create and execute Cypher statements
-        statements = [
-            """
-            CREATE COMPOSITE DATABASE main IF NOT EXISTS
-            """,
-            *[
-                f"""
-                CREATE DATABASE {db} IF NOT EXISTS
-                """
-                for db in db_names
-            ],
-            *[
-                f"""
-                CREATE ALIAS {main_db_name}.{db} IF NOT EXISTS
-                    FOR DATABASE {db}
-                """
-                for db in db_names
-            ],
-        ]
-        print("Running initialization of dbs")
-        for s in statements:
-            sys_graph.run(s)
+        self.writer_batch_size = settings.writer_batch_size or DEFAULT_BATCH_SIZE
+        self.chunk_size = settings.chunk_size or DEFAULT_CHUNK_SIZE
+        self.memory_limit = settings.memory_limit or DEFAULT_MEMORY_LIMIT
+        self.string_species = parse_species(settings.string_species)
+        self.transform_workers = settings.transform_workers
+        self.writer_workers = settings.writer_workers
+        self._transform_executor: Optional[ProcessPoolExecutor] = None
+        self._cancelled = threading.Event()
+        self.fulltext_indexes = settings.fulltext_indexes
+        self.resolve_identities = settings.resolve_identities
+        self.identity: Optional[IdentityIndex] = None  # opened by `start`
+        self.report_path = settings.report_path
+        self.data_version_path = settings.data_version_path
+        self.validation = settings.validation  # off, sample or full
+        self.validation_sample_rate = settings.validation_sample_rate
+        self.snapshot_dir = settings.snapshot_dir
+        self.read_engine = settings.read_engine
+        self.edges = settings.edges  # raw, aggregated or both
+        self.ordered_pairs = settings.edge_pairs == "ordered"
 
     @staticmethod
-    def create_interactor(
-        fields: List[str],
-        row: pd.Series,
-        variant: InteractorVariant,
-        interaction_dict: Dict[str, Any],
-        graph: Graph,
-        node_map: Dict[str, Node],
-        id_field_name: str,
-    ) -> None:
-        """Create an interactor from the given data."""
-        dict = {}
-        for header in fields:
-            # preprocess header into workable field name
-            h = (
-                header.replace(" ", "_")
-                .replace("(", "")
-                .replace(")", "")
-                .replace("-", "_")
-                .replace(".", "")
-                .replace("#", "")
-                .replace("::", "")
+    def init_databases() -> None:
+        """Create the composite `main` database and the per-source databases."""
+        databases = [db.name.lower() for db in DatabaseType]
+        if init_databases(get_graph("system"), databases):
+            print("Created the composite and per-source databases")
+
+    def init_schema(self) -> None:
+        """Create the constraints and indexes of every per-source database.
+
+        Runs before loading so that nodes are merged, and relationship
+        endpoints matched, through the ID field's uniqueness constraint.
+        """
+        print("Running initialization of constraints and indexes")
+        for database in DatabaseType:
+            bootstrap_schema(
+                self.connect(database), database, fulltext=self.fulltext_indexes
             )
 
-            # remove `A` and `B from labels to make them agnostic
-            new_h: str = re.sub(r"_(I|i)nteractor_(A|B)$", "", h)
-            new_h = re.sub(r"_participant_(A|B)$", "", new_h)
-
-            # insert data from df into dict using our new header
-            dict[new_h] = str(row[header])
-
-        # create an interactor and check if it's in the node node_map; if not, insert it
-        interactor = Interactor(**dict)
-        if node_map.get(str(getattr(interactor, id_field_name))) is None:
-            x = Node("Interactor", **interactor.dict())
-            node_map[str(getattr(interactor, id_field_name))] = x
-            graph.create(x)
-
-        # we store only the name (ID) of the interactor, for referencing the node map later
-        interaction_dict[f"interactor_{variant.value}"] = str(
-            getattr(interactor, id_field_name)
-        )
-        return
+    @staticmethod
+    def connect(database: DatabaseType) -> Graph:
+        """The (pooled) graph of a per-source database."""
+        return get_graph(database.name.lower())
 
     def insert_entries(
         self,
-        input_df: pd.DataFrame,
+        input_data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
         db_index: DatabaseType,
-        graph: Graph,
+        writer: Union[BatchWriter, ImportCsvWriter, IdentityRecorder],
         id_field_name: str,
         loading_text: str,
+        load: Optional[IncrementalLoad] = None,
+        transformer: Optional[Union[FrameTransformer, StringTransformer]] = None,
     ) -> None:
-        """Iterate through rows, parse data into interactions."""
-        node_map: Dict[
-            str, Node
-        ] = {}  # map of nodes, for aid in relationship definition
-        int_a_fields: List[str] = []  # fields for Interactor A
-        int_b_fields: List[str] = []  # fields for Interactor B
-        int_props_fields: List[str] = []  # fields for Interaction properties
-
-        # Check for fields that end with ` A` -> interactor properties for interactor A
-        # check for fields that end with ` B`  -> interactor properties for interactor B
-        # the rest are interaction properties
-        header: str
-        for header in input_df.columns:
-            if header.endswith(" A"):
-                int_a_fields.append(header)
-            elif header.endswith(" B"):
-                int_b_fields.append(header)
-            else:
-                int_props_fields.append(header)
+        """Transform chunks of rows into interactions and write them as they arrive.
+
+        With an incremental `load`, only rows that are not in the graph yet are
+        written, each chunk is checkpointed once committed, and relationships of
+        rows that disappeared from the sources are deleted at the end.
+        """
+        if load is not None and load.up_to_date:
+            print(f"{loading_text}: sources unchanged since the last load, skipping")
+            return
+
+        parallel = (
+            self._transform_executor is not None
+            and load is None
+            and transformer is None
+        )
+        if transformer is None:
+            transformer = FrameTransformer(
+                id_field_name, endpoint_ids=writer.interned_ids
+            )
+        metrics = registry()
+        labels = {"database": db_index.name}
+
+        if isinstance(input_data, pd.DataFrame):
+            total = len(input_data)
+            chunks = (
+                input_data.iloc[start : start + self.writer_batch_size]
+                for start in range(0, total, self.writer_batch_size)
+            )
+        else:  # streamed chunks, size unknown up front
+            total = None
+            chunks = input_data
+        chunks = metrics.timed_iter(chunks, "ingest_read", **labels)
 
-        for _, row in tqdm(
-            input_df.iterrows(),
-            total=len(input_df),
+        def _on_chunk(rows: int) -> None:
+            metrics.count("ingest_rows", rows, **labels)
+            progress.update(rows)
+
+        with tqdm(
+            total=total,
             desc=loading_text,
+            unit="rows",
             colour="magenta",
             position=db_index,
-        ):
-            interaction_dict = {}
-
-            self.create_interactor(
-                int_a_fields,
-                row,
-                InteractorVariant.A,
-                interaction_dict,
-                graph,
-                node_map,
+        ) as progress:
+            if parallel:
+                on_written, memory_full = None, None
+                if isinstance(input_data, ChunkPipeline):
+                    # chunks are in use until their batch is written
+                    input_data.release_on_next = False
+                    on_written, memory_full = input_data.done, input_data.full
+                writers = [writer] + [
+                    self.create_writer(db_index, id_field_name)
+                    for _ in range(self.writer_workers - 1)
+                ]
+                stats = ParallelIngestor(
+                    id_field_name,
+                    self._transform_executor,
+                    writers,
+                    self._cancelled,
+                    metric_labels=labels,
+                ).run(
+                    chunks,
+                    on_chunk=_on_chunk,
+                    on_written=on_written,
+                    memory_full=memory_full,
+                )
+                print(f"{loading_text}: wrote {stats}")
+                return
+
+            for index, chunk in enumerate(chunks):
+                if self._cancelled.is_set():
+                    break
+                if load is None:
+                    with metrics.time("ingest_transform", **labels):
+                        batch = transformer.transform(chunk)
+                    writer.write_batch(batch)
+                    # not kept alive while the next chunk is read and transformed
+                    del batch
+                elif index not in load.committed_chunks:
+                    self._write_delta(chunk, index, transformer, writer, load)
+                _on_chunk(len(chunk))
+                progress.set_postfix(nodes=len(transformer.index))
+
+        if self._cancelled.is_set():
+            writer.close()
+            print(f"{loading_text}: cancelled")
+            return
+
+        if load is not None:
+            for fingerprints in load.stale():
+                writer.delete_relationships(fingerprints)
+                load.forget(fingerprints)
+            load.finish()
+
+        stats = writer.close()
+        print(f"{loading_text}: wrote {stats}")
+        if self.export_dir is not None:
+            print(f"Import with: {writer.import_command()}")
+            print(
+                "Then create the indexes and search keys with: "
+                "python -m bio_data_merge.processor.schema --search-keys"
+            )
+
+    @staticmethod
+    def _write_delta(
+        chunk: pd.DataFrame,
+        index: int,
+        transformer: Union[FrameTransformer, StringTransformer],
+        writer: BatchWriter,
+        load: IncrementalLoad,
+    ) -> None:
+        """Write the rows of a chunk that are new since the last load and checkpoint it."""
+        fingerprints = row_fingerprints(chunk)
+        new = load.new_rows(fingerprints)
+        # the fingerprint travels as an interaction column, like any other property
+        delta = chunk[new].assign(**{FINGERPRINT_FIELD: fingerprints[new]})
+        with registry().time("ingest_transform", database=load.database.name):
+            batch = transformer.transform(delta)
+        writer.write_batch(batch)
+        writer.flush()
+        load.commit_chunk(index, fingerprints)
+
+    def create_writer(
+        self, database: DatabaseType, id_field_name: str
+    ) -> Union[BatchWriter, ImportCsvWriter, IdentityRecorder, ValidatingWriter]:
+        """Create the sink for a database: Bolt batches, or import CSVs when exporting.
+
+        When identities are resolved, the identity keys of every node written
+        are recorded in the identity index on the way. Unless validation is
+        off, (a sample of) the batches is checked against the interaction
+        models before anything is written.
+        """
+        if self.export_dir is not None:
+            writer = ImportCsvWriter(
+                self.export_dir,
+                database,
                 id_field_name,
+                edges=self.edges,
+                ordered_pairs=self.ordered_pairs,
             )
-            self.create_interactor(
-                int_b_fields,
-                row,
-                InteractorVariant.B,
-                interaction_dict,
-                graph,
-                node_map,
+        else:
+            writer = BatchWriter(
+                self.connect(database),
                 id_field_name,
+                batch_size=self.writer_batch_size,
+                database=database.name,
+                edges=self.edges,
+                ordered_pairs=self.ordered_pairs,
             )
-
-            props_dict = {}
-            for header in int_props_fields:
-                props_dict[header.replace(" ", "_")] = str(row[header])
-            props = InteractionProperties(**props_dict)
-            interaction_dict["interaction_properties"] = props
-
-            interaction = Interaction(**interaction_dict)
-            a = node_map[interaction.interactor_a]
-            b = node_map[interaction.interactor_b]
-
-            graph.create(
-                Relationship(
-                    a, "INTERACTS_WITH", b, **interaction.interaction_properties.dict()
-                )
+        if self.identity is not None:
+            writer = IdentityRecorder(writer, self.identity, database)
+        if self.validation != "off":
+            validator = RecordValidator(
+                database, id_field_name, self.validation, self.validation_sample_rate
             )
+            writer = ValidatingWriter(writer, validator)
+        return writer
+
+    def apply_identities(self) -> None:
+        """Resolve the canonical IDs of the loaded interactors and write the new ones."""
+        changed = self.identity.resolve()
+        print(f"Identity resolution: {changed} interactors got a new canonical ID")
+        if self.export_dir is not None:
+            print(
+                "Write them to the imported databases with: "
+                "python -m bio_data_merge.processor.identity --all"
+            )
+            return
+        for database in DatabaseType:
+            written = apply_canonical_ids(
+                self.connect(database), database, self.identity
+            )
+            print(f"{database.name}: wrote {written} canonical IDs")
+
+    def export_snapshots(self, databases: List[str]) -> None:
+        """Export the snapshots the frontend searches instead of Neo4j."""
+        for name in databases:
+            database = DatabaseType[name]
+            with registry().time("snapshot_export", database=name):
+                path = export_snapshot(
+                    self.connect(database),
+                    database,
+                    self.snapshot_dir,
+                    self.data_version_path,
+                )
+            print(f"{name}: snapshot written to {path}")
 
-    def _parse_biogrid_data(self, input_df: pd.DataFrame) -> None:
+    def _parse_biogrid_data(
+        self,
+        input_data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        load: Optional[IncrementalLoad] = None,
+    ) -> None:
         """Parse BIOGRID data into models we can insert into graph as nodes and relationships."""
         db_index = DatabaseType.BioGRID
-        biogrid_graph = Graph(
-            "bolt://localhost:7687", auth=("neo4j", "database"), name="biogrid"
-        )  # temp handle to insert data
+        biogrid_writer = self.create_writer(db_index, ID_FIELDS[db_index])
 
         self.insert_entries(
-            input_df,
+            input_data,
             db_index,
-            biogrid_graph,
-            "BioGRID_ID",
+            biogrid_writer,
+            ID_FIELDS[db_index],
             "BioGRID: Creating Relationships and Nodes in database",
+            load,
         )
 
-    def _parse_string_data(input_df: pd.DataFrame) -> None:
-        """Parse STRING db data."""
-        # TODO: implement parser
+    def _parse_string_data(
+        self,
+        input_data: Iterable[pd.DataFrame],
+        load: Optional[IncrementalLoad] = None,
+    ) -> None:
+        """Parse STRING db data: proteins become interactors, protein links relationships."""
+        db_index = DatabaseType.STRING
+        string_writer = self.create_writer(db_index, StringTransformer.id_field_name)
+        transformer = StringTransformer(endpoint_ids=string_writer.interned_ids)
 
-    def _parse_intact_data(self, input_df: pd.DataFrame) -> None:
+        self.insert_entries(
+            input_data,
+            db_index,
+            string_writer,
+            transformer.id_field_name,
+            "STRING: Creating Relationships and Nodes in database",
+            load,
+            transformer=transformer,
+        )
+
+    def _parse_intact_data(
+        self,
+        input_data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        load: Optional[IncrementalLoad] = None,
+    ) -> None:
         """Parse IntAct db data."""
         db_index = DatabaseType.IntAct
-        intact_graph = Graph(
-            "bolt://localhost:7687", auth=("neo4j", "database"), name="intact"
-        )  # temp handle to insert data
+        intact_writer = self.create_writer(db_index, ID_FIELDS[db_index])
 
         self.insert_entries(
-            input_df,
+            input_data,
             db_index,
-            intact_graph,
-            "IDs",
+            intact_writer,
+            ID_FIELDS[db_index],
             "IntAct: Creating Relationships and Nodes in database",
+            load,
         )
 
     @staticmethod
-    def read_input_data(input_data: InputData) -> Optional[pd.DataFrame]:
+    def read_input_data(
+        input_data: InputData, engine: str = "c"
+    ) -> Optional[pd.DataFrame]:
         """Read the file specified by the input data and return the data as a DataFrame."""
         # switch based on database type
         match input_data.database:
-            case DatabaseType.BioGRID:  # expecting one file
-                return [
-                    pd.concat(
-                        pd.read_csv(file, sep="\t", iterator=True, chunksize=1000)
-                    )
-                    for file in input_data.filenames
-                ][0]
-            case DatabaseType.IntAct:  # expecting one file
-                return [
-                    pd.concat(
-                        pd.read_csv(file, sep="\t", iterator=True, chunksize=1000)
-                    )
-                    for file in input_data.filenames
-                ][0]
-            case DatabaseType.STRING:  # expecting 3 files
-                for file in input_data.filenames:
-                    # need to run a subprocess to load the file into postgres,
-                    # then use pandas to read the data from the database using the table name
-                    # requires postgresql to be installed on the system
-                    _ = subprocess.run(
-                        f"dropdb {DatabaseType.STRING.name} && createdb {DatabaseType.STRING.name}",
-                        shell=True,
-                    )
-                    _ = subprocess.run(
-                        f"gunzip -c {file} | psql  {DatabaseType.STRING.name}",
-                        shell=True,
-                    )
-
-                    alchemyEngine = create_engine(
-                        f"postgresql+psycopg2://postgres:@localhost/{DatabaseType.STRING.name}",
-                        pool_recycle=3600,
-                    )
-                    dbConnection = alchemyEngine.connect()
-
-                    dataFrame = pd.read_sql(
-                        """
-                        SELECT * FROM pg_catalog.pg_tables WHERE schemaname != 'pg_catalog' AND  schemaname != 'information_schema';
-                        """,
-                        dbConnection,
-                    )
-                    pd.set_option("display.expand_frame_repr", False)
-
-                    dbConnection.close()
-
-                    return dataFrame
-            case _:
+            case DatabaseType.BioGRID | DatabaseType.IntAct:  # expecting one file
+                schema = SOURCE_SCHEMAS[input_data.database]
+                return read_source(input_data.filenames[0], schema, engine=engine)
+            case _:  # STRING is always streamed, see stream_input_data
                 return None
 
-    def create_handler_task(self, df: pd.DataFrame, db_type: DatabaseType) -> None:
+    def stream_input_data(self, input_data: InputData) -> ChunkPipeline:
+        """Stream the files specified by the input data as bounded-memory chunks."""
+        if input_data.database == DatabaseType.STRING:
+            chunks = iter_string_chunks(
+                input_data.filenames,
+                chunksize=self.chunk_size,
+                species=self.string_species,
+            )
+        else:
+            chunks = iter_csv_chunks(
+                input_data.filenames,
+                chunksize=self.chunk_size,
+                cache=self.cache,
+                schema=SOURCE_SCHEMAS[input_data.database],
+                engine=self.read_engine,
+            )
+        return ChunkPipeline(chunks, memory_limit=self.memory_limit)
+
+    def create_handler_task(
+        self,
+        df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        db_type: DatabaseType,
+        load: Optional[IncrementalLoad] = None,
+    ) -> None:
         """Create a handler task based on the given database type."""
         handler_dict = {
             DatabaseType.BioGRID: self._parse_biogrid_data,
@@ -296,15 +440,74 @@ class Parser:
             DatabaseType.STRING: self._parse_string_data,
         }
         handler = handler_dict.get(db_type)
-        task = HandlerTask(handler, [df])
+
+        def _timed_handler(*args: Any) -> None:
+            with registry().time("ingest_load", database=db_type.name):
+                return handler(*args)
+
+        task = HandlerTask(_timed_handler, [df, load], db_type)
         self._tasks.append(task)
 
-    def start(self) -> None:
-        """Parse IntAct db data."""
-        input_list: List[InputData] = []
+    def start(
+        self,
+        streaming: bool = True,
+        export_dir: Optional[Path] = None,
+        incremental: bool = False,
+    ) -> None:
+        """Read the input databases and load them into the graph.
+
+        In streaming mode the handlers consume chunks straight from the file
+        readers; otherwise every database is read fully before loading. With
+        an `export_dir`, nothing is sent to Neo4j and neo4j-admin import CSV
+        files are written there instead. In incremental mode only the rows
+        that changed since the last load (recorded in the manifest) are
+        written, and an interrupted load resumes from its last chunk.
+        The run's metrics are written to `report_path` at the end.
+        """
+        if incremental and export_dir is not None:
+            raise ValueError("incremental loads cannot be exported as import CSVs")
+        if self.edges not in EDGE_MODES:
+            raise ValueError(f"unknown edge mode {self.edges!r}, expected {EDGE_MODES}")
+        if self.settings.edge_pairs not in EDGE_PAIRS:
+            raise ValueError(
+                f"unknown edge pairs {self.settings.edge_pairs!r}, expected {EDGE_PAIRS}"
+            )
+        if incremental and self.edges != "raw":
+            # rows are deleted by their fingerprint, which aggregated edges share
+            raise ValueError("incremental loads can only write raw edges")
+
+        registry().reset()
+        report = {
+            "started": time.time(),
+            "mode": "export" if export_dir is not None else "bolt",
+            "streaming": streaming,
+            "incremental": incremental,
+            "transform_workers": self.transform_workers,
+            "writer_workers": self.writer_workers,
+            "validation": self.validation,
+            "edges": self.edges,
+            "failed": {},
+        }
 
-        def _add_input(input_path: Path, ext: str, database: DatabaseType):
-            """Add input data to input list."""
+        input_list: List[InputData] = []
+        self.export_dir = export_dir
+        if export_dir is not None:
+            # the CSV writer is not thread-safe; a single writer keeps row order too
+            self.writer_workers = 1
+        manifest = Manifest(self.settings.manifest_path) if incremental else None
+        if self.resolve_identities:
+            self.identity = IdentityIndex(self.settings.identity_index_path)
+        if export_dir is None:
+            # every database's writers run concurrently, plus one schema/system session
+            connections().reserve(self.writer_workers * len(DatabaseType) + 1)
+            self.init_databases()
+            self.init_schema()
+
+        def _add_input(input_path: Optional[Path], ext: str, database: DatabaseType):
+            """Add input data to input list, unless the database has no input path."""
+            if input_path is None:
+                print(f"{database.name}: no input path set, skipping")
+                return
             input_list.append(
                 InputData(
                     filenames=[
@@ -314,36 +517,141 @@ class Parser:
                 )
             )
 
-        _add_input(
-            input_path=BIOGRID_PATH, ext=".tab3.zip", database=DatabaseType.BioGRID
-        )
-        _add_input(input_path=INTACT_PATH, ext=".zip", database=DatabaseType.IntAct)
-        # incomplete processing
-        # _add_input(input_path=STRING_PATH, ext=".sql.gz", database=DatabaseType.STRING)
+        settings = self.settings
+        _add_input(settings.biogrid_path, ".tab3.zip", DatabaseType.BioGRID)
+        _add_input(settings.intact_path, ".zip", DatabaseType.IntAct)
+        if settings.load_string:
+            _add_input(settings.string_path, ".sql.gz", DatabaseType.STRING)
+        else:
+            print(f"{DatabaseType.STRING.name}: not enabled (LOAD_STRING), skipping")
 
+        changed: List[str] = []  # databases whose data this load may change
         for entry in input_list:
+            stream = streaming or entry.database == DatabaseType.STRING
+            load = None
+            if manifest is not None:
+                # whole files are cut into writer batches, see insert_entries
+                chunk_size = self.chunk_size if stream else self.writer_batch_size
+                load = manifest.begin(entry.database, entry.filenames, chunk_size)
+            if entry.filenames and not (load and load.up_to_date):
+                changed.append(entry.database.name)
+            if stream:
+                self.create_handler_task(
+                    self.stream_input_data(entry), entry.database, load
+                )
+                continue
+
             wait = animation.Wait(text=f"Reading {entry.database.name} files")
             wait.start()
-            df = self.read_input_data(entry)
+            df = self.read_input_data(entry, engine=self.read_engine)
             wait.stop()
 
-            self.create_handler_task(df, entry.database)
+            self.create_handler_task(df, entry.database, load)
 
-        self._futures = [
-            self._executor.submit(task.handler, *task.args) for task in self._tasks
-        ]
-        for future in as_completed(self._futures):
-            try:
-                data = future.result()
-            except Exception as exc:
-                print("an exception occurred : %s" % (exc))
-            else:
-                print("result: %s" % (data))
+        if self.transform_workers > 0:
+            self._transform_executor = ProcessPoolExecutor(
+                max_workers=self.transform_workers
+            )
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(
+                signal.SIGINT, lambda signum, frame: self.cleanup()
+            )
+
+        try:
+            self._futures = [
+                self._executor.submit(task.handler, *task.args) for task in self._tasks
+            ]
+            databases = {
+                future: task.database.name
+                for future, task in zip(self._futures, self._tasks)
+            }
+            for future in as_completed(self._futures):
+                try:
+                    data = future.result()
+                except CancelledError:
+                    print("cancelled")
+                except Exception as exc:
+                    print("an exception occurred : %s" % (exc))
+                    report["failed"][databases[future]] = repr(exc)
+                else:
+                    print("result: %s" % (data))
+            if self.identity is not None and not self._cancelled.is_set():
+                self.apply_identities()
+            if export_dir is None and not self._cancelled.is_set():
+                # invalidates the frontend's cached search results
+                bump_data_version(self.data_version_path, changed)
+                if self.snapshot_dir is not None:
+                    self.export_snapshots(
+                        [name for name in changed if name not in report["failed"]]
+                    )
+        finally:
+            if previous_handler is not None:
+                signal.signal(signal.SIGINT, previous_handler)
+            if self._transform_executor is not None:
+                self._transform_executor.shutdown(cancel_futures=True)
+            report["cancelled"] = self._cancelled.is_set()
+            self.write_run_report(self.report_path, report)
+            print(f"Run report written to {self.report_path}")
+
+    @staticmethod
+    def write_run_report(path: Path, report: Dict[str, Any]) -> Dict[str, Any]:
+        """Complete a run report with the recorded metrics and write it as JSON.
+
+        Per database: rows read, load time and rows/s, the time spent waiting
+        on the source, transforming and writing, Bolt round trips and retries.
+        """
+        metrics = registry()
+        snapshot = metrics.snapshot()
+
+        def total(section: str, name: str, database: str, key: str) -> float:
+            return sum(
+                entry[key]
+                for entry in snapshot[section].get(name, [])
+                if entry["labels"].get("database") == database
+            )
+
+        databases = {}
+        for database in DatabaseType:
+            name = database.name
+            seconds = total("timings", "ingest_load", name, "seconds")
+            if not seconds:
+                continue
+            rows = total("counters", "ingest_rows", name, "value")
+            databases[name] = {
+                "rows": rows,
+                "seconds": seconds,
+                "rows_per_second": rows / seconds,
+                "read_seconds": total("timings", "ingest_read", name, "seconds"),
+                "transform_seconds": total(
+                    "timings", "ingest_transform", name, "seconds"
+                ),
+                "write_seconds": total("timings", "ingest_write", name, "seconds"),
+                "written_rows": total("counters", "ingest_written_rows", name, "value"),
+                "round_trips": total("counters", "neo4j_round_trips", name, "value"),
+                "retries": total("counters", "neo4j_retries", name, "value"),
+            }
+        report.update(
+            finished=time.time(),
+            elapsed=time.time() - report["started"],
+            peak_rss_bytes=peak_rss_bytes(),
+            databases=databases,
+            metrics=snapshot,
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.tmp")
+        tmp.write_text(json.dumps(report, indent=2))
+        tmp.replace(path)
+        return report
 
-    # TODO: improve shutdown method to cancel tasks and executor on SIGINT
     def cleanup(self):
-        """Shutdown the application."""
+        """Cancel the running load; called on SIGINT.
+
+        Running handlers stop after the chunk they are writing, queued ones
+        are cancelled and the executors stop accepting work.
+        """
         print("cleanup")
+        self._cancelled.set()
         for f in self._futures:
             cancelled = f.cancel()
             if cancelled:
@@ -351,7 +659,6 @@ class Parser:
             else:
                 print("not cancelled")
 
-        self._executor.shutdown(cancel_futures=True)
-
-
-parser = Parser()  # singleton instance
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._transform_executor is not None:
+            self._transform_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,158 @@
+"""Streaming ingestion pipeline Module"""
+import threading
+from collections import deque
+from pathlib import Path
+from queue import Queue
+from typing import Deque, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from bio_data_merge.model.database.schema import SourceSchema
+from bio_data_merge.processor.cache import SourceCache
+from bio_data_merge.processor.reader import apply_schema, iter_source, read_header
+
+DEFAULT_CHUNK_SIZE = 10_000
+DEFAULT_MEMORY_LIMIT = 512 * 1024 * 1024  # bytes
+
+_DONE = object()  # end-of-stream marker put on the queue by the producer
+
+
+def iter_csv_chunks(
+    filenames: List[str],
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    cache: Optional[SourceCache] = None,
+    schema: Optional[SourceSchema] = None,
+    engine: str = "c",
+) -> Iterator[pd.DataFrame]:
+    """Yield the rows of every (optionally zipped) tab-separated file chunk by chunk.
+
+    With a `schema`, only its columns are read, typed (see `processor.reader`).
+    With a `cache`, files are read from their decoded Parquet copy, which is
+    created on the first read.
+    """
+    for file in filenames:
+        if cache is not None and schema is not None:
+            columns = schema.usecols(read_header(file))
+            for chunk in cache.iter_chunks(
+                Path(file), columns=columns, chunksize=chunksize
+            ):
+                yield apply_schema(chunk, schema)
+        elif cache is not None:
+            yield from cache.iter_chunks(Path(file), chunksize=chunksize)
+        elif schema is not None:
+            yield from iter_source(file, schema, chunksize, engine=engine)
+        else:
+            yield from pd.read_csv(file, sep="\t", iterator=True, chunksize=chunksize)
+
+
+class ChunkPipeline:
+    """Read chunks on a background thread and hand them to a consumer with backpressure.
+
+    Before reading a chunk, the producer reserves the size of the previous
+    one, and waits until it fits in ``memory_limit`` bytes next to the
+    chunks that are queued or that the consumer has not finished with yet;
+    once the chunk is read, the reservation is corrected to its actual size.
+    A chunk counts as finished once the consumer asks for the next one, or,
+    when ``release_on_next`` is off, once the consumer calls `done` (chunks
+    are finished in the order they were handed out). A single chunk larger
+    than the limit is still let through on its own, so the pipeline cannot
+    deadlock.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        release_on_next: bool = True,
+    ):
+        """Initialize the pipeline."""
+        self.chunks = chunks
+        self.memory_limit = memory_limit
+        self.release_on_next = release_on_next
+        self.in_flight = 0  # bytes reserved for chunks being read, queued or in use
+        self._handed_out: Deque[int] = deque()  # sizes of the unfinished chunks
+        self._estimate = 0  # bytes reserved for the next chunk: the last one's size
+        self._queue: Queue = Queue()
+        self._budget = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _reserve(self, size: int) -> bool:
+        """Block until `size` bytes fit into the memory budget; False if stopped."""
+        with self._budget:
+            self._budget.wait_for(
+                lambda: self._stopped.is_set()
+                or self.in_flight == 0
+                or self.in_flight + size <= self.memory_limit
+            )
+            if self._stopped.is_set():
+                return False
+            self.in_flight += size
+            return True
+
+    def _release(self, size: int) -> None:
+        """Return `size` bytes to the memory budget."""
+        with self._budget:
+            self.in_flight -= size
+            self._budget.notify_all()
+
+    def _produce(self) -> None:
+        """Read chunks into the queue until the source is exhausted or stopped."""
+        try:
+            chunks = iter(self.chunks)
+            while self._reserve(self._estimate):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    self._release(self._estimate)
+                    return
+                size = int(chunk.memory_usage(deep=True).sum())
+                self._release(self._estimate - size)
+                self._queue.put((chunk, size))
+                with self._budget:
+                    self._estimate = size
+        except BaseException as exc:  # surfaced in the consumer thread
+            self._queue.put((exc, 0))
+        finally:
+            self._queue.put((_DONE, 0))
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        """Yield chunks as they are read, releasing each one when the consumer is done with it."""
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+        try:
+            while True:
+                item, size = self._queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                if not self.release_on_next:
+                    with self._budget:
+                        self._handed_out.append(size)
+                    yield item
+                    continue
+                try:
+                    yield item
+                finally:
+                    self._release(size)
+        finally:
+            self.stop()
+
+    def full(self) -> bool:
+        """True when the next chunk would not fit in the budget (the producer waits)."""
+        with self._budget:
+            return self.in_flight > 0 and (
+                self.in_flight + self._estimate > self.memory_limit
+            )
+
+    def done(self) -> None:
+        """Finish the oldest chunk handed out, when `release_on_next` is off."""
+        with self._budget:
+            size = self._handed_out.popleft()
+        self._release(size)
+
+    def stop(self) -> None:
+        """Tell the producer to stop reading ahead."""
+        self._stopped.set()
+        with self._budget:
+            self._budget.notify_all()
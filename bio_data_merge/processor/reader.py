@@ -0,0 +1,151 @@
+"""Typed source reader Module"""
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Union
+
+import numpy as np
+import pandas as pd
+
+from bio_data_merge.model.database.schema import NULL_MARKER, SourceSchema
+from bio_data_merge.optional import require_pyarrow
+from bio_data_merge.processor.settings import READ_ENGINES
+
+PathLike = Union[str, Path]
+
+
+def read_header(path: PathLike) -> List[str]:
+    """The column names of an (optionally zipped) tab-separated file."""
+    return list(pd.read_csv(path, sep="\t", nrows=0).columns)
+
+
+def apply_schema(chunk: pd.DataFrame, schema: SourceSchema) -> pd.DataFrame:
+    """Type a chunk read as plain text: project, mark nulls and build categoricals."""
+    chunk = chunk[schema.usecols(chunk.columns)].replace(NULL_MARKER, np.nan)
+    return chunk.astype(schema.dtypes(chunk.columns))
+
+
+def _text(column: pd.Series) -> pd.Series:
+    """A column as strings, nulls as the null marker."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # one string per category rather than one per row; code -1 is null
+        categories = column.cat.categories.astype(str).to_numpy(dtype=object)
+        values = np.append(categories, NULL_MARKER)[column.cat.codes.to_numpy()]
+        return pd.Series(values, index=column.index, name=column.name)
+    if column.dtype == object:
+        return column.fillna(NULL_MARKER) if column.hasnans else column
+    return column.astype(str)
+
+
+def as_text(frame: pd.DataFrame) -> pd.DataFrame:
+    """A typed frame as text again, the way the release files wrote it.
+
+    Values read as text are kept as they are, so only categoricals, nulls
+    and non-text columns are converted.
+    """
+    return pd.DataFrame(
+        {column: _text(frame[column]) for column in frame.columns},
+        index=frame.index,
+    )
+
+
+def _csv_options(schema: SourceSchema, columns: List[str]) -> dict:
+    """Keyword arguments of `pd.read_csv` reading a release with a schema."""
+    return dict(
+        sep="\t",
+        usecols=columns,
+        dtype=schema.dtypes(columns),
+        keep_default_na=False,  # e.g. the `NA` or `NULL` gene symbols are names
+        na_values=[NULL_MARKER],
+    )
+
+
+def _check_engine(engine: str) -> None:
+    """Raise on an unknown read engine."""
+    if engine not in READ_ENGINES:
+        raise ValueError(
+            f"unknown read engine {engine!r}, expected one of {READ_ENGINES}"
+        )
+
+
+@contextmanager
+def _open(path: PathLike):
+    """A binary stream of a file's content; zip archives hold a single file."""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            with archive.open(archive.namelist()[0]) as file:
+                yield file
+    else:
+        pa = require_pyarrow("the pyarrow read engine")
+        with pa.input_stream(str(path), compression="detect") as file:
+            yield file
+
+
+def _arrow_options(schema: SourceSchema, columns: List[str]) -> dict:
+    """Keyword arguments of the pyarrow CSV readers for a release with a schema."""
+    pa = require_pyarrow("the pyarrow read engine")
+    return dict(
+        parse_options=pa.csv.ParseOptions(delimiter="\t"),
+        convert_options=pa.csv.ConvertOptions(
+            include_columns=columns,
+            column_types={
+                column: pa.dictionary(pa.int32(), pa.string())
+                if dtype == "category"
+                else pa.string()
+                for column, dtype in schema.dtypes(columns).items()
+            },
+            null_values=[NULL_MARKER],
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+
+
+def read_source(
+    path: PathLike, schema: SourceSchema, engine: str = "c"
+) -> pd.DataFrame:
+    """Read a whole release file into a typed frame."""
+    _check_engine(engine)
+    columns = schema.usecols(read_header(path))
+    if engine == "pyarrow":
+        pa = require_pyarrow("the pyarrow read engine")
+        with _open(path) as file:
+            table = pa.csv.read_csv(file, **_arrow_options(schema, columns))
+        return table.to_pandas()
+    return pd.read_csv(path, **_csv_options(schema, columns))
+
+
+def iter_source(
+    path: PathLike, schema: SourceSchema, chunksize: int, engine: str = "c"
+) -> Iterator[pd.DataFrame]:
+    """Stream a release file as typed chunks of `chunksize` rows.
+
+    Both engines cut the same chunks (and index them the same way), so an
+    incremental load can be resumed with either.
+    """
+    _check_engine(engine)
+    columns = schema.usecols(read_header(path))
+    if engine != "pyarrow":
+        yield from pd.read_csv(
+            path, iterator=True, chunksize=chunksize, **_csv_options(schema, columns)
+        )
+        return
+
+    pa = require_pyarrow("the pyarrow read engine")
+    with _open(path) as file:
+        reader = pa.csv.open_csv(file, **_arrow_options(schema, columns))
+        pending: list = []  # record batches not handed out yet
+        rows = start = 0
+        for batch in reader:
+            pending.append(batch)
+            rows += batch.num_rows
+            while rows >= chunksize:
+                table = pa.Table.from_batches(pending, schema=reader.schema)
+                chunk = table.slice(0, chunksize).to_pandas()
+                yield chunk.set_axis(pd.RangeIndex(start, start + chunksize))
+                start += chunksize
+                rest = table.slice(chunksize)
+                pending, rows = rest.to_batches(), rest.num_rows
+        if rows:
+            chunk = pa.Table.from_batches(pending, schema=reader.schema).to_pandas()
+            yield chunk.set_axis(pd.RangeIndex(start, start + rows))
@@ -0,0 +1,265 @@
+"""Graph schema bootstrap Module"""
+import argparse
+import re
+import threading
+from typing import Any, Dict, List, Set, Tuple
+
+from py2neo import Graph
+
+from bio_data_merge.connection import get_graph
+from bio_data_merge.model.database.database import (
+    DatabaseType,
+    ID_FIELDS,
+    SEARCH_FIELDS,
+)
+from bio_data_merge.processor.identity import CANONICAL_ID_FIELD
+from bio_data_merge.processor.manifest import FINGERPRINT_FIELD
+from bio_data_merge.processor.search_keys import SEARCH_KEYS_FIELD
+
+DEFAULT_AWAIT_TIMEOUT = 300  # seconds
+FULLTEXT_INDEX_NAME = "interactor_search"
+COMPOSITE_DATABASE = "main"
+
+_STATEMENT_NAME_RE = re.compile(r"CREATE\s+(?:\w+\s+)?(?:CONSTRAINT|INDEX)\s+(\w+)\s")
+
+# what this process already found set up: (graph name, fulltext) per database,
+# ("system", False) for the databases themselves
+_bootstrapped: Set[Tuple[str, bool]] = set()
+_bootstrapped_lock = threading.Lock()
+
+
+class IndexesNotOnline(RuntimeError):
+    """Raised when a database still has indexes that are not ONLINE."""
+
+
+def _name(*parts: str) -> str:
+    """Schema object name, e.g. `interactor_official_symbol_text`."""
+    return "_".join(part.lower() for part in parts)
+
+
+def schema_statements(database: DatabaseType, fulltext: bool = False) -> List[str]:
+    """Cypher statements creating the constraints and indexes of a database.
+
+    * a uniqueness constraint on the ID field nodes are merged on, which
+      also backs the endpoint lookups of every relationship batch,
+    * a uniqueness constraint on `:SearchKey` keys, which name searches seek,
+    * a range index (equality, `STARTS WITH`) and a text index (`CONTAINS`,
+      `ENDS WITH`) on every searched field,
+    * an index on the `Fingerprint` of relationships, used by incremental
+      loads to delete stale rows,
+    * an index on the `Canonical_ID` cross-database lookups join on,
+    * optionally, one full-text index over all searched fields.
+
+    Every statement is idempotent.
+    """
+    id_field = ID_FIELDS[database]
+    statements = [
+        f"""
+        CREATE CONSTRAINT {_name("interactor", id_field, "unique")} IF NOT EXISTS
+        FOR (n:Interactor) REQUIRE n.{id_field} IS UNIQUE
+        """,
+        """
+        CREATE CONSTRAINT search_key_unique IF NOT EXISTS
+        FOR (k:SearchKey) REQUIRE k.key IS UNIQUE
+        """,
+        f"""
+        CREATE INDEX {_name("interacts_with", FINGERPRINT_FIELD)} IF NOT EXISTS
+        FOR ()-[r:INTERACTS_WITH]-() ON (r.{FINGERPRINT_FIELD})
+        """,
+        f"""
+        CREATE INDEX {_name("interactor", CANONICAL_ID_FIELD)} IF NOT EXISTS
+        FOR (n:Interactor) ON (n.{CANONICAL_ID_FIELD})
+        """,
+    ]
+    for field in SEARCH_FIELDS[database]:
+        if field != id_field:  # already covered by the constraint's index
+            statements.append(
+                f"""
+                CREATE INDEX {_name("interactor", field)} IF NOT EXISTS
+                FOR (n:Interactor) ON (n.{field})
+                """
+            )
+        statements.append(
+            f"""
+            CREATE TEXT INDEX {_name("interactor", field, "text")} IF NOT EXISTS
+            FOR (n:Interactor) ON (n.{field})
+            """
+        )
+    if fulltext:
+        properties = ", ".join(f"n.{field}" for field in SEARCH_FIELDS[database])
+        statements.append(
+            f"""
+            CREATE FULLTEXT INDEX {FULLTEXT_INDEX_NAME} IF NOT EXISTS
+            FOR (n:Interactor) ON EACH [{properties}]
+            """
+        )
+    return statements
+
+
+def database_statements(databases: List[str]) -> List[str]:
+    """Cypher statements creating the per-source databases and the composite one over them."""
+    return [
+        f"CREATE COMPOSITE DATABASE {COMPOSITE_DATABASE} IF NOT EXISTS",
+        *[f"CREATE DATABASE {db} IF NOT EXISTS WAIT" for db in databases],
+        *[
+            f"""
+            CREATE ALIAS {COMPOSITE_DATABASE}.{db} IF NOT EXISTS
+                FOR DATABASE {db}
+            """
+            for db in databases
+        ],
+    ]
+
+
+def init_databases(system: Graph, databases: List[str]) -> bool:
+    """Create the per-source databases and the composite one, unless they all exist.
+
+    The check is a single `SHOW` of the databases and aliases, skipped
+    entirely once it passed in this process. Returns whether anything had
+    to be created.
+    """
+    key = ("system", False)
+    if key in _bootstrapped:
+        return False
+    existing = {r["name"] for r in system.run("SHOW DATABASES YIELD name")}
+    aliases = {r["name"] for r in system.run("SHOW ALIASES FOR DATABASE YIELD name")}
+    wanted = {COMPOSITE_DATABASE, *databases}
+    wanted_aliases = {f"{COMPOSITE_DATABASE}.{db}" for db in databases}
+    created = not (wanted <= existing and wanted_aliases <= aliases)
+    if created:
+        for statement in database_statements(databases):
+            system.run(statement)
+    with _bootstrapped_lock:
+        _bootstrapped.add(key)
+    return created
+
+
+def schema_names(graph: Graph) -> Set[str]:
+    """Names of the constraints and indexes of the graph's database."""
+    names = {r["name"] for r in graph.run("SHOW CONSTRAINTS YIELD name")}
+    return names | {r["name"] for r in graph.run("SHOW INDEXES YIELD name")}
+
+
+def link_search_keys(graph: Graph, batch_size: int = 10_000) -> None:
+    """Link interactors to their `:SearchKey` nodes from their `Search_Keys` property.
+
+    The Bolt writer does this as it loads; this is for graphs created with
+    neo4j-admin import, which only stores the property.
+    """
+    graph.run(
+        f"""
+        MATCH (n:Interactor)
+        WHERE n.{SEARCH_KEYS_FIELD} IS NOT NULL
+        CALL {{
+            WITH n
+            UNWIND n.{SEARCH_KEYS_FIELD} AS key
+            MERGE (k:SearchKey {{key: key}})
+            MERGE (k)-[:KEY_OF]->(n)
+        }} IN TRANSACTIONS OF {int(batch_size)} ROWS
+        """
+    )
+
+
+def offline_indexes(graph: Graph) -> List[Dict[str, Any]]:
+    """Indexes of the graph's database that are not ONLINE yet (populating or failed)."""
+    return graph.run(
+        """
+        SHOW INDEXES YIELD name, state, populationPercent
+        WHERE state <> 'ONLINE'
+        RETURN name, state, populationPercent
+        """
+    ).data()
+
+
+def await_indexes(graph: Graph, timeout: int = DEFAULT_AWAIT_TIMEOUT) -> None:
+    """Wait for every index of the database to come ONLINE.
+
+    Raises `IndexesNotOnline` if some are still populating after `timeout`
+    seconds, or have failed.
+    """
+    try:
+        graph.run("CALL db.awaitIndexes($timeout)", timeout=timeout)
+    except Exception:  # timed out or an index failed; reported below
+        pass
+    offline = offline_indexes(graph)
+    if offline:
+        states = ", ".join(
+            f"{index['name']} ({index['state']}, {index['populationPercent']:.0f}%)"
+            for index in offline
+        )
+        raise IndexesNotOnline(f"{graph.name}: indexes not online: {states}")
+
+
+def bootstrap_schema(
+    graph: Graph,
+    database: DatabaseType,
+    fulltext: bool = False,
+    timeout: int = DEFAULT_AWAIT_TIMEOUT,
+) -> None:
+    """Create the constraints and indexes of a database and wait until they are ONLINE.
+
+    Only the statements of missing schema objects are sent, and a database
+    found complete is not checked again by this process.
+    """
+    key = (graph.name, fulltext)
+    if key in _bootstrapped:
+        return
+    existing = schema_names(graph)
+    for statement in schema_statements(database, fulltext=fulltext):
+        if _STATEMENT_NAME_RE.search(statement).group(1) not in existing:
+            graph.run(statement)
+    await_indexes(graph, timeout=timeout)
+    with _bootstrapped_lock:
+        _bootstrapped.add(key)
+
+
+def main() -> None:
+    """Create the schema of every database, or check that its indexes are ONLINE."""
+    args = argparse.ArgumentParser(
+        prog="python -m bio_data_merge.processor.schema",
+        description=(
+            "Create the constraints and indexes of the per-source databases, "
+            "e.g. after a neo4j-admin import."
+        ),
+    )
+    args.add_argument(
+        "--fulltext",
+        action="store_true",
+        help="also create a full-text index over the searched fields",
+    )
+    args.add_argument(
+        "--check",
+        action="store_true",
+        help="only report indexes that are not ONLINE; exit 1 if there are any",
+    )
+    args.add_argument(
+        "--search-keys",
+        action="store_true",
+        help="link imported interactors to their :SearchKey nodes",
+    )
+    args.add_argument("--timeout", type=int, default=DEFAULT_AWAIT_TIMEOUT)
+    options = args.parse_args()
+
+    offline = False
+    for database in DatabaseType:
+        graph = get_graph(database.name.lower())
+        try:
+            if options.check:
+                await_indexes(graph, timeout=0)
+            else:
+                bootstrap_schema(
+                    graph, database, fulltext=options.fulltext, timeout=options.timeout
+                )
+                if options.search_keys:
+                    link_search_keys(graph)
+        except IndexesNotOnline as exc:
+            print(exc)
+            offline = True
+        else:
+            print(f"{graph.name}: all indexes online")
+    if offline:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
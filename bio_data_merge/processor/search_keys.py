@@ -0,0 +1,56 @@
+"""Interactor search keys Module"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from bio_data_merge.model.database.database import DatabaseType, SEARCH_FIELDS
+
+SEARCH_KEYS_FIELD = "Search_Keys"
+
+# searched IntAct fields are PSI-MI TAB lists,
+# e.g. `psi-mi:p53_human(display_long)|uniprotkb:TP53(display_short)`
+_MITAB_FIELDS = set(SEARCH_FIELDS[DatabaseType.IntAct])
+_KEY_FIELDS = list(
+    dict.fromkeys(f for fields in SEARCH_FIELDS.values() for f in fields)
+)
+_DISPLAY_SHORT_RE = re.compile(r"(?:^|\|)[^|:]+:([^|]+?)\(display_short\)")
+_MISSING = {"", "-", "nan", "none"}
+
+
+def normalise_key(name: str) -> str:
+    """Normalise a name for exact, case-insensitive lookups."""
+    return name.strip().strip('"').strip().lower()
+
+
+def search_keys(interactors: pd.DataFrame) -> pd.Series:
+    """Normalised names each interactor can be found by, as lists aligned with the frame.
+
+    Keys are the display_short names of the IntAct identifier/alias lists
+    and the plain names of the other searched fields (BioGRID official
+    symbols, STRING preferred names).
+    """
+    parts = []
+    for field in _KEY_FIELDS:
+        if field not in interactors:
+            continue
+        values = interactors[field].astype(str)
+        if field in _MITAB_FIELDS:
+            values = values.str.extractall(_DISPLAY_SHORT_RE)[0].droplevel("match")
+        parts.append(values)
+    if not parts:
+        return pd.Series([[] for _ in range(len(interactors))], index=interactors.index)
+
+    keys = pd.concat(parts)
+    keys = keys.str.strip().str.strip('"').str.strip().str.lower()
+    keys = keys[~keys.isin(_MISSING)]
+    grouped = keys.groupby(level=0, sort=False).unique()
+    # interactors without any key are missing from `grouped` (NaN once reindexed)
+    return grouped.reindex(interactors.index).map(
+        lambda k: list(k) if isinstance(k, np.ndarray) else []
+    )
+
+
+def with_search_keys(interactors: pd.DataFrame) -> pd.DataFrame:
+    """Add the `Search_Keys` list column to a frame of interactors."""
+    return interactors.assign(**{SEARCH_KEYS_FIELD: search_keys(interactors)})
@@ -0,0 +1,108 @@
+"""Processor settings Module"""
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from bio_data_merge.data_version import DEFAULT_DATA_VERSION_PATH
+
+VALIDATION_MODES = ("off", "sample", "full")
+DEFAULT_SAMPLE_RATE = 0.01
+READ_ENGINES = ("c", "pyarrow")
+EDGE_MODES = ("raw", "aggregated", "both")
+EDGE_PAIRS = ("unordered", "ordered")
+DEFAULT_MANIFEST_PATH = ".bio_data_merge/manifest.sqlite"
+DEFAULT_RUN_REPORT_PATH = ".bio_data_merge/run_report.json"
+DEFAULT_IDENTITY_INDEX_PATH = ".bio_data_merge/identity.sqlite"
+
+
+def _path(value: Optional[str]) -> Optional[Path]:
+    """A path from the environment, None when unset or empty."""
+    return Path(value) if value else None
+
+
+def _flag(value: Optional[str], default: bool) -> bool:
+    """A boolean from the environment (`1`/`true`)."""
+    return default if value is None else value.lower() in ("1", "true")
+
+
+@dataclass
+class ParserSettings:
+    """What the processor loads and how.
+
+    Sources whose path is not set are skipped, and STRING is only loaded
+    when `load_string` is set too. Sizes left as None use the defaults of
+    the writer and the chunk pipeline.
+    """
+
+    biogrid_path: Optional[Path] = None
+    intact_path: Optional[Path] = None
+    string_path: Optional[Path] = None
+    load_string: bool = False
+    string_species: Optional[str] = None  # comma separated taxids
+    writer_batch_size: Optional[int] = None
+    chunk_size: Optional[int] = None
+    memory_limit: Optional[int] = None  # bytes
+    transform_workers: int = 0
+    writer_workers: int = 1
+    manifest_path: Path = Path(DEFAULT_MANIFEST_PATH)
+    source_cache: bool = False  # read through the cache of SOURCE_CACHE_DIR
+    fulltext_indexes: bool = False
+    resolve_identities: bool = False
+    identity_index_path: Path = Path(DEFAULT_IDENTITY_INDEX_PATH)
+    report_path: Path = Path(DEFAULT_RUN_REPORT_PATH)
+    data_version_path: Path = Path(DEFAULT_DATA_VERSION_PATH)
+    validation: str = "off"  # off, sample or full
+    validation_sample_rate: float = DEFAULT_SAMPLE_RATE
+    snapshot_dir: Optional[Path] = None  # export snapshots there after a load
+    read_engine: str = "c"  # c (pandas) or pyarrow
+    edges: str = "raw"  # raw, aggregated or both
+    edge_pairs: str = "unordered"  # how rows are grouped when aggregating
+
+    @classmethod
+    def from_env(cls) -> "ParserSettings":
+        """Read the settings from the environment (and `.env`).
+
+        Nothing is validated or opened here: a missing source only matters
+        once a load starts.
+        """
+        load_dotenv()
+        env = os.environ
+        memory_limit_mb = env.get("INGEST_MEMORY_LIMIT_MB")
+        return cls(
+            biogrid_path=_path(env.get("BIOGRID_PATH")),
+            intact_path=_path(env.get("INTACT_PATH")),
+            string_path=_path(env.get("STRING_PATH")),
+            load_string=_flag(env.get("LOAD_STRING"), False),
+            string_species=env.get("STRING_SPECIES"),
+            writer_batch_size=int(env["WRITER_BATCH_SIZE"])
+            if env.get("WRITER_BATCH_SIZE")
+            else None,
+            chunk_size=int(env["INGEST_CHUNK_SIZE"])
+            if env.get("INGEST_CHUNK_SIZE")
+            else None,
+            memory_limit=int(memory_limit_mb) * 2**20 if memory_limit_mb else None,
+            transform_workers=int(env.get("TRANSFORM_WORKERS", 0)),
+            writer_workers=int(env.get("WRITER_WORKERS", 1)),
+            manifest_path=Path(env.get("MANIFEST_PATH", DEFAULT_MANIFEST_PATH)),
+            source_cache=bool(env.get("SOURCE_CACHE_DIR")),
+            fulltext_indexes=_flag(env.get("FULLTEXT_INDEXES"), False),
+            resolve_identities=_flag(env.get("RESOLVE_IDENTITIES"), False),
+            identity_index_path=Path(
+                env.get("IDENTITY_INDEX_PATH", DEFAULT_IDENTITY_INDEX_PATH)
+            ),
+            report_path=Path(env.get("RUN_REPORT_PATH", DEFAULT_RUN_REPORT_PATH)),
+            data_version_path=Path(
+                env.get("DATA_VERSION_PATH", DEFAULT_DATA_VERSION_PATH)
+            ),
+            validation=env.get("VALIDATE_RECORDS", "off").lower(),
+            validation_sample_rate=float(
+                env.get("VALIDATE_SAMPLE_RATE", DEFAULT_SAMPLE_RATE)
+            ),
+            snapshot_dir=_path(env.get("SNAPSHOT_DIR")),
+            read_engine=env.get("INGEST_READ_ENGINE", "c").lower(),
+            edges=env.get("INGEST_EDGES", "raw").lower(),
+            edge_pairs=env.get("INGEST_EDGE_PAIRS", "unordered").lower(),
+        )
@@ -0,0 +1,416 @@
+"""Graph snapshot Module"""
+import argparse
+import json
+import mmap
+import shutil
+import time
+import uuid
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from py2neo import Graph
+
+from bio_data_merge.connection import get_graph
+from bio_data_merge.data_version import read_data_version
+from bio_data_merge.model.database.database import DatabaseType, ID_FIELDS
+from bio_data_merge.processor.id_index import IdIndex
+from bio_data_merge.processor.search_keys import SEARCH_KEYS_FIELD
+from bio_data_merge.processor.settings import ParserSettings
+
+SNAPSHOT_FORMAT = 1
+DEFAULT_SNAPSHOT_DIR = ".bio_data_merge/snapshot"
+DEFAULT_BATCH_SIZE = 50_000
+META_FILENAME = "meta.json"
+
+# Layout of a database's snapshot directory; `*.bin` files are concatenated
+# UTF-8 records (JSON objects, or search keys), sliced by their `*_offsets`.
+#
+#   nodes.bin, node_offsets     interactor properties, by interned node ID
+#   node_rank                   position of each node in ID order
+#   keys.bin, key_offsets       distinct search keys, sorted
+#   key_node_offsets, key_nodes nodes of each search key (CSR)
+#   out_offsets, out_targets    INTERACTS_WITH targets of each node (CSR),
+#   out_edges                   and the relationship of each
+#   in_offsets, in_sources,     the same, by target node
+#   in_edges
+#   edges.bin, edge_offsets     relationship properties, by edge ID
+ARRAYS = (
+    "node_offsets",
+    "node_rank",
+    "key_offsets",
+    "key_node_offsets",
+    "key_nodes",
+    "out_offsets",
+    "out_targets",
+    "out_edges",
+    "in_offsets",
+    "in_sources",
+    "in_edges",
+    "edge_offsets",
+)
+BLOBS = ("nodes", "keys", "edges")
+
+Relationship = Tuple[str, str, Dict[str, Any]]  # (source ID, target ID, properties)
+
+
+def _dumps(value: Dict[str, Any]) -> bytes:
+    """Compact JSON of a node or relationship's properties."""
+    return json.dumps(value, separators=(",", ":"), default=str).encode()
+
+
+def _id_dtype(count: int) -> type:
+    """Integer type of IDs below `count`: int32 unless that would overflow."""
+    return np.int32 if count <= np.iinfo(np.int32).max else np.int64
+
+
+def _csr(
+    sources: np.ndarray, targets: np.ndarray, size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Offsets, targets and edge IDs of the edges grouped by source node."""
+    order = np.argsort(sources, kind="stable")
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=size), out=offsets[1:])
+    return (
+        offsets,
+        targets[order].astype(_id_dtype(size)),
+        order.astype(_id_dtype(len(order))),
+    )
+
+
+class _BlobWriter:
+    """Append-only file of records, remembering where each one ends."""
+
+    def __init__(self, path: Path):
+        """Open the file."""
+        self._file = open(path, "wb")
+        self.offsets = [0]
+
+    def append(self, record: bytes) -> None:
+        """Add a record."""
+        self._file.write(record)
+        self.offsets.append(self.offsets[-1] + len(record))
+
+    def close(self) -> np.ndarray:
+        """Close the file and return the record offsets."""
+        self._file.close()
+        return np.asarray(self.offsets, dtype=np.int64)
+
+
+class SnapshotBuilder:
+    """Write the snapshot of one database from its interactors and relationships.
+
+    Nodes must be added before the relationships between them; relationships
+    with an unknown endpoint are left out. Node IDs are interned in the
+    order nodes are first added. Everything is written to a temporary
+    directory that replaces the previous snapshot in `finish`, so readers
+    never see a partial snapshot.
+    """
+
+    def __init__(self, directory: Path, database: DatabaseType):
+        """Initialize the builder."""
+        self.directory = Path(directory)
+        self.database = database
+        self.id_field = ID_FIELDS[database]
+        self.directory.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = self.directory.with_name(
+            f"{self.directory.name}.{uuid.uuid4().hex}"
+        )
+        self._tmp.mkdir()
+        self._index = IdIndex()
+        self._ids: List[str] = []
+        self._keys: List[str] = []
+        self._key_nodes: List[int] = []
+        self._sources: List[np.ndarray] = []
+        self._targets: List[np.ndarray] = []
+        self._nodes = _BlobWriter(self._tmp / "nodes.bin")
+        self._edges = _BlobWriter(self._tmp / "edges.bin")
+
+    def add_nodes(self, nodes: List[Dict[str, Any]]) -> None:
+        """Add interactors (their properties, as stored in Neo4j)."""
+        ids = [str(node[self.id_field]) for node in nodes]
+        interned, is_new = self._index.intern(ids)
+        for node, node_id, id_, new in zip(nodes, interned, ids, is_new):
+            if not new:
+                continue
+            self._nodes.append(_dumps(node))
+            self._ids.append(id_)
+            keys = node.get(SEARCH_KEYS_FIELD) or []
+            self._keys.extend(keys)
+            self._key_nodes.extend([int(node_id)] * len(keys))
+
+    def add_relationships(self, relationships: List[Relationship]) -> None:
+        """Add INTERACTS_WITH relationships between added interactors."""
+        sources = self._index.lookup(str(a) for a, _, _ in relationships)
+        targets = self._index.lookup(str(b) for _, b, _ in relationships)
+        known = (sources >= 0) & (targets >= 0)
+        for relationship, keep in zip(relationships, known):
+            if keep:
+                self._edges.append(_dumps(relationship[2]))
+        self._sources.append(sources[known])
+        self._targets.append(targets[known])
+
+    def _save(self, name: str, array: np.ndarray) -> None:
+        np.save(self._tmp / f"{name}.npy", array)
+
+    def finish(self, version: str = "") -> Path:
+        """Write the indexes and replace the previous snapshot with this one."""
+        size = len(self._ids)
+        self._save("node_offsets", self._nodes.close())
+        self._save("edge_offsets", self._edges.close())
+
+        rank = np.empty(size, dtype=_id_dtype(size))
+        rank[
+            np.argsort(np.asarray(self._ids, dtype=object), kind="stable")
+        ] = np.arange(size)
+        self._save("node_rank", rank)
+
+        keys = np.asarray(self._keys, dtype=object)
+        order = np.argsort(keys, kind="stable")
+        distinct, starts = np.unique(keys[order], return_index=True)
+        key_blob = _BlobWriter(self._tmp / "keys.bin")
+        for key in distinct:
+            key_blob.append(key.encode())
+        self._save("key_offsets", key_blob.close())
+        self._save("key_node_offsets", np.append(starts, len(keys)).astype(np.int64))
+        key_nodes = np.asarray(self._key_nodes, dtype=_id_dtype(size))[order]
+        self._save("key_nodes", key_nodes)
+
+        sources = np.concatenate([np.empty(0, dtype=np.int64), *self._sources])
+        targets = np.concatenate([np.empty(0, dtype=np.int64), *self._targets])
+        out_offsets, out_targets, out_edges = _csr(sources, targets, size)
+        self._save("out_offsets", out_offsets)
+        self._save("out_targets", out_targets)
+        self._save("out_edges", out_edges)
+        in_offsets, in_sources, in_edges = _csr(targets, sources, size)
+        self._save("in_offsets", in_offsets)
+        self._save("in_sources", in_sources)
+        self._save("in_edges", in_edges)
+
+        meta = {
+            "format": SNAPSHOT_FORMAT,
+            "database": self.database.name,
+            "id_field": self.id_field,
+            "version": version,
+            "nodes": size,
+            "edges": len(sources),
+            "keys": len(distinct),
+            "created": time.time(),
+        }
+        (self._tmp / META_FILENAME).write_text(json.dumps(meta, indent=2))
+
+        previous = self.directory.with_name(f"{self._tmp.name}.old")
+        if self.directory.exists():
+            self.directory.rename(previous)
+        self._tmp.rename(self.directory)
+        shutil.rmtree(previous, ignore_errors=True)  # open maps stay valid
+        return self.directory
+
+    def abort(self) -> None:
+        """Drop the partial snapshot."""
+        self._nodes.close()
+        self._edges.close()
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+
+def export_snapshot(
+    graph: Graph,
+    database: DatabaseType,
+    directory: Path,
+    version_path: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Path:
+    """Stream a database's interactors and relationships from Neo4j into a snapshot.
+
+    The snapshot records the database's data version, so that the frontend
+    stops using it as soon as the database is loaded again.
+    """
+    version = read_data_version(version_path, database.name)
+    builder = SnapshotBuilder(Path(directory) / database.name.lower(), database)
+    id_field = ID_FIELDS[database]
+    try:
+        cursor = graph.run("MATCH (n:Interactor) RETURN properties(n) AS n")
+        while True:
+            nodes = [record[0] for record in islice(cursor, batch_size)]
+            if not nodes:
+                break
+            builder.add_nodes(nodes)
+        cursor = graph.run(
+            f"""
+            MATCH (a:Interactor)-[r:INTERACTS_WITH]->(b:Interactor)
+            RETURN a.{id_field} AS a, b.{id_field} AS b, properties(r) AS r
+            """
+        )
+        while True:
+            rows = [tuple(record) for record in islice(cursor, batch_size)]
+            if not rows:
+                break
+            builder.add_relationships(rows)
+    except BaseException:
+        builder.abort()
+        raise
+    return builder.finish(version)
+
+
+def _map(path: Path) -> Any:
+    """Read-only memory map of a file (empty files cannot be mapped)."""
+    if path.stat().st_size == 0:
+        return b""
+    with open(path, "rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class Snapshot:
+    """Memory-mapped snapshot of one database, answering search-key lookups.
+
+    Nothing is read up front: pages are loaded on access and shared through
+    the page cache by every process mapping the same snapshot.
+    """
+
+    def __init__(self, directory: Path):
+        """Map a snapshot directory."""
+        self.directory = Path(directory)
+        self.meta = json.loads((self.directory / META_FILENAME).read_text())
+        if self.meta["format"] != SNAPSHOT_FORMAT:
+            raise ValueError(f"{directory}: unsupported snapshot format")
+        for name in ARRAYS:
+            mapped = np.load(self.directory / f"{name}.npy", mmap_mode="r")
+            # a plain view of the map: indexing a `np.memmap` is much slower
+            setattr(self, name, mapped.view(np.ndarray))
+        self._blobs = {name: _map(self.directory / f"{name}.bin") for name in BLOBS}
+
+    @property
+    def version(self) -> str:
+        """Data version of the database when the snapshot was exported."""
+        return self.meta["version"]
+
+    def __len__(self) -> int:
+        return self.meta["nodes"]
+
+    def _record(self, blob: str, offsets: np.ndarray, i: int) -> bytes:
+        return self._blobs[blob][offsets[i] : offsets[i + 1]]
+
+    def node(self, i: int) -> Dict[str, Any]:
+        """Properties of a node."""
+        return json.loads(self._record("nodes", self.node_offsets, i))
+
+    def edge(self, i: int) -> Dict[str, Any]:
+        """Properties of a relationship."""
+        return json.loads(self._record("edges", self.edge_offsets, i))
+
+    def find_key(self, key: str) -> int:
+        """Position of a search key, -1 if no node has it (binary search)."""
+        wanted = key.encode()
+        low, high = 0, self.meta["keys"]
+        while low < high:
+            middle = (low + high) // 2
+            if self._record("keys", self.key_offsets, middle) < wanted:
+                low = middle + 1
+            else:
+                high = middle
+        if (
+            low < self.meta["keys"]
+            and self._record("keys", self.key_offsets, low) == wanted
+        ):
+            return low
+        return -1
+
+    def matches(self, key: str) -> np.ndarray:
+        """Nodes with a search key."""
+        i = self.find_key(key)
+        if i < 0:
+            return np.empty(0, dtype=self.key_nodes.dtype)
+        nodes = self.key_nodes[self.key_node_offsets[i] : self.key_node_offsets[i + 1]]
+        return np.unique(nodes)
+
+    def targets(self, i: int) -> np.ndarray:
+        """Nodes a node interacts with (one entry per relationship)."""
+        return self.out_targets[self.out_offsets[i] : self.out_offsets[i + 1]]
+
+    def sources(self, i: int) -> np.ndarray:
+        """Nodes interacting with a node (one entry per relationship)."""
+        return self.in_sources[self.in_offsets[i] : self.in_offsets[i + 1]]
+
+    def neighbourhoods(self, key: str) -> List[Tuple[int, List[int]]]:
+        """(interactor, others) pairs of a search, ordered by the interactor's ID.
+
+        Same rows as the Cypher search: every matching node with the nodes
+        it interacts with, then every other node with the matching nodes it
+        interacts with (found through the incoming adjacency of the matches).
+        Neighbourhoods are small, so plain lists beat vectorizing here.
+        """
+        matched = self.matches(key).tolist()
+        wanted = set(matched)
+        rows: Dict[int, List[int]] = {}
+        for node in matched:
+            targets = self.targets(node).tolist()
+            if targets:
+                rows[node] = targets
+            for caller in self.sources(node).tolist():
+                if caller not in wanted:
+                    rows.setdefault(caller, []).append(node)
+        return sorted(rows.items(), key=lambda row: self.node_rank[row[0]])
+
+    def search(
+        self,
+        key: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        neighbours: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Search records, shaped like those of the Cypher search."""
+        rows = self.neighbourhoods(key)
+        end = None if limit is None else offset + limit
+        for i, others in rows[offset:end]:
+            shown = others if neighbours is None else others[:neighbours]
+            yield {
+                "interactor_a": self.node(i),
+                "interactor_b": [self.node(other) for other in shown],
+                "degree": len(others),
+            }
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """Export the snapshots of the per-source databases."""
+    settings = ParserSettings.from_env()  # loads `.env` before the defaults are read
+    args = argparse.ArgumentParser(
+        prog="python -m bio_data_merge.processor snapshot",
+        description=(
+            "Export memory-mapped snapshots of the per-source databases, "
+            "searched by the frontend instead of Neo4j while they are current."
+        ),
+    )
+    args.add_argument(
+        "--db",
+        dest="databases",
+        action="append",
+        choices=[database.name for database in DatabaseType],
+        help="database to export (repeatable; default: all)",
+    )
+    args.add_argument(
+        "--out",
+        metavar="DIR",
+        type=Path,
+        default=settings.snapshot_dir or Path(DEFAULT_SNAPSHOT_DIR),
+    )
+    args.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    options = args.parse_args(argv)
+
+    databases = [DatabaseType[name] for name in options.databases or []]
+    for database in databases or list(DatabaseType):
+        path = export_snapshot(
+            get_graph(database.name.lower()),
+            database,
+            options.out,
+            settings.data_version_path,
+            options.batch_size,
+        )
+        meta = json.loads((path / META_FILENAME).read_text())
+        print(
+            f"{database.name}: {meta['nodes']} nodes, {meta['edges']} edges -> {path}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""STRING dump loader Module"""
+import gzip
+import re
+from pathlib import Path
+from typing import Iterator, List, Optional, Set
+
+import pandas as pd
+
+from bio_data_merge.model.database.database import DatabaseType, ID_FIELDS
+from bio_data_merge.processor.display_fields import with_display_fields
+from bio_data_merge.processor.id_index import IdIndex
+from bio_data_merge.processor.manifest import FINGERPRINT_FIELD
+from bio_data_merge.processor.search_keys import with_search_keys
+from bio_data_merge.processor.transform import RecordBatch, intern_batch
+
+PROTEINS_TABLE = "items.proteins"
+LINKS_TABLE = "network.node_node_links"
+
+# source files in the order they have to be loaded: proteins before their links
+SCHEMA_FILES = ["items_schema", "network_schema"]
+# source files we have no mapping for (per-channel evidence of the links)
+SKIPPED_SCHEMA_FILES = ["evidence_schema"]
+
+# items.proteins column -> Interactor property
+PROTEIN_FIELDS = {
+    "protein_id": "STRING_ID",
+    "protein_external_id": "External_ID",
+    "species_id": "Taxid",
+    "preferred_name": "Preferred_Name",
+    "protein_size": "Protein_Size",
+    "annotation": "Annotation",
+}
+
+# network.node_node_links column -> INTERACTS_WITH property
+LINK_FIELDS = {
+    "combined_score": "Combined_Score",
+    "evidence_scores": "Evidence_Scores",
+}
+
+_COPY_RE = re.compile(r"^COPY ([\w.\"]+) \((.*)\) FROM stdin;$")
+_ESCAPE_RE = re.compile(r"\\(.)")
+_ESCAPES = {"t": "\t", "n": "\n", "r": "\r", "\\": "\\"}
+
+
+def _unescape(value: str) -> Optional[str]:
+    """Decode a value of PostgreSQL's COPY text format."""
+    if value == "\\N":
+        return None
+    if "\\" not in value:
+        return value
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), value)
+
+
+def select_files(filenames: List[str]) -> List[str]:
+    """Order the STRING dumps for loading, dropping the ones we do not map (evidence)."""
+    selected = []
+    for schema in SCHEMA_FILES:
+        selected += sorted(f for f in filenames if Path(f).name.startswith(schema))
+    for filename in sorted(filenames):
+        if any(Path(filename).name.startswith(s) for s in SKIPPED_SCHEMA_FILES):
+            print(f"STRING: skipping {filename}, the evidence tables are not loaded")
+    return selected
+
+
+def iter_copy_blocks(
+    filename: str, tables: Optional[Set[str]] = None, chunksize: int = 10_000
+) -> Iterator[pd.DataFrame]:
+    """Stream the `COPY ... FROM stdin` blocks of a gzipped plain-SQL dump as DataFrames.
+
+    Only the given tables are decoded (all of them when `tables` is None).
+    Each chunk carries its table name in ``chunk.attrs["table"]``.
+    """
+    with gzip.open(filename, "rt", encoding="utf-8") as dump:
+        for line in dump:
+            match = _COPY_RE.match(line.rstrip("\n"))
+            if match is None:
+                continue
+            table = match.group(1).replace('"', "")
+            columns = [c.strip().strip('"') for c in match.group(2).split(",")]
+            wanted = tables is None or table in tables
+            rows: List[List[Optional[str]]] = []
+            for row in dump:
+                if row == "\\.\n":
+                    break
+                if wanted:
+                    rows.append([_unescape(v) for v in row.rstrip("\n").split("\t")])
+                    if len(rows) >= chunksize:
+                        yield _frame(rows, columns, table)
+                        rows = []
+            if rows:
+                yield _frame(rows, columns, table)
+
+
+def _frame(
+    rows: List[List[Optional[str]]], columns: List[str], table: str
+) -> pd.DataFrame:
+    """Build a chunk of a COPY block, tagged with its table."""
+    chunk = pd.DataFrame(rows, columns=columns)
+    chunk.attrs["table"] = table
+    return chunk
+
+
+def iter_string_chunks(
+    filenames: List[str],
+    chunksize: int = 10_000,
+    species: Optional[Set[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """Stream protein chunks, then protein-link chunks, from the STRING dumps.
+
+    The links table lists every pair in both directions; only the row with
+    the lower protein ID first is kept. With `species` (NCBI taxids), only
+    those organisms' proteins and the links between them are kept.
+    """
+    kept = IdIndex()  # protein IDs passing the species filter
+    for filename in select_files(filenames):
+        for chunk in iter_copy_blocks(
+            filename, {PROTEINS_TABLE, LINKS_TABLE}, chunksize=chunksize
+        ):
+            if chunk.attrs["table"] == LINKS_TABLE:
+                chunk = chunk[
+                    chunk["node_id_a"].astype(int) < chunk["node_id_b"].astype(int)
+                ]
+            if species is not None:
+                if chunk.attrs["table"] == PROTEINS_TABLE:
+                    chunk = chunk[chunk["species_id"].isin(species)]
+                    kept.intern(chunk["protein_id"])
+                else:
+                    chunk = chunk[
+                        kept.contains(chunk["node_id_a"])
+                        & kept.contains(chunk["node_id_b"])
+                    ]
+            yield chunk
+
+
+class StringTransformer:
+    """Transform STRING protein and link chunks into record batches."""
+
+    id_field_name = ID_FIELDS[DatabaseType.STRING]
+
+    def __init__(self, endpoint_ids: bool = True):
+        """Initialize the transformer; see `FrameTransformer` for `endpoint_ids`."""
+        self.index = IdIndex()  # proteins already emitted, interned to integer IDs
+        self.endpoint_ids = endpoint_ids
+
+    def transform(self, input_df: pd.DataFrame) -> RecordBatch:
+        """Transform a chunk of either table; proteins become nodes, links relationships."""
+        if input_df.attrs.get("table") == PROTEINS_TABLE:
+            nodes = (
+                input_df[list(PROTEIN_FIELDS)]
+                .rename(columns=PROTEIN_FIELDS)
+                .astype(str)
+                .drop_duplicates(subset=self.id_field_name)
+            )
+            nodes = with_display_fields(with_search_keys(nodes))
+            batch = RecordBatch(nodes=nodes.to_dict("records"))
+        else:
+            fields = [c for c in [*LINK_FIELDS, FINGERPRINT_FIELD] if c in input_df]
+            props = input_df[fields].rename(columns=LINK_FIELDS).astype(str)
+            batch = RecordBatch(
+                relationships=[
+                    {"a": a, "b": b, "properties": properties}
+                    for a, b, properties in zip(
+                        input_df["node_id_a"].astype(str),
+                        input_df["node_id_b"].astype(str),
+                        props.to_dict("records"),
+                    )
+                ]
+            )
+        return intern_batch(self.index, self.id_field_name, batch, self.endpoint_ids)
+
+
+def parse_species(value: Optional[str]) -> Optional[Set[str]]:
+    """Parse a comma separated list of taxids, e.g. `9606,10090`."""
+    if not value:
+        return None
+    return {taxid.strip() for taxid in value.split(",") if taxid.strip()}
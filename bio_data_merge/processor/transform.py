@@ -0,0 +1,179 @@
+"""Columnar transformation Module"""
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bio_data_merge.processor.display_fields import with_display_fields
+from bio_data_merge.processor.id_index import IdIndex
+from bio_data_merge.processor.reader import as_text
+from bio_data_merge.processor.search_keys import with_search_keys
+
+
+def normalise_header(header: str) -> str:
+    """Turn an interactor column header into a side-agnostic property name."""
+    # preprocess header into workable field name
+    h = (
+        header.replace(" ", "_")
+        .replace("(", "")
+        .replace(")", "")
+        .replace("-", "_")
+        .replace(".", "")
+        .replace("#", "")
+        .replace("::", "")
+    )
+
+    # remove `A` and `B from labels to make them agnostic
+    new_h = re.sub(r"_(I|i)nteractor_(A|B)$", "", h)
+    return re.sub(r"_participant_(A|B)$", "", new_h)
+
+
+def normalise_property_header(header: str) -> str:
+    """Turn an interaction column header into a relationship property name."""
+    return header.replace(" ", "_")
+
+
+@dataclass
+class ColumnLayout:
+    """Source columns of a file grouped by role, mapped to their property names."""
+
+    a_fields: Dict[str, str]
+    b_fields: Dict[str, str]
+    property_fields: Dict[str, str]
+
+    @classmethod
+    def from_columns(cls, columns: Sequence[str]) -> "ColumnLayout":
+        """Split the headers of a file into interactor A, interactor B and interaction fields."""
+        # Check for fields that end with ` A` -> interactor properties for interactor A
+        # check for fields that end with ` B`  -> interactor properties for interactor B
+        # the rest are interaction properties
+        a_fields: Dict[str, str] = {}
+        b_fields: Dict[str, str] = {}
+        property_fields: Dict[str, str] = {}
+        for header in columns:
+            if header.endswith(" A"):
+                a_fields[header] = normalise_header(header)
+            elif header.endswith(" B"):
+                b_fields[header] = normalise_header(header)
+            else:
+                property_fields[header] = normalise_property_header(header)
+        return cls(a_fields, b_fields, property_fields)
+
+
+@dataclass
+class RecordBatch:
+    """Nodes and relationships ready to be handed to a writer."""
+
+    nodes: List[Dict[str, Any]] = field(default_factory=list)
+    relationships: List[Dict[str, Any]] = field(default_factory=list)
+    node_ids: List[int] = field(default_factory=list)  # interned IDs of `nodes`
+
+    def __len__(self) -> int:
+        return len(self.nodes) + len(self.relationships)
+
+
+def intern_batch(
+    index: IdIndex, id_field_name: str, batch: RecordBatch, endpoint_ids: bool = True
+) -> RecordBatch:
+    """Keep the nodes of a batch that are new to the index and attach integer IDs.
+
+    Relationships are all kept. With `endpoint_ids`, those whose endpoints
+    are both in the index get their integer IDs; the others (e.g. links to
+    proteins loaded by an earlier run, in an incremental load) are left for
+    the writer to resolve by source ID.
+    """
+    ids, is_new = index.intern(node[id_field_name] for node in batch.nodes)
+    nodes = [node for node, new in zip(batch.nodes, is_new) if new]
+    if not endpoint_ids:
+        return RecordBatch(nodes, batch.relationships, ids[is_new].tolist())
+
+    a_ids = index.lookup(r["a"] for r in batch.relationships)
+    b_ids = index.lookup(r["b"] for r in batch.relationships)
+    for relationship, a_id, b_id in zip(batch.relationships, a_ids, b_ids):
+        if a_id >= 0 and b_id >= 0:
+            relationship["a_id"] = int(a_id)
+            relationship["b_id"] = int(b_id)
+    return RecordBatch(nodes, batch.relationships, ids[is_new].tolist())
+
+
+class FrameTransformer:
+    """Transform interaction DataFrames into record batches, one chunk at a time.
+
+    The column layout is computed once per file and interactors are
+    deduplicated on ``id_field_name`` across every chunk fed to the same
+    transformer, keeping the first occurrence in row order (A before B).
+    Relationship endpoints only get their interned IDs with `endpoint_ids`,
+    for writers keying relationships on them (see `interned_ids`).
+    """
+
+    def __init__(self, id_field_name: str, endpoint_ids: bool = True):
+        """Initialize the transformer."""
+        self.id_field_name = id_field_name
+        self.endpoint_ids = endpoint_ids
+        self.index = IdIndex()  # interactors already emitted, interned to integer IDs
+        self._layouts: Dict[Tuple[str, ...], ColumnLayout] = {}
+
+    def layout(self, columns: Sequence[str]) -> ColumnLayout:
+        """Return the (cached) column layout for the given headers."""
+        key = tuple(columns)
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = self._layouts[key] = ColumnLayout.from_columns(key)
+        return layout
+
+    def split(
+        self, input_df: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Split a chunk into stringified interactor A, interactor B and property frames."""
+        layout = self.layout(input_df.columns)
+        strings = as_text(input_df)
+        int_a = strings[list(layout.a_fields)].rename(columns=layout.a_fields)
+        int_b = strings[list(layout.b_fields)].rename(columns=layout.b_fields)
+        props = strings[list(layout.property_fields)].rename(
+            columns=layout.property_fields
+        )
+        return int_a, int_b, props
+
+    def chunk_interactors(
+        self, int_a: pd.DataFrame, int_b: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Return the distinct interactors of a chunk, in row order (A before B)."""
+        rows = np.arange(len(int_a))
+        interactors = pd.concat(
+            [int_a.set_axis(rows * 2), int_b.set_axis(rows * 2 + 1)]
+        ).sort_index(kind="stable")
+        return interactors.drop_duplicates(subset=self.id_field_name)
+
+    def transform_chunk(self, input_df: pd.DataFrame) -> RecordBatch:
+        """Transform one chunk on its own, without deduplicating against earlier chunks.
+
+        This only depends on the chunk, so it can run in a worker process.
+        """
+        int_a, int_b, props = self.split(input_df)
+        interactors = with_display_fields(
+            with_search_keys(self.chunk_interactors(int_a, int_b))
+        )
+
+        relationships = [
+            {"a": a, "b": b, "properties": properties}
+            for a, b, properties in zip(
+                int_a[self.id_field_name],
+                int_b[self.id_field_name],
+                props.to_dict("records"),
+            )
+        ]
+        return RecordBatch(interactors.to_dict("records"), relationships)
+
+    def deduplicate(self, batch: RecordBatch) -> RecordBatch:
+        """Drop the nodes of a batch that an earlier batch already emitted.
+
+        Surviving nodes and relationship endpoints get their interned integer
+        IDs, in `node_ids` and the `a_id`/`b_id` keys respectively.
+        """
+        return intern_batch(self.index, self.id_field_name, batch, self.endpoint_ids)
+
+    def transform(self, input_df: pd.DataFrame) -> RecordBatch:
+        """Transform one chunk of interactions into nodes and relationships."""
+        return self.deduplicate(self.transform_chunk(input_df))
@@ -0,0 +1,118 @@
+"""Record validation Module"""
+from typing import Any, Dict, List
+
+from pydantic import ValidationError
+
+from bio_data_merge.metrics import registry
+from bio_data_merge.model.database.database import DatabaseType
+from bio_data_merge.model.interactions.interaction import Interaction
+from bio_data_merge.model.interactions.interactor import Interactor
+from bio_data_merge.processor.settings import DEFAULT_SAMPLE_RATE, VALIDATION_MODES
+from bio_data_merge.processor.transform import RecordBatch
+
+
+class RecordValidationError(ValueError):
+    """A record written during ingest does not match the interaction models."""
+
+    def __init__(self, database: DatabaseType, kind: str, record: Dict, reason: str):
+        """Initialize the error with the offending record."""
+        super().__init__(f"{database.name}: invalid {kind} {record!r}: {reason}")
+        self.database = database
+        self.kind = kind
+        self.record = record
+
+
+class RecordValidator:
+    """Check the records of a database against the pydantic interaction models.
+
+    Ingest builds plain dicts in column batches; the models are only
+    instantiated here. With `sample`, one record in every `1 / sample_rate`
+    is checked (spread over batches), with `full` every record is.
+    """
+
+    def __init__(
+        self,
+        database: DatabaseType,
+        id_field_name: str,
+        mode: str = "full",
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+    ):
+        """Initialize the validator."""
+        if mode not in VALIDATION_MODES:
+            raise ValueError(
+                f"unknown validation mode {mode!r}, expected one of {VALIDATION_MODES}"
+            )
+        if not 0 < sample_rate <= 1:
+            raise ValueError("the sample rate must be in (0, 1]")
+        self.database = database
+        self.id_field_name = id_field_name
+        self.mode = mode
+        self.stride = 1 if mode == "full" else round(1 / sample_rate)
+        self._seen = {"node": 0, "relationship": 0}
+
+    def _sample(self, kind: str, records: List[Dict[str, Any]]) -> List[Dict]:
+        """The records of a batch to check, continuing the stride of earlier batches."""
+        first = -self._seen[kind] % self.stride
+        self._seen[kind] += len(records)
+        return records[first :: self.stride]
+
+    def check_node(self, node: Dict[str, Any]) -> None:
+        """Validate an interactor node; it must also carry its database's ID."""
+        try:
+            Interactor(**node)
+        except (TypeError, ValidationError) as exc:
+            raise RecordValidationError(self.database, "node", node, str(exc))
+        node_id = node.get(self.id_field_name)
+        if not isinstance(node_id, str) or not node_id:
+            reason = f"missing {self.id_field_name}"
+            raise RecordValidationError(self.database, "node", node, reason)
+
+    def check_relationship(self, relationship: Dict[str, Any]) -> None:
+        """Validate an interaction between two interactors."""
+        try:
+            Interaction(
+                interactor_a=relationship["a"],
+                interactor_b=relationship["b"],
+                interaction_properties=relationship["properties"],
+            )
+        except (KeyError, ValidationError) as exc:
+            raise RecordValidationError(
+                self.database, "relationship", relationship, str(exc)
+            )
+
+    def validate(self, batch: RecordBatch) -> None:
+        """Validate (a sample of) a batch, raising on the first invalid record."""
+        if self.mode == "off":
+            return
+        nodes = self._sample("node", batch.nodes)
+        relationships = self._sample("relationship", batch.relationships)
+        for node in nodes:
+            self.check_node(node)
+        for relationship in relationships:
+            self.check_relationship(relationship)
+        metrics = registry()
+        database = self.database.name
+        metrics.count("ingest_validated", len(nodes), database=database, kind="node")
+        metrics.count(
+            "ingest_validated",
+            len(relationships),
+            database=database,
+            kind="relationship",
+        )
+
+
+class ValidatingWriter:
+    """Writer wrapper validating the batches written through it."""
+
+    def __init__(self, writer: Any, validator: RecordValidator):
+        """Initialize the wrapper."""
+        self.writer = writer
+        self.validator = validator
+
+    def write_batch(self, batch: RecordBatch) -> None:
+        """Validate a batch, then write it."""
+        self.validator.validate(batch)
+        self.writer.write_batch(batch)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.writer, name)
@@ -0,0 +1,303 @@
+"""Batched graph writer Module"""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from py2neo import Graph
+from py2neo.errors import ConnectionBroken, ConnectionUnavailable, TransientError
+
+from bio_data_merge.metrics import registry
+from bio_data_merge.processor.aggregate import (
+    EVIDENCE_COUNT_FIELD,
+    EVIDENCE_TYPE,
+    aggregate,
+)
+from bio_data_merge.processor.manifest import FINGERPRINT_FIELD
+from bio_data_merge.processor.search_keys import SEARCH_KEYS_FIELD
+from bio_data_merge.processor.transform import RecordBatch
+
+DEFAULT_BATCH_SIZE = 10_000
+DEFAULT_MAX_RETRIES = 5
+
+RETRYABLE_ERRORS = (TransientError, ConnectionBroken, ConnectionUnavailable)
+# errors after which a commit may or may not have gone through
+CONNECTION_ERRORS = (ConnectionBroken, ConnectionUnavailable)
+
+
+@dataclass
+class WriterStats:
+    """Running totals of what a writer has sent to the graph."""
+
+    nodes: int = 0
+    relationships: int = 0
+    batches: int = 0
+    retries: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the writer was created."""
+        return time.monotonic() - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        """Combined node and relationship throughput."""
+        elapsed = self.elapsed
+        if elapsed == 0:
+            return 0.0
+        return (self.nodes + self.relationships) / elapsed
+
+    def __str__(self) -> str:
+        return (
+            f"{self.nodes} nodes, {self.relationships} relationships in "
+            f"{self.batches} batches ({self.rows_per_second:,.0f} rows/s, "
+            f"{self.retries} retries)"
+        )
+
+
+class BatchWriter:
+    """Buffer interactor nodes and relationships and write them with UNWIND.
+
+    Nodes are merged on ``id_field_name`` so a batch can be safely retried;
+    relationships look their endpoints up by the same field. Each node is
+    linked to a `:SearchKey` node per entry of its `Search_Keys`. Pending nodes are
+    always flushed before pending relationships, so a relationship never
+    references a node that has not been written yet.
+
+    With `edges` other than `raw`, the relationships of each flush are
+    aggregated per interactor pair (see `aggregate.EvidenceAggregator`) and
+    merged into the pair's `INTERACTS_WITH` relationship, appending their
+    evidence; with `both`, every row is also written as an
+    `INTERACTION_EVIDENCE` relationship.
+    """
+
+    interned_ids = False  # relationships are matched on the source IDs
+
+    def __init__(
+        self,
+        graph: Graph,
+        id_field_name: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        database: str = "",
+        edges: str = "raw",
+        ordered_pairs: bool = False,
+    ):
+        """Initialize the writer; `database` labels its metrics."""
+        self.graph = graph
+        self.id_field_name = id_field_name
+        self.batch_size = batch_size
+        self.edges = edges
+        self.ordered_pairs = ordered_pairs
+        self.max_retries = max_retries
+        self.stats = WriterStats()
+        self.database = database
+        self._nodes: List[Dict[str, Any]] = []
+        self._relationships: List[Dict[str, Any]] = []
+
+    @property
+    def node_statement(self) -> str:
+        """Cypher statement used to write a batch of nodes."""
+        return f"""
+        UNWIND $rows AS row
+        MERGE (n:Interactor {{{self.id_field_name}: row.{self.id_field_name}}})
+        SET n += row
+        WITH n, row
+        UNWIND row.{SEARCH_KEYS_FIELD} AS key
+        MERGE (k:SearchKey {{key: key}})
+        MERGE (k)-[:KEY_OF]->(n)
+        """
+
+    def create_statement(self, relationship_type: str = "INTERACTS_WITH") -> str:
+        """Cypher statement used to write a batch of relationships, one per row."""
+        return f"""
+        UNWIND $rows AS row
+        MATCH (a:Interactor {{{self.id_field_name}: row.a}})
+        MATCH (b:Interactor {{{self.id_field_name}: row.b}})
+        CREATE (a)-[r:{relationship_type}]->(b)
+        SET r = row.properties
+        """
+
+    @property
+    def relationship_statement(self) -> str:
+        """Cypher statement used to write a batch of relationships."""
+        return self.create_statement()
+
+    @property
+    def fingerprint_statement(self) -> str:
+        """Cypher statement used to write relationships of an incremental load.
+
+        They are merged on their row fingerprint, so a chunk written again
+        (after a crash before its checkpoint) does not duplicate them.
+        """
+        return f"""
+        UNWIND $rows AS row
+        MATCH (a:Interactor {{{self.id_field_name}: row.a}})
+        MATCH (b:Interactor {{{self.id_field_name}: row.b}})
+        MERGE (a)-[r:INTERACTS_WITH {{{FINGERPRINT_FIELD}: row.properties.{FINGERPRINT_FIELD}}}]->(b)
+        SET r = row.properties
+        """
+
+    def aggregate_statement(self, keys: Sequence[str]) -> str:
+        """Cypher statement merging aggregated relationships with list properties `keys`.
+
+        Evidence already on a pair's relationship is kept and appended to.
+        """
+        appends = "".join(
+            f",\n            r.{name} = coalesce(r.{name}, []) + row.properties.{name}"
+            for name in (f"`{key.replace('`', '``')}`" for key in keys)
+        )
+        count = EVIDENCE_COUNT_FIELD
+        return f"""
+        UNWIND $rows AS row
+        MATCH (a:Interactor {{{self.id_field_name}: row.a}})
+        MATCH (b:Interactor {{{self.id_field_name}: row.b}})
+        MERGE (a)-[r:INTERACTS_WITH]->(b)
+        SET r.{count} = coalesce(r.{count}, 0) + row.properties.{count}{appends}
+        """
+
+    @property
+    def delete_statement(self) -> str:
+        """Cypher statement used to delete relationships by row fingerprint."""
+        return f"""
+        UNWIND $rows AS fingerprint
+        MATCH ()-[r:INTERACTS_WITH {{{FINGERPRINT_FIELD}: fingerprint}}]->()
+        DELETE r
+        """
+
+    def add_node(self, properties: Dict[str, Any]) -> None:
+        """Queue an interactor node; flushes when the batch is full."""
+        self._nodes.append(properties)
+        if len(self._nodes) >= self.batch_size:
+            self.flush_nodes()
+
+    def add_relationship(self, a: str, b: str, properties: Dict[str, Any]) -> None:
+        """Queue an `INTERACTS_WITH` relationship between two interactor IDs."""
+        self._relationships.append({"a": a, "b": b, "properties": properties})
+        if len(self._relationships) >= self.batch_size:
+            self.flush_relationships()
+
+    def write_batch(self, batch: RecordBatch) -> None:
+        """Queue every node and relationship of a transformed batch."""
+        for node in batch.nodes:
+            self.add_node(node)
+        for relationship in batch.relationships:
+            self.add_relationship(
+                relationship["a"], relationship["b"], relationship["properties"]
+            )
+
+    def flush_nodes(self) -> None:
+        """Write all pending nodes."""
+        if self._nodes:
+            self._write(self.node_statement, self._nodes, "nodes", idempotent=True)
+            self.stats.nodes += len(self._nodes)
+            self._nodes = []
+
+    def flush_relationships(self) -> None:
+        """Write all pending relationships, after any pending nodes."""
+        self.flush_nodes()
+        if not self._relationships:
+            return
+        if self.edges == "raw":
+            merged = FINGERPRINT_FIELD in self._relationships[0]["properties"]
+            statement = (
+                self.fingerprint_statement if merged else self.relationship_statement
+            )
+            self._write(
+                statement, self._relationships, "relationships", idempotent=merged
+            )
+            self.stats.relationships += len(self._relationships)
+        else:
+            pairs = aggregate(self._relationships, ordered=self.ordered_pairs)
+            keys = sorted(
+                {key for pair in pairs for key in pair["properties"]}
+                - {EVIDENCE_COUNT_FIELD}
+            )
+            self._write(self.aggregate_statement(keys), pairs, "relationships")
+            self.stats.relationships += len(pairs)
+        if self.edges == "both":
+            self._write(
+                self.create_statement(EVIDENCE_TYPE), self._relationships, "evidence"
+            )
+            self.stats.relationships += len(self._relationships)
+        self._relationships = []
+
+    def delete_relationships(self, fingerprints: List[int]) -> None:
+        """Delete the relationships written for the given row fingerprints."""
+        self.flush()
+        for start in range(0, len(fingerprints), self.batch_size):
+            batch = fingerprints[start : start + self.batch_size]
+            # stored as text, like every other relationship property
+            self._write(
+                self.delete_statement,
+                [str(fp) for fp in batch],
+                "delete",
+                idempotent=True,
+            )
+
+    def flush(self) -> None:
+        """Write everything that is still buffered."""
+        self.flush_relationships()
+
+    def close(self) -> WriterStats:
+        """Flush the remaining rows and return the final stats."""
+        self.flush()
+        return self.stats
+
+    def _write(
+        self,
+        statement: str,
+        rows: List[Dict[str, Any]],
+        kind: str,
+        idempotent: bool = False,
+    ) -> None:
+        """Run one statement for the batch in a single transaction, retrying transient errors.
+
+        A connection lost while committing leaves it unknown whether the
+        rows were written, so the batch is only sent again when running
+        the statement twice is harmless (`idempotent`, e.g. MERGE); writes
+        that CREATE relationships or append evidence raise instead. Each
+        attempt is a Bolt round trip, timed under `ingest_write`.
+        """
+        metrics = registry()
+        labels = {"database": self.database, "kind": kind}
+        attempt = 0
+        while True:
+            tx = self.graph.begin()
+            started = time.perf_counter()
+            committing = False
+            try:
+                tx.run(statement, rows=rows)
+                committing = True
+                self.graph.commit(tx)
+            except RETRYABLE_ERRORS as error:
+                self._rollback(tx)
+                metrics.count("neo4j_round_trips", **labels)
+                if (
+                    committing
+                    and not idempotent
+                    and isinstance(error, CONNECTION_ERRORS)
+                ):
+                    raise
+                metrics.count("neo4j_retries", **labels)
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                self.stats.retries += 1
+                time.sleep(min(2**attempt * 0.1, 10))
+            except Exception:
+                self._rollback(tx)
+                raise
+            else:
+                metrics.observe("ingest_write", time.perf_counter() - started, **labels)
+                metrics.count("neo4j_round_trips", **labels)
+                metrics.count("ingest_written_rows", len(rows), **labels)
+                self.stats.batches += 1
+                return
+
+    def _rollback(self, tx: Optional[Any]) -> None:
+        """Roll back a failed transaction, ignoring errors on a dead connection."""
+        try:
+            self.graph.rollback(tx)
+        except Exception:  # connection may already be gone
+            pass
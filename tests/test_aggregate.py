@@ -0,0 +1,47 @@
+"""Interaction evidence aggregation tests"""
+from bio_data_merge.processor.aggregate import EVIDENCE_COUNT_FIELD, aggregate
+
+
+def relationship(a, b, row, ids=None):
+    """A raw relationship, with interned IDs when given."""
+    result = {"a": a, "b": b, "properties": {"Row": row, "Score": f"s{row}"}}
+    if ids is not None:
+        result["a_id"], result["b_id"] = ids
+    return result
+
+
+def test_unordered_pairs_collapse_with_aligned_lists():
+    """A–B and B–A rows become one relationship, lower ID first, in first-seen order."""
+    rows = [
+        relationship("y", "x", "1", (1, 0)),
+        relationship("x", "z", "2", (0, 2)),
+        relationship("x", "y", "3", (0, 1)),
+    ]
+    assert aggregate(rows) == [
+        {
+            "a": "x",
+            "b": "y",
+            "a_id": 0,
+            "b_id": 1,
+            "properties": {
+                EVIDENCE_COUNT_FIELD: 2,
+                "Row": ["1", "3"],
+                "Score": ["s1", "s3"],
+            },
+        },
+        {
+            "a": "x",
+            "b": "z",
+            "a_id": 0,
+            "b_id": 2,
+            "properties": {EVIDENCE_COUNT_FIELD: 1, "Row": ["2"], "Score": ["s2"]},
+        },
+    ]
+
+
+def test_ordered_pairs_stay_apart():
+    """With `ordered`, A–B and B–A are different pairs and keep their direction."""
+    rows = [relationship("y", "x", "1"), relationship("x", "y", "2")]
+    result = aggregate(rows, ordered=True)
+    assert [(r["a"], r["b"]) for r in result] == [("y", "x"), ("x", "y")]
+    assert [r["properties"]["Row"] for r in result] == [["1"], ["2"]]
@@ -0,0 +1,73 @@
+"""Neo4j connection management tests"""
+from typing import Any, Dict, List
+
+from py2neo.client.bolt import Bolt4x3
+
+from bio_data_merge import connection
+from bio_data_merge.connection import run_with_timeout
+
+
+class RecordingBolt(Bolt4x3):
+    """A Bolt 4.3 connection recording the RUN messages instead of sending them."""
+
+    def __init__(self):
+        self.profile = None
+        self._transaction = None
+        self.runs: List[Dict[str, Any]] = []
+        self.released = False
+
+    def _assert_open(self) -> None:
+        pass
+
+    def _run(self, graph_name, cypher, parameters, extra=None, final=False):
+        self.runs.append({"cypher": cypher, "parameters": parameters, "extra": extra})
+        self._transaction = None
+        return "result"
+
+    def release(self) -> None:
+        self.released = True
+
+
+class FakeGraph:
+    """Stand-in for `py2neo.Graph` on one connection."""
+
+    name = "biogrid"
+
+    def __init__(self, cx: Any):
+        self.cx = cx
+        self.service = self
+        self.connector = self
+        self.ran: List[str] = []
+
+    def _acquire(self, graph_name: str, readonly: bool = False) -> Any:
+        return self.cx
+
+    def pull(self, result: Any, n: int = -1) -> None:
+        pass
+
+    def run(self, cypher: str, parameters: Dict[str, Any]) -> List[Any]:
+        self.ran.append(cypher)
+        return []
+
+
+def test_queries_are_sent_with_a_transaction_timeout(monkeypatch):
+    """The server is told to end the transaction after the timeout, in milliseconds."""
+    monkeypatch.setattr(connection.Connection, "default_hydrant", lambda *args: None)
+    monkeypatch.setattr(connection, "Cursor", lambda result, hydrant: result)
+    cx = RecordingBolt()
+    graph = FakeGraph(cx)
+    assert run_with_timeout(graph, "RETURN $x", 2.5, x=1) == "result"
+    [run] = cx.runs
+    assert run["parameters"] == {"x": 1}
+    assert run["extra"] == {"db": "biogrid", "mode": "r", "tx_timeout": 2500}
+    assert not graph.ran
+
+
+def test_without_a_timeout_queries_run_as_usual():
+    """No timeout, or a server before Bolt 3, runs the query through `Graph.run`."""
+    graph = FakeGraph(RecordingBolt())
+    run_with_timeout(graph, "RETURN 1", None)
+    graph.cx = type("OldBolt", (), {"release": RecordingBolt.release})()
+    run_with_timeout(graph, "RETURN 2", 1.0)
+    assert graph.ran == ["RETURN 1", "RETURN 2"]
+    assert graph.cx.released
@@ -0,0 +1,54 @@
+"""Concurrent per-database search tests"""
+import threading
+
+import pytest
+
+from bio_data_merge.frontend.fan_out import FanOut
+
+
+@pytest.fixture
+def fan_out():
+    """A fan-out with a short per-source timeout."""
+    fan_out = FanOut(max_workers=4, timeout=0.2)
+    yield fan_out
+    fan_out.shutdown()
+
+
+def test_slow_source_times_out_and_the_others_answer(fan_out):
+    """A source past the timeout is reported; the others' records are returned, tagged."""
+    release = threading.Event()
+
+    def query(source):
+        if source == "STRING":
+            release.wait(5)
+        return [{"name": source}]
+
+    try:
+        result = fan_out.run(["IntAct", "STRING", "BioGRID"], query)
+    finally:
+        release.set()
+    assert sorted(r["db"] for r in result.records) == ["BioGRID", "IntAct"]
+    assert all(r["name"] == r["db"] for r in result.records)
+    assert result.failed == {"STRING": "timed out after 0.2s"}
+    assert not result.complete
+    assert result.elapsed < 1
+
+
+def test_failing_source_is_reported(fan_out):
+    """An exception only fails its own source."""
+
+    def query(source):
+        if source == "IntAct":
+            raise ValueError("boom")
+        return [{"name": source}, {"name": source}]
+
+    result = fan_out.run(["IntAct", "BioGRID"], query)
+    assert [r["db"] for r in result.records] == ["BioGRID", "BioGRID"]
+    assert result.failed == {"IntAct": "ValueError: boom"}
+
+
+def test_every_source_answering_is_complete(fan_out):
+    """Without failures, every source's records are merged."""
+    result = fan_out.run(["IntAct", "BioGRID"], lambda source: [{"name": source}])
+    assert result.complete
+    assert sorted(r["db"] for r in result.records) == ["BioGRID", "IntAct"]
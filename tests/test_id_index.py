@@ -0,0 +1,64 @@
+"""Interned identifier index tests"""
+import random
+
+import numpy as np
+
+from bio_data_merge.processor import id_index
+from bio_data_merge.processor.id_index import IdIndex
+
+real_hash_ids = id_index.hash_ids
+
+
+def test_intern_assigns_ids_in_first_seen_order():
+    """New identifiers get the next IDs; only their first occurrence is new."""
+    index = IdIndex()
+    ids, is_new = index.intern(["b", "a", "b", "c"])
+    assert ids.tolist() == [0, 1, 0, 2]
+    assert is_new.tolist() == [True, True, False, True]
+
+    ids, is_new = index.intern(["c", "d", "a"])
+    assert ids.tolist() == [2, 3, 1]
+    assert is_new.tolist() == [False, True, False]
+    assert len(index) == 4
+
+
+def test_lookup_and_contains():
+    """Unknown identifiers look up as -1 and are not added."""
+    index = IdIndex()
+    index.intern(["x", "y"])
+    assert index.lookup(["y", "z", "x"]).tolist() == [1, -1, 0]
+    assert index.contains(["z", "x"]).tolist() == [False, True]
+    assert len(index) == 2
+
+
+def test_tail_merges_keep_every_id():
+    """Identifiers stay found across merges of the tail into the main arrays."""
+    rng = random.Random(0)
+    index = IdIndex(tail_limit=8)
+    expected = {}
+    for _ in range(50):
+        batch = [f"id{rng.randrange(300)}" for _ in range(rng.randrange(1, 20))]
+        ids, is_new = index.intern(batch)
+        for value, id_, new in zip(batch, ids.tolist(), is_new.tolist()):
+            assert new == (value not in expected)
+            assert expected.setdefault(value, len(expected)) == id_
+    assert len(index) == len(expected)
+    assert len(index._tail_keys) <= index.tail_limit
+    values = list(expected)
+    assert np.array_equal(index.lookup(values), np.arange(len(values)))
+
+
+def test_hash_collisions_keep_identifiers_apart(monkeypatch):
+    """Identifiers sharing a hash still get their own IDs."""
+    monkeypatch.setattr(
+        id_index, "hash_ids", lambda values: real_hash_ids(values) % np.uint64(3)
+    )
+    index = IdIndex(tail_limit=2)
+    values = [f"id{i}" for i in range(20)]
+    ids, is_new = index.intern(values[:12] + values[:4])
+    assert ids.tolist() == list(range(12)) + list(range(4))
+    assert is_new.tolist() == [True] * 12 + [False] * 4
+    ids, is_new = index.intern(values[8:])
+    assert ids.tolist() == list(range(8, 20))
+    assert is_new.tolist() == [False] * 4 + [True] * 8
+    assert index.lookup(values + ["other"]).tolist() == list(range(20)) + [-1]
@@ -0,0 +1,28 @@
+"""Identity resolution tests"""
+import pandas as pd
+
+from bio_data_merge.model.database.database import DatabaseType
+from bio_data_merge.processor.identity import IdentityIndex
+
+
+def keys(*rows):
+    """A frame of identity keys (`id`, `key`)."""
+    return pd.DataFrame(rows, columns=["id", "key"])
+
+
+def test_resolve_only_revisits_groups_that_gained_keys(tmp_path):
+    """Groups are merged through shared keys and named by their most specific key."""
+    index = IdentityIndex(tmp_path / "identity.sqlite")
+    index.add(DatabaseType.BioGRID, keys(("1", "entrez:7157"), ("2", "entrez:672")))
+    index.add(DatabaseType.IntAct, keys(("EBI-1", "uniprot:P04637")))
+    assert index.resolve() == 3
+    assert index.canonical_id(DatabaseType.BioGRID, "1") == "entrez:7157"
+    assert index.resolve() == 0
+
+    # EBI-1 links BioGRID's 1 to the UniProt accession
+    index.add(DatabaseType.IntAct, keys(("EBI-1", "entrez:7157")))
+    assert index.resolve() == 1
+    assert index.members("uniprot:P04637") == [("BioGRID", "1"), ("IntAct", "EBI-1")]
+    assert index.canonical_id(DatabaseType.BioGRID, "2") == "entrez:672"
+    pending = index.pending(DatabaseType.BioGRID)
+    assert sorted(row["id"] for rows in pending for row in rows) == ["1", "2"]
@@ -0,0 +1,21 @@
+"""Incremental load manifest tests"""
+import numpy as np
+import pytest
+
+from bio_data_merge.model.database.database import DatabaseType
+from bio_data_merge.processor.manifest import Manifest
+
+
+def test_resume_needs_the_same_chunk_size(tmp_path):
+    """An interrupted run is only resumed with the chunk size it was started with."""
+    source = tmp_path / "release.tab3.zip"
+    source.write_bytes(b"release")
+    manifest = Manifest(tmp_path / "manifest.sqlite")
+    load = manifest.begin(DatabaseType.BioGRID, [str(source)], 1000)
+    load.commit_chunk(0, np.array([1, 2, 3], dtype=np.int64))
+
+    with pytest.raises(ValueError, match="chunks of 1000 rows"):
+        manifest.begin(DatabaseType.BioGRID, [str(source)], 500)
+    resumed = manifest.begin(DatabaseType.BioGRID, [str(source)], 1000)
+    assert resumed.run_id == load.run_id
+    assert resumed.committed_chunks == {0}
@@ -0,0 +1,89 @@
+"""Streaming ingestion pipeline tests"""
+import threading
+import time
+from typing import Iterator, List
+
+import pandas as pd
+
+from bio_data_merge.processor.pipeline import ChunkPipeline
+
+CHUNKS = 5
+
+
+def chunk_bytes() -> int:
+    """Size of every chunk of `source`."""
+    return int(make_chunk(0).memory_usage(deep=True).sum())
+
+
+def make_chunk(i: int) -> pd.DataFrame:
+    """A chunk of 100 rows."""
+    return pd.DataFrame({"value": [f"row {i}.{j:03}" for j in range(100)]})
+
+
+def source(reads: List[int]) -> Iterator[pd.DataFrame]:
+    """Chunks of the same size, recording which ones were read."""
+    for i in range(CHUNKS):
+        reads.append(i)
+        yield make_chunk(i)
+
+
+def settle() -> None:
+    """Give the producer thread time to read ahead as far as it may."""
+    time.sleep(0.2)
+
+
+def test_memory_is_reserved_before_a_chunk_is_read():
+    """With room for two chunks, a third is not read until one is finished."""
+    reads: List[int] = []
+    pipeline = ChunkPipeline(source(reads), memory_limit=2 * chunk_bytes())
+    chunks = iter(pipeline)
+    next(chunks)
+    settle()
+    assert reads == [0, 1]
+    next(chunks)  # finishes chunk 0
+    settle()
+    assert reads == [0, 1, 2]
+    assert len(list(chunks)) == CHUNKS - 2
+    assert pipeline.in_flight == 0
+
+
+def test_chunks_are_held_until_done():
+    """Without `release_on_next`, chunks count until the consumer is done with them."""
+    reads: List[int] = []
+    pipeline = ChunkPipeline(
+        source(reads), memory_limit=2 * chunk_bytes(), release_on_next=False
+    )
+    chunks = iter(pipeline)
+    next(chunks)
+    next(chunks)
+    settle()
+    assert reads == [0, 1]
+    assert pipeline.full()
+
+    pipeline.done()
+    settle()
+    assert reads == [0, 1, 2]
+    for _ in chunks:
+        pipeline.done()
+    assert pipeline.in_flight == chunk_bytes()
+    pipeline.done()
+    assert pipeline.in_flight == 0
+
+
+def test_errors_reach_the_consumer():
+    """An error of the reader is raised where the chunks are consumed."""
+
+    def failing() -> Iterator[pd.DataFrame]:
+        yield make_chunk(0)
+        raise ValueError("corrupt file")
+
+    received = []
+    try:
+        for chunk in ChunkPipeline(failing()):
+            received.append(chunk)
+    except ValueError as exc:
+        assert str(exc) == "corrupt file"
+    else:
+        raise AssertionError("the error was swallowed")
+    assert len(received) == 1
+    assert not any(t.name == "pipeline" for t in threading.enumerate())
@@ -0,0 +1,71 @@
+"""Search result cache tests"""
+import time
+
+from bio_data_merge.frontend.result_cache import ResultCache, estimate_size
+
+
+def result(name, neighbours=1):
+    """A search result of one interactor and its neighbours."""
+    node = {"Official_Symbol": name}
+    return [{"interactor_a": node, "interactor_b": [node] * neighbours}]
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Past `max_entries`, the entry used longest ago goes first."""
+    cache = ResultCache(max_entries=2)
+    first = cache.put(cache.make_key(["IntAct"], "a", "v"), "a", result("a"))
+    cache.put(cache.make_key(["IntAct"], "b", "v"), "b", result("b"))
+    assert cache.get(first.cache_id) is first
+    cache.put(cache.make_key(["IntAct"], "c", "v"), "c", result("c"))
+    assert cache.lookup(cache.make_key(["IntAct"], "a", "v")) is first
+    assert cache.lookup(cache.make_key(["IntAct"], "b", "v")) is None
+    assert len(cache) == 2
+
+
+def test_entries_expire():
+    """Entries older than the TTL are gone."""
+    cache = ResultCache(ttl=0.2)
+    key = cache.make_key(["BioGRID"], "tp53", "v")
+    cache.put(key, "TP53", result("tp53"))
+    assert cache.lookup(key) is not None
+    time.sleep(0.3)
+    assert cache.lookup(key) is None
+    assert len(cache) == 0 and cache.size == 0
+
+
+def test_size_stays_within_max_bytes():
+    """Entries and their extras count towards `max_bytes`; the newest is always kept."""
+    small, large = result("a"), result("b", neighbours=50)
+    cache = ResultCache(max_bytes=estimate_size(small) * 3)
+    a = cache.put(cache.make_key(["IntAct"], "a", "v"), "a", small)
+    b = cache.put(cache.make_key(["IntAct"], "b", "v"), "b", small)
+    assert cache.size == 2 * estimate_size(small)
+
+    cache.set_extra(b, "graph", {}, estimate_size(small) * 2)
+    assert cache.get(a.cache_id) is None
+    assert cache.size == b.size == 3 * estimate_size(small)
+
+    c = cache.put(cache.make_key(["IntAct"], "c", "v"), "c", large)
+    assert cache.get(b.cache_id) is None
+    assert cache.get(c.cache_id) is c
+    assert cache.size == estimate_size(large)
+
+
+def test_new_data_version_flushes_every_entry():
+    """A lookup with another data version drops the entries of the previous one."""
+    cache = ResultCache()
+    old = cache.put(cache.make_key(["IntAct"], "a", "v1"), "a", result("a"))
+    assert cache.lookup(cache.make_key(["IntAct"], "b", "v2")) is None
+    assert cache.get(old.cache_id) is None
+    assert cache.size == 0
+
+
+def test_only_lookups_count_as_hits_and_misses():
+    """Fetching an entry by its ID (results and graph pages) is not a search."""
+    cache = ResultCache()
+    key = cache.make_key(["IntAct", "BioGRID"], "a", "v")
+    assert cache.lookup(key) is None
+    entry = cache.put(key, "a", result("a"))
+    assert cache.lookup(cache.make_key(["BioGRID", "IntAct"], "a", "v")) is entry
+    cache.get(entry.cache_id)
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,101 @@
+"""Graph snapshot tests"""
+import random
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from bio_data_merge.model.database.database import DatabaseType
+from bio_data_merge.processor.search_keys import SEARCH_KEYS_FIELD
+from bio_data_merge.processor.snapshot import Snapshot, SnapshotBuilder
+
+KEYS = ["tp53", "mdm2", "brca1", "egfr"]
+
+
+def random_graph(seed: int) -> Tuple[List[Dict[str, Any]], List[tuple]]:
+    """Interactors with a few search keys each, and relationships between them.
+
+    IDs have different lengths, so their order differs from the order they
+    are added in; relationships include parallel ones and self-loops.
+    """
+    rng = random.Random(seed)
+    ids = rng.sample(range(1, 5000), 60)
+    nodes = [
+        {"BioGRID_ID": str(id_), SEARCH_KEYS_FIELD: rng.sample(KEYS, rng.randrange(3))}
+        for id_ in ids
+    ]
+    relationships = [
+        (str(rng.choice(ids)), str(rng.choice(ids)), {"Row": str(row)})
+        for row in range(300)
+    ]
+    return nodes, relationships
+
+
+def cypher_search(
+    nodes: List[Dict[str, Any]], relationships: List[tuple], key: str
+) -> List[Tuple[str, List[str]]]:
+    """(interactor, others) rows of `SEARCH_SUBQUERY`, ordered by the interactor's ID.
+
+    Pairs where the interactor has the key, then pairs where only the
+    other one has it; Cypher does not order `collect`, so others are sorted.
+    """
+    keyed = {node["BioGRID_ID"] for node in nodes if key in node[SEARCH_KEYS_FIELD]}
+    rows: Dict[str, List[str]] = {}
+    for a, b, _ in relationships:
+        if a in keyed:
+            rows.setdefault(a, []).append(b)
+    for a, b, _ in relationships:
+        if b in keyed and a not in keyed:
+            rows.setdefault(a, []).append(b)
+    return [(id_, sorted(rows[id_])) for id_ in sorted(rows)]
+
+
+@pytest.fixture(params=[0, 1, 2])
+def graph(request, tmp_path):
+    """A random graph and its snapshot, added in two batches."""
+    nodes, relationships = random_graph(request.param)
+    builder = SnapshotBuilder(tmp_path / "biogrid", DatabaseType.BioGRID)
+    builder.add_nodes(nodes[:30])
+    builder.add_nodes(nodes[30:])
+    builder.add_relationships(relationships[:100])
+    builder.add_relationships(relationships[100:])
+    return nodes, relationships, Snapshot(builder.finish("v1"))
+
+
+@pytest.mark.parametrize("key", KEYS + ["unknown"])
+def test_search_matches_the_cypher_search(graph, key):
+    """Search rows are those of the Cypher search, in the same order."""
+    nodes, relationships, snapshot = graph
+    rows = [
+        (
+            record["interactor_a"]["BioGRID_ID"],
+            sorted(other["BioGRID_ID"] for other in record["interactor_b"]),
+            record["degree"],
+        )
+        for record in snapshot.search(key)
+    ]
+    expected = cypher_search(nodes, relationships, key)
+    assert rows == [(id_, others, len(others)) for id_, others in expected]
+
+
+def test_search_pages_and_caps_neighbours(graph):
+    """Pages slice the ordered rows; capped rows still count every neighbour."""
+    nodes, relationships, snapshot = graph
+    expected = cypher_search(nodes, relationships, "tp53")
+    page = list(snapshot.search("tp53", offset=2, limit=3, neighbours=1))
+    assert [record["interactor_a"]["BioGRID_ID"] for record in page] == [
+        id_ for id_, _ in expected[2:5]
+    ]
+    assert [record["degree"] for record in page] == [
+        len(others) for _, others in expected[2:5]
+    ]
+    assert all(len(record["interactor_b"]) <= 1 for record in page)
+
+
+def test_snapshot_keeps_properties_and_version(graph):
+    """Nodes and relationships keep their properties; the version is recorded."""
+    nodes, relationships, snapshot = graph
+    assert snapshot.version == "v1"
+    assert len(snapshot) == len(nodes)
+    assert snapshot.meta["edges"] == len(relationships)
+    assert snapshot.node(0) == nodes[0]
+    assert snapshot.edge(0) == relationships[0][2]
@@ -0,0 +1,128 @@
+"""STRING loader tests"""
+import gzip
+from pathlib import Path
+from typing import Any, Dict, List
+
+from bio_data_merge.model.database.database import DatabaseType
+from bio_data_merge.processor.manifest import Manifest
+from bio_data_merge.processor.parser import Parser
+from bio_data_merge.processor.string_loader import StringTransformer, iter_string_chunks
+from bio_data_merge.processor.writer import BatchWriter
+
+PROTEINS_COPY = (
+    "COPY items.proteins (protein_id, protein_external_id, species_id, "
+    "preferred_name, protein_size, annotation) FROM stdin;\n"
+)
+LINKS_COPY = (
+    "COPY network.node_node_links (node_id_a, node_id_b, combined_score, "
+    "evidence_scores) FROM stdin;\n"
+)
+
+
+class CapturingTransaction:
+    """Transaction keeping the rows of the statements run in it."""
+
+    def __init__(self, graph: "CapturingGraph"):
+        self.graph = graph
+
+    def run(self, statement: str, rows: List[Any]) -> None:
+        kind = "nodes" if "MERGE (n:Interactor" in statement else "relationships"
+        self.graph.rows[kind] += rows
+
+
+class CapturingGraph:
+    """Stand-in for `py2neo.Graph` keeping every written row."""
+
+    def __init__(self):
+        self.rows: Dict[str, List[Any]] = {"nodes": [], "relationships": []}
+
+    def begin(self) -> CapturingTransaction:
+        return CapturingTransaction(self)
+
+    def commit(self, tx: CapturingTransaction) -> None:
+        pass
+
+    def rollback(self, tx: CapturingTransaction) -> None:
+        pass
+
+
+def write_release(
+    directory: Path, proteins: List[str], links: List[tuple]
+) -> List[str]:
+    """Write a STRING release with the given protein IDs and links."""
+    directory.mkdir()
+    items, network = (
+        directory / "items_schema.sql.gz",
+        directory / "network_schema.sql.gz",
+    )
+    with gzip.open(items, "wt") as dump:
+        dump.write(PROTEINS_COPY)
+        for protein in proteins:
+            dump.write(f"{protein}\t9606.P{protein}\t9606\tP{protein}\t100\t\\N\n")
+        dump.write("\\.\n")
+    with gzip.open(network, "wt") as dump:
+        dump.write(LINKS_COPY)
+        for a, b in links:
+            dump.write(f"{a}\t{b}\t900\t{{}}\n")
+        dump.write("\\.\n")
+    return [str(items), str(network)]
+
+
+def load(parser: Parser, manifest: Manifest, files: List[str]) -> CapturingGraph:
+    """Incrementally load a release, returning what was written."""
+    graph = CapturingGraph()
+    parser.insert_entries(
+        iter_string_chunks(files),
+        DatabaseType.STRING,
+        BatchWriter(graph, StringTransformer.id_field_name),
+        StringTransformer.id_field_name,
+        "STRING",
+        load=manifest.begin(DatabaseType.STRING, files, parser.chunk_size),
+        transformer=StringTransformer(),
+    )
+    return graph
+
+
+def test_delta_links_to_proteins_of_earlier_release(tmp_path):
+    """New links touching unchanged proteins are written by the next release."""
+    parser = Parser()
+    manifest = Manifest(tmp_path / "manifest.sqlite")
+    first = load(
+        parser, manifest, write_release(tmp_path / "r1", ["1", "2", "3"], [("1", "2")])
+    )
+    assert len(first.rows["nodes"]) == 3
+    assert len(first.rows["relationships"]) == 1
+
+    second = load(
+        parser,
+        manifest,
+        write_release(
+            tmp_path / "r2",
+            ["1", "2", "3", "4"],
+            [("1", "2"), ("1", "3"), ("3", "4")],
+        ),
+    )
+    assert [node["STRING_ID"] for node in second.rows["nodes"]] == ["4"]
+    assert sorted((row["a"], row["b"]) for row in second.rows["relationships"]) == [
+        ("1", "3"),
+        ("3", "4"),
+    ]
+
+
+def test_links_are_kept_once_per_pair(tmp_path, capsys):
+    """Links listed in both directions become one relationship; evidence is skipped."""
+    files = write_release(
+        tmp_path / "r1",
+        ["1", "2", "3"],
+        [("1", "2"), ("2", "1"), ("3", "1"), ("1", "3")],
+    )
+    evidence = tmp_path / "r1" / "evidence_schema.sql.gz"
+    evidence.write_bytes(b"")
+    transformer = StringTransformer()
+    relationships = [
+        (row["a"], row["b"])
+        for chunk in iter_string_chunks([*files, str(evidence)])
+        for row in transformer.transform(chunk).relationships
+    ]
+    assert relationships == [("1", "2"), ("1", "3")]
+    assert "skipping" in capsys.readouterr().out
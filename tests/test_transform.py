@@ -0,0 +1,96 @@
+"""Columnar transformation tests"""
+import re
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import SyntheticRelease, biogrid_frame, intact_frame
+from bio_data_merge.model.database.database import DatabaseType, ID_FIELDS
+from bio_data_merge.model.interactions.interaction import Interaction
+from bio_data_merge.model.interactions.interaction import InteractionProperties
+from bio_data_merge.model.interactions.interactor import Interactor
+from bio_data_merge.processor.display_fields import (
+    DISPLAY_TITLE_FIELD,
+    SPECIES_FIELD,
+)
+from bio_data_merge.processor.search_keys import SEARCH_KEYS_FIELD
+from bio_data_merge.processor.transform import FrameTransformer
+
+DERIVED_FIELDS = (SEARCH_KEYS_FIELD, DISPLAY_TITLE_FIELD, SPECIES_FIELD)
+
+
+def per_row(
+    input_df: pd.DataFrame, id_field_name: str
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Nodes and relationships the way `insert_entries` built them row by row."""
+
+    def field(header: str) -> str:
+        h = (
+            header.replace(" ", "_")
+            .replace("(", "")
+            .replace(")", "")
+            .replace("-", "_")
+            .replace(".", "")
+            .replace("#", "")
+            .replace("::", "")
+        )
+        new_h = re.sub(r"_(I|i)nteractor_(A|B)$", "", h)
+        return re.sub(r"_participant_(A|B)$", "", new_h)
+
+    a_fields = [h for h in input_df.columns if h.endswith(" A")]
+    b_fields = [h for h in input_df.columns if h.endswith(" B")]
+    props_fields = [h for h in input_df.columns if h not in a_fields + b_fields]
+    node_map = set()
+    nodes: List[Dict[str, Any]] = []
+    relationships: List[Dict[str, Any]] = []
+    for _, row in input_df.iterrows():
+        ids = []
+        for fields in (a_fields, b_fields):
+            interactor = Interactor(**{field(h): str(row[h]) for h in fields})
+            id_ = str(getattr(interactor, id_field_name))
+            if id_ not in node_map:
+                node_map.add(id_)
+                nodes.append(interactor.dict())
+            ids.append(id_)
+        props = InteractionProperties(
+            **{h.replace(" ", "_"): str(row[h]) for h in props_fields}
+        )
+        interaction = Interaction(
+            interactor_a=ids[0], interactor_b=ids[1], interaction_properties=props
+        )
+        relationships.append(
+            {
+                "a": interaction.interactor_a,
+                "b": interaction.interactor_b,
+                "properties": interaction.interaction_properties.dict(),
+            }
+        )
+    return nodes, relationships
+
+
+@pytest.mark.parametrize(
+    "database, frame",
+    [(DatabaseType.BioGRID, biogrid_frame), (DatabaseType.IntAct, intact_frame)],
+)
+def test_frame_transformer_matches_the_per_row_construction(database, frame):
+    """Chunked columnar batches hold the nodes and relationships of the per-row path."""
+    input_df = frame(SyntheticRelease(interactions=500, interactors=120, seed=3))
+    id_field_name = ID_FIELDS[database]
+    transformer = FrameTransformer(id_field_name)
+    nodes: List[Dict[str, Any]] = []
+    relationships: List[Dict[str, Any]] = []
+    for start in range(0, len(input_df), 128):
+        batch = transformer.transform(input_df.iloc[start : start + 128])
+        nodes.extend(
+            {k: v for k, v in node.items() if k not in DERIVED_FIELDS}
+            for node in batch.nodes
+        )
+        relationships.extend(
+            {k: v for k, v in r.items() if k not in ("a_id", "b_id")}
+            for r in batch.relationships
+        )
+
+    expected_nodes, expected_relationships = per_row(input_df, id_field_name)
+    assert nodes == expected_nodes
+    assert relationships == expected_relationships
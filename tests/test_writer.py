@@ -0,0 +1,71 @@
+"""Batched graph writer tests"""
+from typing import Any, List
+
+import pytest
+from py2neo.errors import ConnectionBroken, TransientError
+
+from bio_data_merge.processor import writer as writer_module
+from bio_data_merge.processor.manifest import FINGERPRINT_FIELD
+from bio_data_merge.processor.writer import BatchWriter
+
+
+class FlakyGraph:
+    """Stand-in for `py2neo.Graph` whose first commit fails with `error`."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+        self.runs: List[str] = []
+        self.commits = 0
+
+    def begin(self) -> "FlakyGraph":
+        return self
+
+    def run(self, statement: str, rows: List[Any]) -> None:
+        self.runs.append(statement)
+
+    def commit(self, tx: Any) -> None:
+        self.commits += 1
+        if self.commits == 1:
+            raise self.error
+
+    def rollback(self, tx: Any) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Retry without sleeping."""
+    monkeypatch.setattr(writer_module.time, "sleep", lambda seconds: None)
+
+
+def test_created_relationships_are_not_sent_again_after_a_lost_commit():
+    """The commit may have gone through, so CREATE is not retried."""
+    graph = FlakyGraph(ConnectionBroken("lost"))
+    writer = BatchWriter(graph, "BioGRID_ID")
+    writer.add_relationship("1", "2", {"Score": "1"})
+    with pytest.raises(ConnectionBroken):
+        writer.flush()
+    assert len(graph.runs) == 1
+
+
+def test_merged_rows_are_sent_again_after_a_lost_commit():
+    """Nodes and fingerprinted relationships are merged, so retrying is harmless."""
+    graph = FlakyGraph(ConnectionBroken("lost"))
+    writer = BatchWriter(graph, "BioGRID_ID")
+    writer.add_node({"BioGRID_ID": "1"})
+    writer.add_relationship("1", "1", {FINGERPRINT_FIELD: "42"})
+    writer.flush()
+    assert len(graph.runs) == 3
+    assert writer.stats.retries == 1
+
+
+def test_transient_errors_are_retried():
+    """A transient error rolled the transaction back, so any write is retried."""
+    graph = FlakyGraph(
+        TransientError("deadlock", "Neo.TransientError.Transaction.DeadlockDetected")
+    )
+    writer = BatchWriter(graph, "BioGRID_ID")
+    writer.add_relationship("1", "2", {"Score": "1"})
+    writer.flush()
+    assert len(graph.runs) == 2
+    assert writer.stats.relationships == 1